@@ -0,0 +1,39 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import pytest
+
+from mcstastox.LoadFile import Data
+from mcstastox.SyntheticFile import write_synthetic_file
+
+# Number of banks, pixels and events in each bank at each scale
+SCALES = {
+    "small": dict(n_banks=2, pixel_bins=(32, 32), n_events=10_000),
+    "medium": dict(n_banks=4, pixel_bins=(128, 128), n_events=250_000),
+    "large": dict(n_banks=8, pixel_bins=(256, 256), n_events=2_000_000),
+}
+
+
+@pytest.fixture(scope="session", params=list(SCALES))
+def scale(request):
+    return request.param
+
+
+@pytest.fixture(scope="session", params=[None, "gzip"], ids=["contiguous", "gzip"])
+def compression(request):
+    return request.param
+
+
+@pytest.fixture(scope="session")
+def data_folder(tmp_path_factory, scale, compression):
+    """
+    Folder with a synthetic McStas file of the given scale and storage
+    """
+    folder = tmp_path_factory.mktemp(f"{scale}_{compression}")
+    write_synthetic_file(folder / "mccode.h5", compression=compression, **SCALES[scale])
+    return folder
+
+
+@pytest.fixture
+def data(data_folder):
+    with Data(data_folder) as data:
+        yield data
@@ -0,0 +1,40 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import pytest
+
+from mcstastox.LoadFile import Data
+from mcstastox.SyntheticFile import write_synthetic_file
+
+
+@pytest.fixture(scope="session")
+def large_chunks_folder(tmp_path_factory):
+    """
+    Folder with a gzip file with chunks of 200 000 events, 9.6 MB each,
+    larger than the default chunk cache of HDF5
+    """
+    folder = tmp_path_factory.mktemp("large_chunks")
+    write_synthetic_file(
+        folder / "mccode.h5",
+        n_banks=4,
+        pixel_bins=(128, 128),
+        n_events=1_000_000,
+        compression="gzip",
+        chunks=(200_000, 6),
+    )
+    return folder
+
+
+@pytest.mark.parametrize("tune_file_options", [False, True], ids=["default", "tuned"])
+def test_get_event_data_chunks_file_options(
+    benchmark, large_chunks_folder, tune_file_options
+) -> None:
+    # Chunks of events straddle chunks of the file, which are decompressed
+    # again for the next chunk of events unless they fit in the cache
+    def read():
+        with Data(large_chunks_folder, tune_file_options=tune_file_options) as data:
+            for _ in data.get_event_data_chunks(
+                ["p", "t", "id", "x"], filter_zeros=False, chunk_size=30_000
+            ):
+                pass
+
+    benchmark.pedantic(read, rounds=3)
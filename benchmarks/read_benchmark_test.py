@@ -0,0 +1,44 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import pytest
+
+from mcstastox.LoadFile import Data
+
+
+def test_get_event_data(benchmark, data) -> None:
+    benchmark(data.get_event_data, ["p", "t", "id"])
+
+
+@pytest.mark.parametrize("memmap", [False, True], ids=["h5py", "memmap"])
+@pytest.mark.parametrize("workers", [1, 4])
+def test_get_event_data_workers(benchmark, data_folder, memmap, workers) -> None:
+    with Data(data_folder, memmap=memmap) as data:
+        benchmark(data.get_event_data, ["p", "t", "id"], workers=workers)
+
+
+def test_calculate_pixel_locations(benchmark, data_folder) -> None:
+    def setup():
+        # Fresh Data each round, pixel locations are kept once calculated
+        return (Data(data_folder),), {}
+
+    def calculate(data):
+        for comp in data.get_components_with_ids():
+            data.calculate_pixel_locations(comp)
+        data.close()
+
+    benchmark.pedantic(calculate, setup=setup, rounds=5)
+
+
+def test_get_id_to_coordinate(benchmark, data) -> None:
+    data.load_all_with_id()
+    benchmark(data.get_id_to_coordinate)
+
+
+def test_export_scipp(benchmark, data) -> None:
+    data.load_all_with_id()
+    benchmark(data.export_scipp, "source", "sample")
+
+
+def test_export_scipp_simple(benchmark, data) -> None:
+    data.load_all_with_id()
+    benchmark(data.export_scipp_simple, "source", "sample")
@@ -0,0 +1,286 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import argparse
+import logging
+import multiprocessing
+import os
+import sys
+import time
+
+import numpy as np
+
+from .DataFolders import find_data_folders
+from .LoadFile import Data
+
+logger = logging.getLogger(__name__)
+
+# Suffix added to the data file name for each output format
+OUTPUT_SUFFIXES = {
+    "scipp": "_scipp.h5",
+    "nexus": "_events.nxs",
+    "histogram": "_histogram.npz",
+}
+
+
+def get_output_path(
+    folder, output_format, filename="mccode.h5", output_dir=None, parent=None
+):
+    """
+    :param parent: folder the output name in output_dir is relative to,
+                   by default the parent of folder
+    :return: path of the converted output of the data file in given folder,
+             next to the data file or in output_dir named after the path of
+             the folder relative to parent
+    """
+    stem = os.path.splitext(filename)[0]
+    suffix = OUTPUT_SUFFIXES[output_format]
+    if output_dir is None:
+        return os.path.join(folder, stem + suffix)
+
+    folder = os.path.abspath(folder)
+    if parent is None:
+        parent = os.path.dirname(folder)
+    folder_name = os.path.relpath(folder, parent).replace(os.sep, "_")
+    return os.path.join(output_dir, f"{folder_name}_{stem}{suffix}")
+
+
+def get_output_paths(folders, output_format, filename="mccode.h5", output_dir=None):
+    """
+    Outputs in output_dir are named after the path of each folder relative
+    to the common parent of all folders, so runs of scans with the same
+    folder names, like scan_a/0 and scan_b/0, get different outputs
+
+    :return: list with path of the converted output of each folder
+    """
+    parent = None
+    if output_dir is not None and len(folders) > 0:
+        parent = os.path.commonpath(
+            [os.path.dirname(os.path.abspath(folder)) for folder in folders]
+        )
+
+    output_paths = [
+        get_output_path(folder, output_format, filename, output_dir, parent)
+        for folder in folders
+    ]
+    seen = {}
+    for folder, output_path in zip(folders, output_paths, strict=True):
+        if output_path in seen:
+            raise ValueError(
+                f"{seen[output_path]} and {folder} would both be converted "
+                f"to {output_path}."
+            )
+        seen[output_path] = folder
+
+    return output_paths
+
+
+def is_up_to_date(input_path, output_path):
+    """
+    :return: True if the output exists and is newer than the input
+    """
+    if not os.path.exists(output_path):
+        return False
+
+    return os.path.getmtime(output_path) >= os.path.getmtime(input_path)
+
+
+def convert_folder(folder, output_path, options):
+    """
+    Converts the data file in a folder to the requested output format
+
+    The output is written to a temporary file first and renamed when done,
+    so an interrupted conversion never leaves an output that looks finished.
+
+    :param folder: folder with McStas output
+    :param output_path: path of the converted output
+    :param options: dictionary with output_format, filename and the options
+                    of the output format
+    """
+    output_format = options["output_format"]
+    # Keep the extension, some writers add one when it is missing
+    root, extension = os.path.splitext(output_path)
+    partial_path = f"{root}.partial{extension}"
+
+    try:
+        with Data(folder, filename=options["filename"]) as data:
+            if output_format == "scipp":
+                data_group = data.export_scipp(
+                    source_name=options["source_name"],
+                    sample_name=options["sample_name"],
+                )
+                data_group.save_hdf5(partial_path)
+            elif output_format == "nexus":
+                data.export_nexus_events(partial_path, chunk_size=options["chunk_size"])
+            elif output_format == "histogram":
+                histogram = data.histogram_events(
+                    options["bins_t"],
+                    t_range=options["t_range"],
+                    chunk_size=options["chunk_size"],
+                )
+                np.savez(partial_path, **histogram)
+            else:
+                raise ValueError(f"Unknown output format {output_format}.")
+    except BaseException:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+        raise
+
+    os.replace(partial_path, output_path)
+
+
+def _run_task(task):
+    """
+    Converts one folder in a worker, errors are reported instead of raised
+    """
+    folder, output_path, options = task
+    start = time.perf_counter()
+    try:
+        convert_folder(folder, output_path, options)
+    except Exception as e:
+        return folder, time.perf_counter() - start, f"{type(e).__name__}: {e}"
+
+    return folder, time.perf_counter() - start, None
+
+
+def _make_parser():
+    parser = argparse.ArgumentParser(
+        prog="mcstastox",
+        description="Convert McStas output folders to scipp HDF5, "
+        "NXevent_data or pixel by time-of-flight histograms.",
+    )
+    parser.add_argument(
+        "folders", nargs="+", help="folders with McStas output or glob patterns"
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        dest="output_format",
+        choices=sorted(OUTPUT_SUFFIXES),
+        default="nexus",
+        help="output format (default: %(default)s)",
+    )
+    parser.add_argument(
+        "-o", "--output-dir", help="directory for outputs, default is each folder"
+    )
+    parser.add_argument(
+        "--filename", default="mccode.h5", help="data file name in each folder"
+    )
+    parser.add_argument("--source", dest="source_name", help="source component")
+    parser.add_argument("--sample", dest="sample_name", help="sample component")
+    parser.add_argument(
+        "--bins-t", type=int, default=100, help="number of time-of-flight bins"
+    )
+    parser.add_argument(
+        "--t-range",
+        type=float,
+        nargs=2,
+        metavar=("T_MIN", "T_MAX"),
+        help="time-of-flight range of histograms in s",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        help="events read at a time, bounds memory of streaming formats",
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=1, help="number of worker processes"
+    )
+    parser.add_argument(
+        "--max-tasks-per-child",
+        type=int,
+        default=1,
+        help="folders converted by a worker before it is replaced, "
+        "which returns its memory (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="convert outputs that are up to date"
+    )
+    return parser
+
+
+def main(argv=None):
+    """
+    Command line entry point converting many McStas output folders
+
+    :param argv: list of arguments, sys.argv is used if None
+    :return: exit code, 1 if any pattern matched no folder with a data file,
+             outputs of folders collide or any conversion failed
+    """
+    parser = _make_parser()
+    args = parser.parse_args(argv)
+    if args.output_format == "scipp" and not (args.source_name and args.sample_name):
+        parser.error("--source and --sample are needed for the scipp format")
+    if args.output_format == "histogram" and args.t_range is None:
+        parser.error("--t-range is needed for the histogram format")
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    if args.output_dir is not None:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    options = dict(
+        output_format=args.output_format,
+        filename=args.filename,
+        source_name=args.source_name,
+        sample_name=args.sample_name,
+        bins_t=args.bins_t,
+        t_range=args.t_range,
+        chunk_size=args.chunk_size,
+    )
+
+    unmatched = []
+    folders = find_data_folders(args.folders, args.filename, unmatched)
+    for pattern in unmatched:
+        logger.error("No folder with %s matches %s", args.filename, pattern)
+
+    try:
+        output_paths = get_output_paths(
+            folders, args.output_format, args.filename, args.output_dir
+        )
+    except ValueError as e:
+        logger.error("%s", e)
+        return 1
+
+    tasks = []
+    for folder, output_path in zip(folders, output_paths, strict=True):
+        input_path = os.path.join(folder, args.filename)
+        if not args.force and is_up_to_date(input_path, output_path):
+            logger.info("%s: up to date, skipped", folder)
+            continue
+        tasks.append((folder, output_path, options))
+
+    pool = None
+    if args.workers > 1 and len(tasks) > 1:
+        pool = multiprocessing.Pool(
+            processes=min(args.workers, len(tasks)),
+            maxtasksperchild=args.max_tasks_per_child,
+        )
+        results = pool.imap_unordered(_run_task, tasks)
+    else:
+        results = map(_run_task, tasks)
+
+    n_failed = 0
+    try:
+        # Reported as each folder finishes
+        for folder, duration, error in results:
+            if error is None:
+                logger.info("%s: converted in %.2f s", folder, duration)
+            else:
+                n_failed += 1
+                logger.error("%s: failed after %.2f s, %s", folder, duration, error)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+
+    logger.info(
+        "%d converted, %d failed, %d up to date",
+        len(tasks) - n_failed,
+        n_failed,
+        len(folders) - len(tasks),
+    )
+    return 1 if n_failed or unmatched else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import glob
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+
+def _expand_pattern(pattern, filename):
+    """
+    :return: list of folders matching a folder or glob pattern that have
+             the data file, others are skipped with a warning
+    """
+    folders = []
+    for match in glob.glob(pattern) or [pattern]:
+        if os.path.isfile(os.path.join(match, filename)):
+            folders.append(os.path.normpath(match))
+        else:
+            logger.warning("No %s in %s, skipped", filename, match)
+
+    return folders
+
+
+def _natural_sort_key(folder):
+    """
+    :return: key sorting numbers in folder names by value, so scan_2 comes
+             before scan_10
+    """
+    return [
+        int(part) if part.isdigit() else part for part in re.split(r"(\d+)", folder)
+    ]
+
+
+def find_data_folders(patterns, filename="mccode.h5", unmatched=None):
+    """
+    Expands folders and glob patterns to folders containing a data file
+
+    :param patterns: list of folders or glob patterns matching folders
+    :param filename: name of the McStas NeXus file in each folder
+    :param unmatched: optional list, patterns matching no folder with the
+                      data file are appended to it
+    :return: list of folders with the data file, without duplicates, sorted
+             with numbers in the names compared by value
+    """
+    folders = set()
+    for pattern in patterns:
+        matches = _expand_pattern(pattern, filename)
+        if len(matches) == 0 and unmatched is not None:
+            unmatched.append(pattern)
+        folders.update(matches)
+
+    return sorted(folders, key=_natural_sort_key)
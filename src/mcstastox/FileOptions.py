@@ -0,0 +1,117 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import math
+
+import h5py
+
+from .ReadNeXus import _SLAB_BYTES
+
+# Upper limit of the tuned raw data chunk cache, about one slab of rows read
+# from chunked event datasets
+MAX_CHUNK_CACHE_BYTES = _SLAB_BYTES
+
+# Upper limit of the number of hash slots of the tuned chunk cache
+MAX_CHUNK_CACHE_SLOTS = 1_000_000
+
+# Size of the page buffer for files written with paged aggregation
+PAGE_BUFFER_BYTES = 16 * 1024**2
+
+# HDF5 file space strategy of files written with paged aggregation
+_FSPACE_STRATEGY_PAGE = 1
+
+
+def _next_prime(number):
+    """
+    :return: smallest prime number greater than or equal to number
+    """
+    number = max(number, 2)
+    while any(number % factor == 0 for factor in range(2, math.isqrt(number) + 1)):
+        number += 1
+    return number
+
+
+def _get_chunk_nbytes(dataset):
+    """
+    :return: size of one chunk of a chunked dataset in bytes
+    """
+    return math.prod(dataset.chunks) * dataset.dtype.itemsize
+
+
+def _get_chunk_row_nbytes(dataset):
+    """
+    :return: size of the chunks holding one row of chunks of a chunked
+             dataset in bytes, that is all its columns
+    """
+    n_chunks = math.prod(
+        math.ceil(length / chunk_length)
+        for length, chunk_length in zip(
+            dataset.shape[1:], dataset.chunks[1:], strict=True
+        )
+    )
+    return n_chunks * _get_chunk_nbytes(dataset)
+
+
+def _find_chunked_events(file):
+    """
+    :return: list of chunked event datasets in the component output groups
+    """
+    components = file.get("entry1/instrument/components")
+    if not isinstance(components, h5py.Group):
+        return []
+
+    chunked = []
+    for component in components.values():
+        output = component.get("output") if isinstance(component, h5py.Group) else None
+        if not isinstance(output, h5py.Group):
+            continue
+        for info in output.values():
+            events = info.get("events") if isinstance(info, h5py.Group) else None
+            if isinstance(events, h5py.Dataset) and events.chunks is not None:
+                chunked.append(events)
+
+    return chunked
+
+
+def get_tuned_file_options(file_path):
+    """
+    Provides h5py.File options suited to the layout of a McStas NeXus file
+
+    For chunked event datasets the raw data chunk cache is made large enough
+    to hold one row of chunks of the largest dataset, up to
+    MAX_CHUNK_CACHE_BYTES, when the default cache is smaller. Reads of
+    consecutive rows, like the chunks of get_event_data_chunks, then find
+    the chunks that straddle two reads in the cache of the open dataset
+    instead of decompressing them again. Larger caches do not help, as the
+    events are read in slabs of whole chunk rows. The number of hash slots
+    is a prime around 100 times the number of cached chunks, as recommended
+    by HDF5, up to MAX_CHUNK_CACHE_SLOTS. Files written with paged
+    aggregation get a page buffer.
+
+    :param file_path: path of the McStas NeXus file
+    :return: dictionary with keyword arguments for h5py.File
+    """
+    options = {}
+    with h5py.File(file_path, "r") as file:
+        chunked = _find_chunked_events(file)
+        cache_bytes = max(
+            (_get_chunk_row_nbytes(dataset) for dataset in chunked), default=0
+        )
+        chunk_bytes = min(
+            (_get_chunk_nbytes(dataset) for dataset in chunked), default=0
+        )
+        default_cache_bytes = file.id.get_access_plist().get_cache()[2]
+
+        create_plist = file.id.get_create_plist()
+        if create_plist.get_file_space_strategy()[0] == _FSPACE_STRATEGY_PAGE:
+            page_size = create_plist.get_file_space_page_size()
+            options["page_buf_size"] = max(
+                page_size, PAGE_BUFFER_BYTES // page_size * page_size
+            )
+
+    cache_bytes = min(cache_bytes, MAX_CHUNK_CACHE_BYTES)
+    if cache_bytes > default_cache_bytes:
+        options["rdcc_nbytes"] = cache_bytes
+        n_chunks = math.ceil(cache_bytes / chunk_bytes)
+        options["rdcc_nslots"] = _next_prime(min(100 * n_chunks, MAX_CHUNK_CACHE_SLOTS))
+
+    return options
@@ -0,0 +1,199 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import numpy as np
+
+
+class PixelTimeHistogram:
+    """
+    Accumulates weighted events in a 2D pixel by time-of-flight histogram
+
+    Events are added in chunks, each chunk is binned with a single bincount
+    over the flattened pixel and time bin index, so the full event list is
+    never needed at once. Bins follow numpy.histogram, the last time bin
+    includes its upper edge and events outside the edges are dropped.
+    """
+
+    def __init__(self, n_pixels, edges):
+        """
+        :param n_pixels: number of pixel rows in the histogram
+        :param edges: increasing time-of-flight bin edges
+        """
+        edges = np.asarray(edges, dtype=np.float64)
+        if edges.ndim != 1 or len(edges) < 2:
+            raise ValueError("Time bin edges must be 1D with at least two edges.")
+        if np.any(np.diff(edges) <= 0):
+            raise ValueError("Time bin edges must be increasing.")
+
+        self.edges = edges
+        self.n_pixels = int(n_pixels)
+        self.n_bins = len(edges) - 1
+        self.data = np.zeros((self.n_pixels, self.n_bins))
+        self.variances = np.zeros((self.n_pixels, self.n_bins))
+        self.n_events = 0
+
+    def add(self, rows, t, weights=None):
+        """
+        Adds a chunk of events
+
+        :param rows: pixel row of each event
+        :param t: time-of-flight of each event
+        :param weights: optional weight of each event, 1 if None
+        """
+        time_bins = np.searchsorted(self.edges, t, side="right") - 1
+        # Upper edge belongs to the last bin
+        time_bins[t == self.edges[-1]] = self.n_bins - 1
+        inside = (time_bins >= 0) & (time_bins < self.n_bins)
+
+        flat = rows[inside] * self.n_bins + time_bins[inside]
+        size = self.n_pixels * self.n_bins
+        shape = self.data.shape
+        if weights is None:
+            counts = np.bincount(flat, minlength=size).reshape(shape)
+            self.data += counts
+            self.variances += counts
+        else:
+            weights = weights[inside]
+            self.data += np.bincount(flat, weights=weights, minlength=size).reshape(
+                shape
+            )
+            self.variances += np.bincount(
+                flat, weights=weights * weights, minlength=size
+            ).reshape(shape)
+
+        self.n_events += int(np.count_nonzero(inside))
+
+
+# Number of bins read at a time for sums when not given
+_DEFAULT_CHUNK_SIZE = 1_000_000
+
+# McStas stores x along the first dimension of the data, then y and z
+_AXIS_VARIABLES = ("x", "y", "z")
+
+
+class MonitorHistogram:
+    """
+    Lazy handle of the intensity, error and ncount of a histogram monitor
+
+    Nothing is read when the handle is made. Indexing reads only the
+    selected hyperslab of each dataset, and sums and projections are
+    computed a slab of rows along the first dimension at a time, so large
+    2D and 3D monitors can be inspected without reading them whole. The
+    handle reads from the open file, so it can only be used while the file
+    is open.
+    """
+
+    def __init__(self, info_entry, axes=None, chunk_size=None):
+        """
+        :param info_entry: h5py group with data, errors and ncount datasets
+        :param axes: optional list with tuple of variable name and axis
+                     coordinates for each dimension, (None, None) if unknown
+        :param chunk_size: maximum number of bins read at a time for sums
+        """
+        if not all(name in info_entry for name in ("data", "errors", "ncount")):
+            raise ValueError(f"{info_entry.name} is not a histogram monitor.")
+
+        self.data = info_entry["data"]
+        self.errors = info_entry["errors"]
+        self.ncount = info_entry["ncount"]
+        if axes is None:
+            axes = [(None, None)] * self.ndim
+        if len(axes) != self.ndim:
+            raise ValueError(f"Expected {self.ndim} axes, got {len(axes)}.")
+        self.axes = list(axes)
+        self.chunk_size = chunk_size or _DEFAULT_CHUNK_SIZE
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def ndim(self):
+        return self.data.ndim
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, key):
+        """
+        :return: tuple with intensity, error, ncount numpy arrays of the
+                 selection, each read as a hyperslab
+        """
+        return self.data[key], self.errors[key], self.ncount[key]
+
+    def read(self):
+        """
+        :return: tuple with intensity, error, ncount numpy arrays
+        """
+        return self[()]
+
+    def get_axis(self, dim):
+        """
+        :return: tuple with variable name and axis coordinates of dimension
+        """
+        return self.axes[dim]
+
+    def _get_slabs(self):
+        """
+        :return: list of slices of rows along the first dimension, each
+                 with at most chunk_size bins unless a row is larger
+        """
+        if self.ndim == 0:
+            return [()]
+
+        row_size = max(int(np.prod(self.shape[1:])), 1)
+        n_rows = max(self.chunk_size // row_size, 1)
+        return [
+            np.s_[start : min(start + n_rows, self.shape[0])]
+            for start in range(0, self.shape[0], n_rows)
+        ]
+
+    def sum(self, axis=None):
+        """
+        Sums intensity and ncount over the given dimensions, errors are added
+        in quadrature
+
+        :param axis: dimension or tuple of dimensions to sum, all if None
+        :return: tuple with intensity, error, ncount of the remaining
+                 dimensions, numbers when all are summed
+        """
+        if axis is None:
+            axis = tuple(range(self.ndim))
+        elif np.ndim(axis) == 0:
+            axis = (axis,)
+        axis = tuple(sorted(dim % self.ndim for dim in axis))
+        if len(set(axis)) != len(axis):
+            raise ValueError(f"Repeated dimension in {axis}.")
+
+        kept_shape = tuple(
+            length for dim, length in enumerate(self.shape) if dim not in axis
+        )
+        intensity = np.zeros(kept_shape)
+        variances = np.zeros(kept_shape)
+        ncount = np.zeros(kept_shape)
+        for slab in self._get_slabs():
+            data, errors, counts = self[slab]
+            # The first dimension is either summed over slabs or kept
+            rows = () if 0 in axis or self.ndim == 0 else slab
+            intensity[rows] += np.sum(data, axis=axis)
+            variances[rows] += np.sum(np.square(errors), axis=axis)
+            ncount[rows] += np.sum(counts, axis=axis)
+
+        if len(kept_shape) == 0:
+            return float(intensity), float(np.sqrt(variances)), float(ncount)
+        return intensity, np.sqrt(variances), ncount
+
+    def project(self, dim):
+        """
+        Projects the histogram onto one dimension by summing all others
+
+        :param dim: dimension to keep
+        :return: tuple with intensity, error, ncount along the dimension
+        """
+        dim = dim % self.ndim
+        return self.sum(tuple(other for other in range(self.ndim) if other != dim))
+
+    def total(self):
+        """
+        :return: tuple with total intensity, error and ncount
+        """
+        return self.sum()
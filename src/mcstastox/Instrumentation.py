@@ -0,0 +1,120 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import contextlib
+import threading
+import time
+from dataclasses import asdict, dataclass
+
+
+@dataclass
+class StageRecord:
+    calls: int = 0
+    """Number of times the stage was timed"""
+    time: float = 0.0
+    """Wall time spent in the stage in seconds"""
+    bytes_read: int = 0
+    """Bytes of event data read from the file"""
+    arrays_allocated: int = 0
+    """Number of output arrays allocated"""
+    bytes_allocated: int = 0
+    """Bytes of output arrays allocated"""
+    events: int = 0
+    """Number of events handled"""
+
+
+class Instrumentation:
+    """
+    Records wall time, bytes read, arrays allocated and event counts
+    per stage and per component
+
+    Records are summed over all calls of a stage for a component. A callback
+    can be given to receive each recording as it happens, it is called with
+    the stage name, the component name or None and a dictionary with the
+    recorded values. Recording is thread safe.
+    """
+
+    enabled = True
+
+    def __init__(self, callback=None):
+        """
+        :param callback: optional function called for each recording
+        """
+        self.callback = callback
+        self.records: dict[tuple[str, str | None], StageRecord] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def stage(self, stage, component_name=None):
+        """
+        Context manager recording the wall time of its body as given stage
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(
+                stage, component_name, calls=1, time=time.perf_counter() - start
+            )
+
+    def record(self, stage, component_name=None, **values):
+        """
+        Adds values to the record of given stage and component
+
+        :param stage: name of the stage
+        :param component_name: name of the component, None if not specific
+        :param values: values to add, names of StageRecord fields
+        """
+        with self._lock:
+            key = (stage, component_name)
+            if key not in self.records:
+                self.records[key] = StageRecord()
+            record = self.records[key]
+            for name, value in values.items():
+                setattr(record, name, getattr(record, name) + value)
+
+        if self.callback is not None:
+            self.callback(stage, component_name, values)
+
+    def as_dict(self):
+        """
+        :return: dictionary with a dictionary of records for each stage,
+                 keyed by component name, None for records of no component
+        """
+        with self._lock:
+            result = {}
+            for (stage, component_name), record in self.records.items():
+                result.setdefault(stage, {})[component_name] = asdict(record)
+
+        return result
+
+    def get_totals(self):
+        """
+        :return: dictionary with record of each stage summed over components
+        """
+        totals = {}
+        for stage, records in self.as_dict().items():
+            total = StageRecord()
+            for record in records.values():
+                for name, value in record.items():
+                    setattr(total, name, getattr(total, name) + value)
+            totals[stage] = asdict(total)
+
+        return totals
+
+
+class _NoInstrumentation:
+    """
+    Stand in used when instrumentation is disabled, records nothing
+    """
+
+    enabled = False
+
+    def stage(self, stage, component_name=None):
+        return contextlib.nullcontext()
+
+    def record(self, stage, component_name=None, **values):
+        pass
+
+
+# Shared instance used by default, so disabled instrumentation costs one call
+NO_INSTRUMENTATION = _NoInstrumentation()
@@ -1,12 +1,20 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import contextlib
+import dataclasses
 import logging
 import os
 
 import h5py
 import numpy as np
 
-from .ReadNeXus import McStasNeXus
+from .FileOptions import get_tuned_file_options
+from .Histogram import _AXIS_VARIABLES, MonitorHistogram, PixelTimeHistogram
+from .Instrumentation import Instrumentation
+from .MetadataCache import get_cache_key, get_cache_path, load_cache, save_cache
+from .PixelTables import BankRegistry, PixelLookup, sort_by_pixel
+from .ReadNeXus import McStasNeXus, _get_event_dtypes
+from .WriteNeXus import EventDataWriter, create_nx_group, write_nx_detector
 
 
 class Data:
@@ -14,27 +22,179 @@ class Data:
     Interface class, with context handler, loads data using McStasNeXus data class
     """
 
-    def __init__(self, data_folder, filename="mccode.h5"):
+    def __init__(
+        self,
+        data_folder,
+        filename="mccode.h5",
+        cache=False,
+        memmap=False,
+        decompress_workers=None,
+        tune_file_options=False,
+        driver=None,
+        rdcc_nbytes=None,
+        rdcc_nslots=None,
+        page_buf_size=None,
+    ):
+        """
+        :param data_folder: folder with McStas output
+        :param filename: name of the McStas NeXus file in the folder
+        :param cache: If True metadata and pixel tables are kept in a sidecar
+                      cache file next to the data file, can also be a path to
+                      a directory for cache files. The cache is rebuilt when
+                      the data file or mcstastox version changes.
+        :param memmap: If True contiguous uncompressed event datasets are read
+                       through memory maps instead of copies through h5py
+        :param decompress_workers: If set, gzip compressed event datasets are
+                                   decompressed in this many threads instead
+                                   of serially in h5py
+        :param tune_file_options: If True the HDF5 driver, chunk cache and page
+                                  buffer are chosen from the layout of the file,
+                                  see get_tuned_file_options, options given
+                                  explicitly take precedence
+        :param driver: HDF5 file driver, for example core to read the whole
+                       file into memory
+        :param rdcc_nbytes: size of the raw data chunk cache in bytes
+        :param rdcc_nslots: number of hash slots of the raw data chunk cache
+        :param page_buf_size: size of the page buffer in bytes, for files
+                              written with paged aggregation
+        """
+        file_path = os.path.join(data_folder, filename)
+
+        # Options given to h5py.File, tuned ones overridden by given ones
+        self.file_options = {}
+        if tune_file_options:
+            self.file_options = get_tuned_file_options(file_path)
+        given_options = dict(
+            driver=driver,
+            rdcc_nbytes=rdcc_nbytes,
+            rdcc_nslots=rdcc_nslots,
+            page_buf_size=page_buf_size,
+        )
+        self.file_options.update(
+            {name: value for name, value in given_options.items() if value is not None}
+        )
+
         # Open the file and store the file object as an instance attribute
-        self.file = h5py.File(
-            os.path.join(data_folder, filename), "r", swmr=True
-        )  # swmr allows multiple readers
-        self.file_object = McStasNeXus(self.file)
+        # swmr allows multiple readers, but only with the default driver
+        swmr = self.file_options.get("driver") in (None, "sec2")
+        self.file = h5py.File(file_path, "r", swmr=swmr, **self.file_options)
+
+        # Load metadata and pixel tables from an up to date cache if requested
+        self.cache_path = None
+        metadata, pixel_tables = None, None
+        if cache:
+            cache_dir = None if cache is True else cache
+            self.cache_path = get_cache_path(file_path, cache_dir)
+            self.cache_key = get_cache_key(file_path)
+            metadata, pixel_tables = load_cache(self.cache_path, self.cache_key)
+
+        self.file_object = McStasNeXus(
+            self.file,
+            metadata=metadata,
+            memmap=memmap,
+            decompress_workers=decompress_workers,
+        )
 
         # Prepare data structure for when data is requested
-        # List for component names in sequence of lowest to highest pixel ID
-        self.component_pixel_order = []
+        # Registry of pixel id ranges, sorted from lowest to highest pixel ID
+        self.bank_registry = BankRegistry()
 
         # Dictionaries with keys of component names
         self.pixel_range = {}  # list of len 2, lowest and highest pixel ID
         self.local_pixel_locations = {}  # list of length
         self.global_pixel_locations = {}
+        if pixel_tables is not None:
+            self.pixel_range = pixel_tables["pixel_range"]
+            order = pixel_tables["component_pixel_order"]
+            self.bank_registry.register_many(
+                order,
+                [self.pixel_range[comp][0] for comp in order],
+                [self.pixel_range[comp][1] for comp in order],
+            )
+            self.local_pixel_locations = pixel_tables["local_pixel_locations"]
+            self.global_pixel_locations = pixel_tables["global_pixel_locations"]
+
         self.logger = logging.getLogger(__name__)
         self.logger.addHandler(logging.StreamHandler())
         self.logger.setLevel(logging.INFO)
 
+        # Components with pixel tables in the cache file
+        self._cached_pixel_components = set(self.global_pixel_locations)
+        if self.cache_path is not None and metadata is None:
+            self.save_cache()
+
+    @property
+    def instrumentation(self):
+        """
+        :return: Instrumentation recording stages of reads and exports,
+                 a disabled stand in unless inside instrument()
+        """
+        return self.file_object.instrumentation
+
+    @contextlib.contextmanager
+    def instrument(self, callback=None):
+        """
+        Context manager recording time, bytes read, arrays allocated and
+        event counts of each stage and component of reads and exports
+
+        Stages are read, filter_zeros, allocate, pixel_map, scipp_events and
+        group_by_pixel. Outside the context nothing is recorded.
+
+        :param callback: optional function called for each recording with
+                         the stage, component name or None and recorded values
+        :return: Instrumentation, use as_dict or get_totals for the records
+        """
+        instrumentation = Instrumentation(callback)
+        previous = self.file_object.instrumentation
+        self.file_object.instrumentation = instrumentation
+        try:
+            yield instrumentation
+        finally:
+            self.file_object.instrumentation = previous
+
+    @property
+    def component_pixel_order(self):
+        """
+        :return: list of component names in sequence of lowest to highest pixel ID
+        """
+        return self.bank_registry.names
+
+    def save_cache(self):
+        """
+        Writes metadata and the pixel tables calculated so far to the cache file
+        """
+        if self.cache_path is None:
+            raise ValueError("Data was opened without a cache.")
+
+        pixel_tables = dict(
+            component_pixel_order=self.component_pixel_order,
+            pixel_range=self.pixel_range,
+            local_pixel_locations=self.local_pixel_locations,
+            global_pixel_locations=self.global_pixel_locations,
+        )
+        try:
+            save_cache(
+                self.cache_path,
+                self.cache_key,
+                self.file_object.get_metadata(),
+                pixel_tables,
+            )
+        except OSError as e:
+            self.logger.warning("Could not write cache file %s: %s", self.cache_path, e)
+            return
+
+        self._cached_pixel_components = set(self.global_pixel_locations)
+
     def close(self):
-        # Close the file when done
+        # Store pixel tables calculated since the cache was written
+        if (
+            self.cache_path is not None
+            and set(self.global_pixel_locations) != self._cached_pixel_components
+        ):
+            self.save_cache()
+
+        # Release memory maps of the file, then close the file when done
+        self.file_object.close()
         if self.file:
             self.file.close()
 
@@ -120,7 +280,15 @@ class Data:
         """
         return self.file_object.get_component_variables(component_name)
 
-    def get_event_data(self, variables, component_name=None, filter_zeros=True):
+    def get_event_data(
+        self,
+        variables,
+        component_name=None,
+        filter_zeros=True,
+        workers=None,
+        dtypes=None,
+        out=None,
+    ):
         """
         Provides event data with requested variables as dictionaries
 
@@ -128,35 +296,85 @@ class Data:
         :param component_name: optional, single component name or list of names
         :param filter_zeros: bool: Set to True if entries with 0 weights
                                    should be removed
-        :return: dictionary with keys named after variables and numpy arrays as values
+        :param workers: optional number of threads reading components concurrently,
+                        h5py reads are serialised, see McStasNeXus.get_event_data
+        :param dtypes: optional dictionary with data type for some variables,
+                       by default id is int64 and other variables float64
+        :param out: optional output buffers to fill, dictionary with a 1D array
+                    for each variable or a reusable EventBuffers pool
+        :return: dictionary with keys named after variables and numpy arrays as values,
+                 views of the buffers with the filled length when out is given
+        """
+
+        # Events with 0 weight are removed while reading
+        return self.file_object.get_event_data(
+            variables=variables,
+            component_name=component_name,
+            filter_zeros="p" in variables and filter_zeros,
+            workers=workers,
+            dtypes=dtypes,
+            out=out,
+        )
+
+    def get_event_data_chunks(
+        self,
+        variables,
+        component_name=None,
+        filter_zeros=True,
+        chunk_size=None,
+        chunk_bytes=None,
+        dtypes=None,
+    ):
         """
+        Provides event data with requested variables in chunks of bounded size
+
+        Each chunk holds events from a single component, along with the global
+        start and stop offsets of the chunk in the combined event list. The
+        offsets refer to events before zero weights are filtered out.
 
-        event_data = self.file_object.get_event_data(
-            variables=variables, component_name=component_name
+        :param variables: list of strings corresponding to variables
+        :param component_name: optional, single component name or list of names
+        :param filter_zeros: bool: Set to True if entries with 0 weights
+                                   should be removed
+        :param chunk_size: maximum number of events in each chunk
+        :param chunk_bytes: maximum size of the arrays in each chunk in bytes,
+                            alternative to chunk_size
+        :param dtypes: optional dictionary with data type for some variables,
+                       by default id is int64 and other variables float64
+        :return: generator of EventChunk objects
+        """
+        chunks = self.file_object.get_event_data_chunks(
+            variables=variables,
+            component_name=component_name,
+            chunk_size=chunk_size,
+            chunk_bytes=chunk_bytes,
+            dtypes=dtypes,
         )
-        if "p" in variables and filter_zeros:
-            # Remove 0 events
-            zero_weights = np.where(event_data["p"] == 0)[0]
-            for key in event_data:
-                event_data[key] = np.delete(event_data[key], zero_weights)
+        for chunk in chunks:
+            if "p" in variables and filter_zeros:
+                # Remove 0 events
+                with self.instrumentation.stage("filter_zeros", chunk.component_name):
+                    non_zero = chunk.data["p"] != 0
+                    data = {key: value[non_zero] for key, value in chunk.data.items()}
+                chunk = dataclasses.replace(chunk, data=data)
 
-        return event_data
+            yield chunk
 
     def get_component_placement(self, component_name):
         """
         :return: tuple with position, rotation matrix for given component name
         """
-        component_entry = self.file_object.get_component_entry(component_name)
+        placement = self.file_object.get_placement_table()
+        row = placement.get_row(component_name)
 
-        return np.asarray(component_entry["Position"]), np.asarray(
-            component_entry["Rotation"]
-        )
+        return placement.positions[row].copy(), placement.rotations[row].copy()
 
     def get_global_component_coordinates(self, component_name):
         """
         :return: center position for given component name
         """
-        return self.transform(np.zeros((1, 3)), component_name)[0]
+        placement = self.file_object.get_placement_table()
+        return placement.positions[placement.get_row(component_name)].copy()
 
     def get_component_data(self, component_name):
         """
@@ -164,6 +382,9 @@ class Data:
                  tuple with intensity, error, ncount numpy arrays for histograms
         """
         data = self.file_object.get_output_entry(component_name)
+        if not any(name in data for name in ("events", "data")):
+            # Data is stored in the info entry of the output
+            data = self.file_object.get_info_entry(component_name)
 
         if "events" in data.keys():
             return np.asarray(data["events"])
@@ -177,6 +398,32 @@ class Data:
             Ncounts = np.asarray(data["ncount"])
             return Intensities, Errors, Ncounts
 
+    def get_histogram(self, component_name, chunk_size=None):
+        """
+        Provides a lazy handle of a histogram monitor, data is only read when
+        sliced, summed or projected, see MonitorHistogram
+
+        :param component_name: name of a histogram monitor
+        :param chunk_size: maximum number of bins read at a time for sums
+        :return: MonitorHistogram reading from this file while it is open
+        """
+        info_entry = self.file_object.get_info_entry(component_name)
+        if not isinstance(info_entry, h5py.Group) or "data" not in info_entry:
+            raise ValueError(f"'{component_name}' is not a histogram monitor.")
+
+        shape = info_entry["data"].shape
+        axes = [(None, None)] * len(shape)
+        if self.file_object.get_component_index(component_name).has_bins:
+            for dim, var in enumerate(_AXIS_VARIABLES[: len(shape)]):
+                loaded_var, axis = self.file_object.get_var_and_axis(
+                    component_name, f"{var}var", f"{var}label"
+                )
+                # Coordinates are bin centers or edges of the dimension
+                if axis is not None and len(axis) in (shape[dim], shape[dim] + 1):
+                    axes[dim] = (loaded_var, axis)
+
+        return MonitorHistogram(info_entry, axes=axes, chunk_size=chunk_size)
+
     def calculate_pixel_locations(self, component_name):
         """
         Calculates pixel locations for given component, these are stored in
@@ -184,6 +431,16 @@ class Data:
         components own frame, then a separate method stores and transforms
         to the global coordinate system.
         """
+        with self.instrumentation.stage("pixel_map", component_name):
+            coordinates, pixels = self.calculate_local_pixel_locations(component_name)
+            self.store_and_transform(coordinates, pixels, component_name)
+
+    def calculate_local_pixel_locations(self, component_name):
+        """
+        Calculates pixel locations for given component in its own frame
+
+        :return: tuple with coordinates of shape (N, 3) and pixel id's
+        """
 
         xvar, x_axis = self.file_object.get_x_var_and_axis(component_name)
         yvar, y_axis = self.file_object.get_y_var_and_axis(component_name)
@@ -227,7 +484,7 @@ class Data:
             raise ValueError("Unknown geometry")
 
         coordinates = np.column_stack((local_x, local_y, local_z))
-        self.store_and_transform(coordinates, pixels, component_name)
+        return coordinates, pixels
 
     def store_and_transform(self, coordinates, pixels, component_name):
         """
@@ -235,40 +492,15 @@ class Data:
         them having to be calculated again. The pixel id ranges are stored
         to check for overlaps.
         """
-        self.local_pixel_locations[component_name] = coordinates
-
         min_pixel = np.min(pixels)
         max_pixel = np.max(pixels)
-        self.pixel_range[component_name] = [min_pixel, max_pixel]
 
-        # Check for overlap
-        for comp in self.component_pixel_order:
-            comp_min_pixel = self.pixel_range[comp][0]
-            comp_max_pixel = self.pixel_range[comp][1]
+        # Check for overlap and find point in sequence, before anything of
+        # a bank that overlaps is stored
+        self.bank_registry.register(component_name, min_pixel, max_pixel)
 
-            if (
-                comp_min_pixel <= min_pixel <= comp_max_pixel
-                or comp_min_pixel <= max_pixel <= comp_max_pixel
-            ):
-                raise ValueError(
-                    f"Overlap of pixel id's between {comp} and {component_name}"
-                )
-
-        # Find point in sequence
-        if len(self.component_pixel_order) == 0:
-            self.component_pixel_order.append(component_name)
-        else:
-            # Quick check to see if it should be added to end
-            last_comp = self.component_pixel_order[-1]
-            last_comp_max = self.pixel_range[last_comp][1]
-            if min_pixel > last_comp_max:
-                self.component_pixel_order.append(component_name)
-            else:
-                for index, comp in enumerate(self.component_pixel_order):
-                    comp_min_pixel = self.pixel_range[comp][0]
-                    if min_pixel < comp_min_pixel:
-                        self.component_pixel_order.insert(index, component_name)
-                        break
+        self.local_pixel_locations[component_name] = coordinates
+        self.pixel_range[component_name] = [min_pixel, max_pixel]
 
         self.global_pixel_locations[component_name] = self.transform(
             coordinates, component_name
@@ -283,8 +515,31 @@ class Data:
         :param component_name: component name
         :return: numpy array shape (N, 3) representing positions in global coordinate
         """
-        pos, rot = self.get_component_placement(component_name)
-        return coordinates @ rot + pos
+        placement = self.file_object.get_placement_table()
+        row = placement.get_row(component_name)
+        return coordinates @ placement.rotations[row] + placement.positions[row]
+
+    def transform_many(self, coordinates, component_names):
+        """
+        Transforms coordinates in the frames of several components to global
+
+        The placement of all components is taken from the placement table,
+        read once, and the points of each component are transformed with one
+        matrix product, so no rotation matrix is repeated for each point.
+
+        :param coordinates: list of numpy arrays of shape (N_i, 3), one for
+                            each component, in the frame of that component
+        :param component_names: list of component names
+        :return: list of numpy arrays shape (N_i, 3) with global positions
+        """
+        placement = self.file_object.get_placement_table()
+        rows = [placement.get_row(comp) for comp in component_names]
+
+        return [
+            np.asarray(points).reshape(-1, 3) @ placement.rotations[row]
+            + placement.positions[row]
+            for points, row in zip(coordinates, rows, strict=True)
+        ]
 
     def get_component_global(self, component_name):
         """
@@ -311,9 +566,35 @@ class Data:
         This is done to ensure that no overlaps in pixel id's exist
         """
         id_components = self.get_components_with_ids()
-        for comp in id_components:
-            if comp not in self.global_pixel_locations:
-                self.calculate_pixel_locations(comp)
+        new_components = [
+            comp for comp in id_components if comp not in self.global_pixel_locations
+        ]
+        if len(new_components) == 0:
+            return
+
+        local_locations = {}
+        new_ranges = {}
+        for comp in new_components:
+            with self.instrumentation.stage("pixel_map", comp):
+                coordinates, pixels = self.calculate_local_pixel_locations(comp)
+            local_locations[comp] = coordinates
+            new_ranges[comp] = [np.min(pixels), np.max(pixels)]
+
+        with self.instrumentation.stage("pixel_map"):
+            # Check for overlaps and order all new banks in one pass
+            self.bank_registry.register_many(
+                new_components,
+                [new_ranges[comp][0] for comp in new_components],
+                [new_ranges[comp][1] for comp in new_components],
+            )
+
+            global_locations = self.transform_many(
+                [local_locations[comp] for comp in new_components], new_components
+            )
+        for comp, global_location in zip(new_components, global_locations, strict=True):
+            self.local_pixel_locations[comp] = local_locations[comp]
+            self.pixel_range[comp] = new_ranges[comp]
+            self.global_pixel_locations[comp] = global_location
 
     def check_id_continuous(self):
         """
@@ -325,16 +606,7 @@ class Data:
         self.load_all_with_id()
 
         # Only possible if there is nice continuous coverage of pixel id's
-        last_end = -1
-        for comp in self.component_pixel_order:
-            comp_min_pixel = self.pixel_range[comp][0]
-            comp_max_pixel = self.pixel_range[comp][1]
-            if comp_min_pixel != last_end + 1:
-                return False
-
-            last_end = comp_max_pixel
-
-        return True
+        return self.bank_registry.is_continuous()
 
     def get_highest_id(self):
         """
@@ -424,6 +696,40 @@ class Data:
         """
         return self.get_id_to_coordinate(local=True, component_name=component_name)
 
+    def get_id_lookup(self, component_name=None, local=False):
+        """
+        Provides a compact lookup from pixel id to pixel position
+
+        Only the pixels of the banks are stored, so unlike get_id_to_coordinate
+        no array sized by the highest pixel id is allocated. Looking up a
+        pixel id that does not exist raises a ValueError.
+
+        :param component_name: name of component, or list of names,
+                               all components with pixel id's if None
+        :param local: if True, local frame is used
+        :return: PixelLookup, index with an array of pixel ids to get positions
+        """
+        # Load all monitors that have pixel id's
+        self.load_all_with_id()
+
+        if component_name is None:
+            components = self.component_pixel_order
+        elif not isinstance(component_name, list):
+            components = [component_name]
+        else:
+            components = component_name
+
+        if local:
+            locations = self.local_pixel_locations
+        else:
+            locations = self.global_pixel_locations
+
+        return PixelLookup(
+            starts=[self.pixel_range[comp][0] for comp in components],
+            ends=[self.pixel_range[comp][1] for comp in components],
+            positions=[locations[comp] for comp in components],
+        )
+
     def export_scipp_simple(
         self,
         source_name,
@@ -431,6 +737,7 @@ class Data:
         component_name=None,
         filter_zeros=True,
         extra_variables=None,
+        dtypes=None,
     ):
         """
         Provides simple scipp object that is easy to work with but takes more space
@@ -442,6 +749,8 @@ class Data:
         :param filter_zeros: If True events with zero weight are filtered out
         :param extra_variables: List of extra variables to load and include
                                 (not yet functional)
+        :param dtypes: optional dictionary with data type for some variables,
+                       for example float32 for p and t to save memory
         :return: scipp object
         """
         try:
@@ -464,28 +773,30 @@ class Data:
             variables=variables,
             component_name=component_name,
             filter_zeros=filter_zeros,
+            dtypes=dtypes,
         )
 
         # Retrieve coordinates corresponding to id's
-        global_coordinates = self.get_id_to_global_coordinates(
-            component_name=component_name
-        )
-        global_pos = global_coordinates[event_data["id"].astype(int), :]
+        global_coordinates = self.get_id_lookup(component_name=component_name)
+        global_pos = global_coordinates[event_data["id"]]
 
         source_pos = self.get_global_component_coordinates(source_name)
         sample_pos = self.get_global_component_coordinates(sample_name)
 
-        events = sc.DataArray(
-            data=sc.array(
-                dims=['events'], unit=sc.units.counts, values=event_data["p"]
-            ),
-            coords={
-                'position': sc.vectors(dims=['events'], values=global_pos, unit='m'),
-                't': sc.array(dims=['events'], unit='s', values=event_data["t"]),
-                'source_position': sc.vector(source_pos, unit='m'),
-                'sample_position': sc.vector(sample_pos, unit='m'),
-            },
-        )
+        with self.instrumentation.stage("scipp_events"):
+            events = sc.DataArray(
+                data=sc.array(
+                    dims=['events'], unit=sc.units.counts, values=event_data["p"]
+                ),
+                coords={
+                    'position': sc.vectors(
+                        dims=['events'], values=global_pos, unit='m'
+                    ),
+                    't': sc.array(dims=['events'], unit='s', values=event_data["t"]),
+                    'source_position': sc.vector(source_pos, unit='m'),
+                    'sample_position': sc.vector(sample_pos, unit='m'),
+                },
+            )
 
         return events
 
@@ -496,6 +807,7 @@ class Data:
         component_name=None,
         filter_zeros=True,
         extra_variables=None,
+        dtypes=None,
     ):
         """
         Provides scipp DataGroup with pixel information
@@ -507,7 +819,11 @@ class Data:
         :param filter_zeros: If True events with zero weight are filtered out
         :param extra_variables: List of extra variables to load and include
                                 (not yet functional)
-        :return: scipp DataGroup with events, positions, bank_ids and bank_names
+        :param dtypes: optional dictionary with data type for some variables,
+                       for example float32 for p and t to save memory
+        :return: scipp DataGroup with events, positions, bank_ids and bank_names,
+                 positions is a DataArray with the position of each pixel of
+                 the banks and their pixel_id as coordinate
         """
         try:
             import scipp as sc
@@ -516,8 +832,6 @@ class Data:
                 "Scipp installation required to export to Scipp format"
             ) from e
 
-        # todo: Make as generator to work in chunks
-
         variables = ["p", "t", "id"]
         if extra_variables is not None:
             if not isinstance(extra_variables, list):
@@ -529,30 +843,22 @@ class Data:
             variables=variables,
             component_name=component_name,
             filter_zeros=filter_zeros,
+            dtypes=dtypes,
         )
         # Prepare events data
         source_pos = self.get_global_component_coordinates(source_name)
         sample_pos = self.get_global_component_coordinates(sample_name)
 
-        events = sc.DataArray(
-            data=sc.array(
-                dims=['events'], unit=sc.units.counts, values=event_data["p"]
-            ),
-            coords={
-                'pixel_id': sc.array(
-                    dims=['events'], values=event_data["id"].astype(int)
-                ),
-                't': sc.array(dims=['events'], unit='s', values=event_data["t"]),
-                'source_position': sc.vector(source_pos, unit='m'),
-                'sample_position': sc.vector(sample_pos, unit='m'),
-            },
-        )
+        with self.instrumentation.stage("scipp_events"):
+            events = self._make_scipp_events(event_data, source_pos, sample_pos)
 
-        # Retrieve coordinates corresponding to id's
-        global_coordinates = self.get_id_to_global_coordinates(
-            component_name=component_name
+        # Positions of the pixels of the banks only, without the dense array
+        # indexed by pixel id of get_id_to_global_coordinates
+        lookup = self.get_id_lookup(component_name=component_name)
+        id_object = sc.DataArray(
+            data=sc.vectors(dims=['pixel_id'], values=lookup.positions, unit='m'),
+            coords={'pixel_id': sc.array(dims=['pixel_id'], values=lookup.ids)},
         )
-        id_object = sc.vectors(dims=['pixel_id'], values=global_coordinates, unit='m')
 
         # Prepare information on pixel ids and names
         id_matrix = []
@@ -573,12 +879,506 @@ class Data:
         )
 
         # Group events by pixels and embed the pixel positions to each group
-        output_object["events"] = sc.group(output_object["events"], "pixel_id")
-        pixel_positions = output_object["positions"].values[
-            output_object["events"].coords["pixel_id"].values, :
-        ]
-        output_object["events"].coords["position"] = sc.vectors(
-            dims=["pixel_id"], values=pixel_positions, unit="m"
-        )
+        with self.instrumentation.stage("group_by_pixel"):
+            output_object["events"] = self._group_by_pixel(
+                output_object["events"], lookup
+            )
 
         return output_object
+
+    def export_scipp_chunks(
+        self,
+        source_name,
+        sample_name,
+        component_name=None,
+        filter_zeros=True,
+        extra_variables=None,
+        dtypes=None,
+        chunk_size=None,
+        chunk_bytes=None,
+        group=False,
+    ):
+        """
+        Provides the events of export_scipp as a generator of scipp DataArrays
+
+        Each DataArray holds the events of one chunk with pixel_id, t and the
+        source and sample positions as coordinates, so data that does not fit
+        in memory can be processed incrementally.
+
+        :param source_name: Name of source component
+        :param sample_name: Name of sample component
+        :param component_name: Name of component with data
+                               (if None all is loaded, can also be list)
+        :param filter_zeros: If True events with zero weight are filtered out
+        :param extra_variables: List of extra variables to load and include
+                                as coordinates
+        :param dtypes: optional dictionary with data type for some variables,
+                       for example float32 for p and t to save memory
+        :param chunk_size: maximum number of events in each chunk
+        :param chunk_bytes: maximum size of the event arrays read for each
+                            chunk in bytes, alternative to chunk_size
+        :param group: If True each chunk is grouped by pixel_id and has the
+                      pixel positions as coordinate
+        :return: generator of scipp DataArrays
+        """
+        try:
+            import scipp as sc
+        except ImportError as e:
+            raise ImportError(
+                "Scipp installation required to export to Scipp format"
+            ) from e
+
+        variables = ["p", "t", "id"]
+        if extra_variables is not None:
+            if not isinstance(extra_variables, list):
+                extra_variables = [extra_variables]
+            variables += extra_variables
+        else:
+            extra_variables = []
+
+        source_pos = self.get_global_component_coordinates(source_name)
+        sample_pos = self.get_global_component_coordinates(sample_name)
+
+        if group:
+            global_coordinates = self.get_id_lookup(component_name=component_name)
+
+        chunks = self.get_event_data_chunks(
+            variables=variables,
+            component_name=component_name,
+            filter_zeros=filter_zeros,
+            chunk_size=chunk_size,
+            chunk_bytes=chunk_bytes,
+            dtypes=dtypes,
+        )
+        for chunk in chunks:
+            with self.instrumentation.stage("scipp_events", chunk.component_name):
+                events = self._make_scipp_events(chunk.data, source_pos, sample_pos)
+                for var in extra_variables:
+                    events.coords[var] = sc.array(
+                        dims=['events'], values=chunk.data[var]
+                    )
+
+            if group:
+                with self.instrumentation.stage("group_by_pixel", chunk.component_name):
+                    events = self._group_by_pixel(events, global_coordinates)
+
+            yield events
+
+    def histogram_events(
+        self,
+        bins_t,
+        component_name=None,
+        weights="p",
+        t_range=None,
+        as_scipp=False,
+        chunk_size=None,
+        chunk_bytes=None,
+    ):
+        """
+        Histograms events by pixel id and time-of-flight while streaming chunks
+
+        Events are read a chunk at a time and added to the histogram, so the
+        full event list is never held in memory. Histogram rows are the pixel
+        ids of the banks in increasing order, events with an id outside the
+        banks raise a ValueError.
+
+        :param bins_t: time-of-flight bin edges in s, or number of bins
+                       spanning t_range
+        :param component_name: Name of component with data
+                               (if None all with pixel id's, can also be list)
+        :param weights: variable used as event weight, None to count events
+        :param t_range: tuple with lowest and highest time-of-flight in s,
+                        needed when bins_t is a number of bins
+        :param as_scipp: If True a scipp DataArray is returned
+        :param chunk_size: maximum number of events in each chunk
+        :param chunk_bytes: maximum size of the event arrays read for each
+                            chunk in bytes, alternative to chunk_size
+        :return: dictionary with data and variances of shape (pixels, bins),
+                 pixel_id and t bin edges, or scipp DataArray if as_scipp
+        """
+        if as_scipp:
+            try:
+                import scipp as sc
+            except ImportError as e:
+                raise ImportError(
+                    "Scipp installation required to export to Scipp format"
+                ) from e
+
+        if np.ndim(bins_t) == 0:
+            if t_range is None:
+                raise ValueError("t_range is needed when bins_t is a number of bins.")
+            bins_t = np.linspace(t_range[0], t_range[1], int(bins_t) + 1)
+
+        if component_name is None:
+            self.load_all_with_id()
+            component_name = list(self.component_pixel_order)
+
+        lookup = self.get_id_lookup(component_name=component_name)
+        histogram = PixelTimeHistogram(len(lookup), bins_t)
+
+        variables = ["t", "id"]
+        if weights is not None:
+            variables.append(weights)
+
+        chunks = self.get_event_data_chunks(
+            variables=variables,
+            component_name=component_name,
+            filter_zeros=False,
+            chunk_size=chunk_size,
+            chunk_bytes=chunk_bytes,
+        )
+        for chunk in chunks:
+            histogram.add(
+                rows=lookup.get_index(chunk.data["id"]),
+                t=chunk.data["t"],
+                weights=None if weights is None else chunk.data[weights],
+            )
+
+        if not as_scipp:
+            return dict(
+                data=histogram.data,
+                variances=histogram.variances,
+                pixel_id=lookup.ids,
+                t=histogram.edges,
+            )
+
+        return sc.DataArray(
+            data=sc.array(
+                dims=["pixel_id", "t"],
+                values=histogram.data,
+                variances=histogram.variances,
+                unit=sc.units.counts,
+            ),
+            coords={
+                "pixel_id": sc.array(dims=["pixel_id"], values=lookup.ids),
+                "position": sc.vectors(
+                    dims=["pixel_id"], values=lookup.positions, unit="m"
+                ),
+                "t": sc.array(dims=["t"], values=histogram.edges, unit="s"),
+            },
+        )
+
+    def export_nexus_events(
+        self,
+        path,
+        component_name=None,
+        filter_zeros=True,
+        dtypes=None,
+        chunk_size=None,
+        chunk_bytes=None,
+        dataset_chunk_size=None,
+        compression="gzip",
+        compression_opts=None,
+    ):
+        """
+        Writes events to a NeXus file with an NXdetector for each bank
+
+        Each detector holds its pixel numbers and global pixel positions as
+        pixel offsets, and its events in an NXevent_data group with event_id,
+        event_time_offset, event_time_zero and event_index. All events belong
+        to a single pulse at time zero, and their weights are written to
+        event_weight. Events are written chunk by chunk as they are read.
+
+        :param path: path of the NeXus file to write, overwritten if it exists
+        :param component_name: Name of component with data
+                               (if None all with pixel id's, can also be list)
+        :param filter_zeros: If True events with zero weight are filtered out
+        :param dtypes: optional dictionary with data type for id, t and p,
+                       by default id is int64 and t and p float64
+        :param chunk_size: maximum number of events read in each chunk
+        :param chunk_bytes: maximum size of the event arrays read for each
+                            chunk in bytes, alternative to chunk_size
+        :param dataset_chunk_size: number of events in each HDF5 chunk of the
+                                   written event datasets
+        :param compression: HDF5 compression filter, None for no compression
+        :param compression_opts: options for the compression filter
+        """
+        self.load_all_with_id()
+        if component_name is None:
+            components = list(self.component_pixel_order)
+        elif not isinstance(component_name, list):
+            components = [component_name]
+        else:
+            components = component_name
+
+        variables = ["p", "t", "id"]
+        event_dtypes = _get_event_dtypes(variables, dtypes)
+
+        with h5py.File(path, "w") as nexus_file:
+            entry = create_nx_group(nexus_file, "entry", "NXentry")
+            instrument = create_nx_group(entry, "instrument", "NXinstrument")
+            for comp in components:
+                lookup = self.get_id_lookup(component_name=comp)
+                detector = write_nx_detector(
+                    instrument, comp, lookup.ids, lookup.positions
+                )
+                writer = EventDataWriter(
+                    detector,
+                    f"{comp}_events",
+                    event_dtypes,
+                    dataset_chunk_size=dataset_chunk_size,
+                    compression=compression,
+                    compression_opts=compression_opts,
+                )
+                chunks = self.get_event_data_chunks(
+                    variables=variables,
+                    component_name=comp,
+                    filter_zeros=filter_zeros,
+                    chunk_size=chunk_size,
+                    chunk_bytes=chunk_bytes,
+                    dtypes=dtypes,
+                )
+                for chunk in chunks:
+                    writer.append(chunk.data)
+
+    def export_arrow(
+        self,
+        component_name=None,
+        filter_zeros=True,
+        extra_variables=None,
+        dtypes=None,
+        chunk_size=None,
+        chunk_bytes=None,
+    ):
+        """
+        Provides events as a generator of pyarrow RecordBatches
+
+        The columns wrap the numpy arrays read for each chunk without copying.
+        Pixel positions are available as a separate table from
+        get_arrow_pixel_table, which can be joined on id.
+
+        :param component_name: Name of component with data
+                               (if None all is loaded, can also be list)
+        :param filter_zeros: If True events with zero weight are filtered out
+        :param extra_variables: List of extra variables to include as columns
+        :param dtypes: optional dictionary with data type for some variables,
+                       by default id is int64 and other variables float64
+        :param chunk_size: maximum number of events in each batch
+        :param chunk_bytes: maximum size of the event arrays read for each
+                            batch in bytes, alternative to chunk_size
+        :return: generator of pyarrow RecordBatches with p, t, id and extra columns
+        """
+        pa = self._import_pyarrow()
+
+        variables = ["p", "t", "id"]
+        if extra_variables is not None:
+            if not isinstance(extra_variables, list):
+                extra_variables = [extra_variables]
+            variables += extra_variables
+
+        schema = self._get_arrow_schema(variables, dtypes)
+        chunks = self.get_event_data_chunks(
+            variables=variables,
+            component_name=component_name,
+            filter_zeros=filter_zeros,
+            chunk_size=chunk_size,
+            chunk_bytes=chunk_bytes,
+            dtypes=dtypes,
+        )
+        for chunk in chunks:
+            columns = []
+            for field in schema:
+                values = np.ascontiguousarray(chunk.data[field.name])
+                columns.append(
+                    pa.Array.from_buffers(
+                        field.type, len(values), [None, pa.py_buffer(values)]
+                    )
+                )
+
+            yield pa.RecordBatch.from_arrays(columns, schema=schema)
+
+    def get_arrow_pixel_table(self, component_name=None):
+        """
+        :param component_name: name of component, or list of names,
+                               all components with pixel id's if None
+        :return: pyarrow Table with id and global position_x, position_y and
+                 position_z of each pixel
+        """
+        pa = self._import_pyarrow()
+
+        lookup = self.get_id_lookup(component_name=component_name)
+        return pa.table(
+            {
+                "id": lookup.ids,
+                "position_x": lookup.positions[:, 0],
+                "position_y": lookup.positions[:, 1],
+                "position_z": lookup.positions[:, 2],
+            }
+        )
+
+    def export_parquet(
+        self,
+        path,
+        pixel_path=None,
+        component_name=None,
+        filter_zeros=True,
+        extra_variables=None,
+        dtypes=None,
+        chunk_size=None,
+        chunk_bytes=None,
+        compression="snappy",
+    ):
+        """
+        Writes events to a Parquet file, streaming one batch at a time
+
+        Pixel positions are written to a separate small Parquet file with
+        the columns of get_arrow_pixel_table, which can be joined with the
+        events on id.
+
+        :param path: path of the Parquet file with events
+        :param pixel_path: path of the Parquet file with pixel positions,
+                           by default path with _pixels added before suffix
+        :param component_name: Name of component with data
+                               (if None all is loaded, can also be list)
+        :param filter_zeros: If True events with zero weight are filtered out
+        :param extra_variables: List of extra variables to include as columns
+        :param dtypes: optional dictionary with data type for some variables,
+                       by default id is int64 and other variables float64
+        :param chunk_size: maximum number of events in each batch
+        :param chunk_bytes: maximum size of the event arrays read for each
+                            batch in bytes, alternative to chunk_size
+        :param compression: Parquet compression codec
+        """
+        self._import_pyarrow()
+        import pyarrow.parquet as pq
+
+        if pixel_path is None:
+            root, suffix = os.path.splitext(path)
+            pixel_path = f"{root}_pixels{suffix or '.parquet'}"
+
+        variables = ["p", "t", "id"]
+        if extra_variables is not None:
+            if not isinstance(extra_variables, list):
+                extra_variables = [extra_variables]
+            variables += extra_variables
+
+        batches = self.export_arrow(
+            component_name=component_name,
+            filter_zeros=filter_zeros,
+            extra_variables=extra_variables,
+            dtypes=dtypes,
+            chunk_size=chunk_size,
+            chunk_bytes=chunk_bytes,
+        )
+        # Schema given up front so a file without events is still valid
+        schema = self._get_arrow_schema(variables, dtypes)
+        with pq.ParquetWriter(path, schema, compression=compression) as writer:
+            for batch in batches:
+                writer.write_batch(batch)
+
+        pixel_component_name = component_name
+        if component_name is not None:
+            # Only components with pixel id's have positions
+            with_ids = self.get_components_with_ids()
+            if not isinstance(component_name, list):
+                component_name = [component_name]
+            pixel_component_name = [comp for comp in component_name if comp in with_ids]
+
+        pq.write_table(
+            self.get_arrow_pixel_table(component_name=pixel_component_name),
+            pixel_path,
+            compression=compression,
+        )
+
+    @staticmethod
+    def _import_pyarrow():
+        try:
+            import pyarrow as pa
+        except ImportError as e:
+            raise ImportError(
+                "pyarrow installation required to export to Arrow format"
+            ) from e
+
+        return pa
+
+    @staticmethod
+    def _get_arrow_schema(variables, dtypes):
+        """
+        :return: pyarrow schema with a column for each variable
+        """
+        import pyarrow as pa
+
+        return pa.schema(
+            [
+                (var, pa.from_numpy_dtype(dtype))
+                for var, dtype in _get_event_dtypes(variables, dtypes).items()
+            ]
+        )
+
+    @staticmethod
+    def _group_by_pixel(events, lookup):
+        """
+        Groups events by pixel_id like scipp.group, using a counting sort over
+        the pixels of the lookup table instead of a general sort
+
+        :param events: scipp DataArray with pixel_id coordinate along events
+        :param lookup: PixelLookup with all pixel id's of the events
+        :return: binned scipp DataArray with pixel_id and position of each
+                 pixel with events
+        """
+        import scipp as sc
+
+        pixel_id = events.coords["pixel_id"]
+        order, counts = sort_by_pixel(lookup.get_index(pixel_id.values), len(lookup))
+
+        def sort_events(variable):
+            return sc.array(
+                dims=["events"],
+                values=variable.values[order],
+                unit=variable.unit,
+                dtype=variable.dtype,
+            )
+
+        content = sc.DataArray(
+            data=sort_events(events.data),
+            coords={
+                name: sort_events(coord)
+                for name, coord in events.coords.items()
+                if name != "pixel_id" and "events" in coord.dims
+            },
+        )
+
+        # Only pixels with events get a bin, as with scipp.group
+        present = counts > 0
+        begin = (np.cumsum(counts) - counts)[present]
+        coords = {
+            name: coord for name, coord in events.coords.items() if coord.ndim == 0
+        }
+        coords["pixel_id"] = sc.array(
+            dims=["pixel_id"],
+            values=lookup.ids[present],
+            unit=pixel_id.unit,
+            dtype=pixel_id.dtype,
+        )
+        coords["position"] = sc.vectors(
+            dims=["pixel_id"], values=lookup.positions[present], unit="m"
+        )
+
+        return sc.DataArray(
+            data=sc.bins(
+                begin=sc.array(dims=["pixel_id"], values=begin, unit=None),
+                dim="events",
+                data=content,
+            ),
+            coords=coords,
+        )
+
+    @staticmethod
+    def _make_scipp_events(event_data, source_pos, sample_pos):
+        """
+        :return: scipp DataArray with weights, pixel_id, t and source and
+                 sample positions of the given event data
+        """
+        import scipp as sc
+
+        return sc.DataArray(
+            data=sc.array(
+                dims=['events'], unit=sc.units.counts, values=event_data["p"]
+            ),
+            coords={
+                'pixel_id': sc.array(dims=['events'], values=event_data["id"]),
+                't': sc.array(dims=['events'], unit='s', values=event_data["t"]),
+                'source_position': sc.vector(source_pos, unit='m'),
+                'sample_position': sc.vector(sample_pos, unit='m'),
+            },
+        )
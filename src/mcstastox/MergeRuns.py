@@ -0,0 +1,319 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import contextlib
+import math
+
+import h5py
+import numpy as np
+
+from .ReadNeXus import McStasNeXus, _get_chunk_length
+
+# Datasets of a histogram monitor in its info entry
+_HISTOGRAM_DATASETS = ("data", "errors", "ncount")
+
+# Attributes McStas writes on the info entry of a monitor that summarise
+# its data, and so are not valid for the merged data
+_SUMMARY_ATTRIBUTES = ("values", "signal", "statistics", "ratio")
+
+
+def _format_ncount(ncount):
+    """
+    McStas writes Ncount as a byte string of the number
+    """
+    if float(ncount).is_integer():
+        return np.bytes_(str(int(ncount)).encode("utf-8"))
+    return np.bytes_(str(ncount).encode("utf-8"))
+
+
+def _set_summary_attributes(info_entry, ncount, totals=None):
+    """
+    Replaces the summary attributes copied from the first run to the info
+    entry of a merged monitor
+
+    Ncount is the total of the runs, values and signal are recomputed from
+    the totals of a merged histogram as McStas writes them, other summary
+    attributes are dropped. Only attributes present in the first run are set.
+
+    :param totals: dictionary with intensity, error, ncount, min and max of
+                   a merged histogram, None for event monitors
+    """
+    present = set(info_entry.attrs)
+    for name in _SUMMARY_ATTRIBUTES:
+        if name in present:
+            del info_entry.attrs[name]
+
+    if "Ncount" in present:
+        info_entry.attrs["Ncount"] = _format_ncount(ncount)
+    if totals is None:
+        return
+
+    if "values" in present:
+        info_entry.attrs["values"] = np.bytes_(
+            f"{totals['intensity']:g} {totals['error']:g} {totals['ncount']:g}"
+        )
+    if "signal" in present:
+        info_entry.attrs["signal"] = np.bytes_(
+            f"Min={totals['min']:g}; Max={totals['max']:g}; Mean={totals['mean']:g};"
+        )
+
+
+def _get_merged_components(runs):
+    """
+    Finds the components with event or histogram data and checks all runs
+    have the same components with the same data layout
+
+    :return: tuple with lists of event components and histogram components
+    """
+    first = runs[0]
+    event_components = []
+    histogram_components = []
+    for comp in first.get_components_with_data():
+        if len(first.get_component_index(comp).info_entry_names) != 1:
+            continue
+        info_entry = first.get_info_entry(comp)
+        if "events" in info_entry:
+            event_components.append(comp)
+        elif all(name in info_entry for name in _HISTOGRAM_DATASETS):
+            histogram_components.append(comp)
+
+    for run in runs[1:]:
+        if run.get_components() != first.get_components():
+            raise ValueError(
+                f"{run.file_handle.filename} has other components than "
+                f"{first.file_handle.filename}."
+            )
+        for comp in event_components:
+            if run.get_component_variables(comp) != first.get_component_variables(comp):
+                raise ValueError(
+                    f"Events of '{comp}' in {run.file_handle.filename} have other "
+                    f"variables than in {first.file_handle.filename}."
+                )
+        for comp in histogram_components:
+            shape = first.get_info_entry(comp)["data"].shape
+            info_entry = run.get_info_entry(comp)
+            if any(info_entry[name].shape != shape for name in _HISTOGRAM_DATASETS):
+                raise ValueError(
+                    f"Histogram of '{comp}' in {run.file_handle.filename} does not "
+                    f"have shape {shape}."
+                )
+
+    return event_components, histogram_components
+
+
+def _copy_structure(source, destination, merged, links, path=""):
+    """
+    Copies groups, attributes and datasets of source to destination, except
+    the datasets that are merged, which only get their parent groups
+
+    :param merged: dictionary with path of each merged dataset of the first run
+    :param links: list extended with (path, merged path) of hard links to
+                  merged datasets found elsewhere in the file
+    """
+    destination.attrs.update(source.attrs)
+    for name in source:
+        link = source.get(name, getlink=True)
+        item_path = f"{path}/{name}"
+        if isinstance(link, h5py.SoftLink | h5py.ExternalLink):
+            destination[name] = link
+            continue
+
+        item = source[name]
+        if isinstance(item, h5py.Group):
+            _copy_structure(
+                item, destination.create_group(name), merged, links, item_path
+            )
+        elif item_path in merged.values():
+            continue
+        elif item in merged:
+            links.append((item_path, merged[item]))
+        else:
+            source.copy(item, destination, name)
+
+
+def _create_like(destination, path, dataset, shape, compression, compression_opts):
+    """
+    :return: new dataset with the attributes and data type of given dataset,
+             contiguous unless compressed, as McStas writes them
+    """
+    storage = {}
+    if compression is not None and math.prod(shape) > 0:
+        storage = dict(
+            chunks=True, compression=compression, compression_opts=compression_opts
+        )
+    output = destination.create_dataset(
+        path, shape=shape, dtype=dataset.dtype, **storage
+    )
+    output.attrs.update(dataset.attrs)
+    return output
+
+
+def _merge_events(runs, weights, comp, output, chunk_length):
+    """
+    Concatenates the events of a component, the weights of each run are
+    scaled by its share of the rays, using one buffer of chunk_length events
+    """
+    p_index = None
+    if "p" in runs[0].get_component_variables(comp).split():
+        p_index = runs[0].get_variable_index(comp, "p")
+
+    buffer = np.empty((chunk_length, output.shape[1]), dtype=output.dtype)
+    offset = 0
+    for run, weight in zip(runs, weights, strict=True):
+        dataset = run.get_component_events_dataset(comp)
+        n_events = run.get_component_n_events(comp)
+        for start in range(0, n_events, chunk_length):
+            length = min(chunk_length, n_events - start)
+            dataset.read_direct(buffer, np.s_[start : start + length], np.s_[:length])
+            if p_index is not None:
+                buffer[:length, p_index] *= weight
+            output.write_direct(buffer, np.s_[:length], np.s_[offset : offset + length])
+            offset += length
+
+
+def _merge_histograms(runs, weights, comp, outputs, chunk_length):
+    """
+    Combines the histograms of a component as a mean weighted by the rays of
+    each run, summing the errors in quadrature and the ncounts, a slab of
+    rows of about chunk_length bins at a time
+
+    :return: dictionary with intensity, error, ncount, min, max and mean of
+             the merged histogram
+    """
+    shape = outputs["data"].shape
+    if len(shape) == 0:
+        slabs = [()]
+    else:
+        row_size = max(math.prod(shape[1:]), 1)
+        n_rows = max(chunk_length // row_size, 1)
+        slabs = [
+            np.s_[start : min(start + n_rows, shape[0])]
+            for start in range(0, shape[0], n_rows)
+        ]
+
+    totals = dict(intensity=0.0, variance=0.0, ncount=0.0, min=np.inf, max=-np.inf)
+    for slab in slabs:
+        data = 0.0
+        variances = 0.0
+        ncount = 0.0
+        for run, weight in zip(runs, weights, strict=True):
+            info_entry = run.get_info_entry(comp)
+            data = data + weight * info_entry["data"][slab]
+            variances = variances + (weight * info_entry["errors"][slab]) ** 2
+            ncount = ncount + info_entry["ncount"][slab]
+
+        outputs["data"][slab] = data
+        outputs["errors"][slab] = np.sqrt(variances)
+        outputs["ncount"][slab] = ncount
+
+        totals["intensity"] += np.sum(data)
+        totals["variance"] += np.sum(variances)
+        totals["ncount"] += np.sum(ncount)
+        if np.size(data) > 0:
+            totals["min"] = min(totals["min"], np.min(data))
+            totals["max"] = max(totals["max"], np.max(data))
+
+    totals["error"] = np.sqrt(totals.pop("variance"))
+    totals["mean"] = totals["intensity"] / max(math.prod(shape), 1)
+    return totals
+
+
+def merge_runs(
+    file_paths,
+    output_path,
+    chunk_size=None,
+    chunk_bytes=None,
+    compression=None,
+    compression_opts=None,
+):
+    """
+    Merges McStas NeXus files of independent runs of the same instrument
+
+    The output has the layout of the first file. Events of each monitor are
+    concatenated with weights scaled by the share of the total Ncount of
+    their run, so the sum of weights is the Ncount weighted mean intensity.
+    Histograms are combined as the same weighted mean, errors in quadrature,
+    and ncount is summed. Data is streamed chunk by chunk, so the memory use
+    does not depend on the number of events. Summary attributes of merged
+    monitors are recomputed or dropped, see _set_summary_attributes.
+
+    :param file_paths: list of paths of McStas NeXus files to merge
+    :param output_path: path of the merged file, overwritten if it exists
+    :param chunk_size: maximum number of events or bins held at a time
+    :param chunk_bytes: maximum size of the held events in bytes,
+                        alternative to chunk_size
+    :param compression: HDF5 compression of merged datasets, None to store
+                        them contiguous as McStas does
+    :param compression_opts: options for the compression filter
+    :return: path of the merged file
+    """
+    if len(file_paths) == 0:
+        raise ValueError("No files to merge.")
+
+    with contextlib.ExitStack() as stack:
+        runs = [
+            McStasNeXus(stack.enter_context(h5py.File(path, "r", swmr=True)))
+            for path in file_paths
+        ]
+        event_components, histogram_components = _get_merged_components(runs)
+
+        ncounts = np.array([run.get_ncount() for run in runs])
+        if ncounts.sum() <= 0:
+            raise ValueError("Runs to merge must have a positive total Ncount.")
+        weights = ncounts / ncounts.sum()
+
+        # Paths of the datasets of the first run that are replaced by merged ones
+        first = runs[0]
+        merged = {}
+        for comp in event_components:
+            dataset = first.get_component_events_dataset(comp)
+            merged[dataset] = dataset.name
+        for comp in histogram_components:
+            info_entry = first.get_info_entry(comp)
+            for name in _HISTOGRAM_DATASETS:
+                merged[info_entry[name]] = info_entry[name].name
+
+        output = stack.enter_context(h5py.File(output_path, "w"))
+        links = []
+        _copy_structure(first.file_handle, output, merged, links)
+        output["entry1/simulation"].attrs["Ncount"] = _format_ncount(ncounts.sum())
+
+        for comp in event_components:
+            dataset = first.get_component_events_dataset(comp)
+            n_total = sum(run.get_component_n_events(comp) for run in runs)
+            events = _create_like(
+                output,
+                dataset.name,
+                dataset,
+                (n_total, dataset.shape[1]),
+                compression,
+                compression_opts,
+            )
+            chunk_length = _get_chunk_length(
+                dataset.shape[1] * dataset.dtype.itemsize, chunk_size, chunk_bytes
+            )
+            _merge_events(runs, weights, comp, events, chunk_length)
+            _set_summary_attributes(events.parent, ncounts.sum())
+
+        for comp in histogram_components:
+            info_entry = first.get_info_entry(comp)
+            outputs = {
+                name: _create_like(
+                    output,
+                    info_entry[name].name,
+                    info_entry[name],
+                    info_entry[name].shape,
+                    compression,
+                    compression_opts,
+                )
+                for name in _HISTOGRAM_DATASETS
+            }
+            chunk_length = _get_chunk_length(
+                3 * np.dtype(np.float64).itemsize, chunk_size, chunk_bytes
+            )
+            totals = _merge_histograms(runs, weights, comp, outputs, chunk_length)
+            _set_summary_attributes(output[info_entry.name], ncounts.sum(), totals)
+
+        for path, merged_path in links:
+            output[path] = output[merged_path]
+
+    return output_path
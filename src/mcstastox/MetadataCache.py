@@ -0,0 +1,114 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import hashlib
+import json
+import os
+
+import numpy as np
+
+# Suffix added to the name of the data file for the sidecar cache
+CACHE_SUFFIX = ".mcstastox-cache.npz"
+
+
+def get_cache_path(file_path, cache_dir=None):
+    """
+    Provides the path of the sidecar cache file for given data file
+
+    :param file_path: path of the McStas NeXus file
+    :param cache_dir: optional directory for cache files, if None the cache
+                      is placed next to the data file
+    :return: path of the cache file
+    """
+    if cache_dir is None:
+        return file_path + CACHE_SUFFIX
+
+    # Name the cache after the full path, as many runs share the file name
+    absolute_path = os.path.abspath(file_path)
+    digest = hashlib.sha256(absolute_path.encode("utf-8")).hexdigest()[:16]
+    name = f"{os.path.basename(file_path)}-{digest}{CACHE_SUFFIX}"
+    return os.path.join(cache_dir, name)
+
+
+def get_cache_key(file_path):
+    """
+    :return: dictionary identifying the state of the data file and the
+             version of mcstastox, a cache is only valid for an identical key
+    """
+    from . import __version__
+
+    stat = os.stat(file_path)
+    return dict(
+        path=os.path.abspath(file_path),
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        version=__version__,
+    )
+
+
+def load_cache(cache_path, key):
+    """
+    Loads metadata and pixel tables from a cache file
+
+    :param cache_path: path of the cache file
+    :param key: cache key of the current data file
+    :return: tuple with metadata and pixel tables, both None if the cache
+             does not exist, is unreadable or is stale
+    """
+    if not os.path.isfile(cache_path):
+        return None, None
+
+    try:
+        with np.load(cache_path, allow_pickle=False) as cache:
+            header = json.loads(str(cache["header"]))
+            if header["key"] != key:
+                return None, None
+
+            pixel_tables = dict(
+                component_pixel_order=header["component_pixel_order"],
+                pixel_range=header["pixel_range"],
+                local_pixel_locations={},
+                global_pixel_locations={},
+            )
+            for index, comp in enumerate(header["pixel_components"]):
+                pixel_tables["local_pixel_locations"][comp] = cache[f"local_{index}"]
+                pixel_tables["global_pixel_locations"][comp] = cache[f"global_{index}"]
+    except (OSError, ValueError, KeyError):
+        return None, None
+
+    return header["metadata"], pixel_tables
+
+
+def save_cache(cache_path, key, metadata, pixel_tables):
+    """
+    Writes metadata and pixel tables to a cache file
+
+    The file is written next to the final path and moved into place, so
+    readers never see a partially written cache.
+
+    :param cache_path: path of the cache file
+    :param key: cache key of the data file
+    :param metadata: dictionary from McStasNeXus.get_metadata
+    :param pixel_tables: dictionary with component_pixel_order, pixel_range,
+                         local_pixel_locations and global_pixel_locations
+    """
+    pixel_components = list(pixel_tables["global_pixel_locations"])
+    header = dict(
+        key=key,
+        metadata=metadata,
+        component_pixel_order=list(pixel_tables["component_pixel_order"]),
+        pixel_range={
+            comp: [int(value) for value in pixel_range]
+            for comp, pixel_range in pixel_tables["pixel_range"].items()
+        },
+        pixel_components=pixel_components,
+    )
+
+    arrays = {"header": np.array(json.dumps(header))}
+    for index, comp in enumerate(pixel_components):
+        arrays[f"local_{index}"] = pixel_tables["local_pixel_locations"][comp]
+        arrays[f"global_{index}"] = pixel_tables["global_pixel_locations"][comp]
+
+    temporary_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(temporary_path, "wb") as file:
+        np.savez(file, **arrays)
+    os.replace(temporary_path, cache_path)
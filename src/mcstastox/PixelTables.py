@@ -0,0 +1,270 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import bisect
+
+import numpy as np
+
+
+class PixelLookup:
+    """
+    Maps pixel ids to pixel positions using a table of banks
+
+    Each bank covers a continuous range of pixel ids and has a position for
+    each of them. Memory use follows the number of real pixels, not the
+    highest pixel id, and gaps between banks cost nothing.
+    """
+
+    def __init__(self, starts, ends, positions):
+        """
+        :param starts: lowest pixel id of each bank
+        :param ends: highest pixel id of each bank
+        :param positions: list with array of shape (end - start + 1, 3)
+                          for each bank, ordered by pixel id
+        """
+        starts = np.asarray(starts, dtype=np.int64).reshape(-1)
+        ends = np.asarray(ends, dtype=np.int64).reshape(-1)
+        lengths = ends - starts + 1
+        for length, bank_positions in zip(lengths, positions, strict=True):
+            if len(bank_positions) != length:
+                raise ValueError(
+                    f"Bank with {length} pixel ids has {len(bank_positions)} positions."
+                )
+
+        order = np.argsort(starts, kind="stable")
+        self.starts = starts[order]
+        self.ends = ends[order]
+        if np.any(self.starts[1:] <= self.ends[:-1]):
+            raise ValueError("Overlap of pixel id's between banks.")
+
+        # Index of the first pixel of each bank in the positions array
+        self.offsets = np.zeros(len(order), dtype=np.int64)
+        np.cumsum(lengths[order][:-1], out=self.offsets[1:])
+
+        if len(order) == 0:
+            self.positions = np.empty((0, 3))
+        else:
+            self.positions = np.concatenate([positions[index] for index in order])
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __getitem__(self, ids):
+        """
+        :return: positions of the given pixel ids
+        """
+        return self.positions[self.get_index(ids)]
+
+    @property
+    def ids(self):
+        """
+        :return: all pixel ids in the table, sorted
+        """
+        ids = np.empty(len(self), dtype=np.int64)
+        for start, end, offset in zip(
+            self.starts, self.ends, self.offsets, strict=True
+        ):
+            ids[offset : offset + end - start + 1] = np.arange(start, end + 1)
+
+        return ids
+
+    def get_bank(self, ids):
+        """
+        :return: index of the bank of each id, -1 for ids not in any bank
+        """
+        ids = np.asarray(ids).astype(np.int64, copy=False)
+        bank = np.searchsorted(self.starts, ids, side="right") - 1
+        found = bank >= 0
+        found[found] = ids[found] <= self.ends[bank[found]]
+        return np.where(found, bank, -1)
+
+    def contains(self, ids):
+        """
+        :return: boolean array, True for ids that have a position
+        """
+        return self.get_bank(ids) >= 0
+
+    def get_index(self, ids):
+        """
+        Provides the index in the positions array of given pixel ids
+
+        :param ids: array of pixel ids, floats are truncated to integers
+        :return: array of indices with same shape as ids
+        """
+        ids = np.asarray(ids).astype(np.int64, copy=False)
+        bank = self.get_bank(ids)
+        missing = bank < 0
+        if np.any(missing):
+            raise ValueError(f"No pixel with id {ids[missing].flat[0]} in pixel table.")
+
+        return self.offsets[bank] + (ids - self.starts[bank])
+
+
+class BankRegistry:
+    """
+    Sorted registry of pixel id ranges of banks
+
+    Banks are kept ordered by their lowest pixel id, so a new bank only has
+    to be checked for overlap against its neighbours, found by bisection.
+    Banks registered one at a time go to a sorted pending list, which is
+    appended to when banks come in increasing order of pixel id, as McStas
+    numbers them, and merged into the sorted banks in one pass on the next
+    lookup, so registering n banks does not move the sorted lists n times.
+    """
+
+    def __init__(self):
+        self._names = []
+        self._starts = []
+        self._ends = []
+        # Banks registered since the last lookup, sorted by lowest pixel id
+        self._pending = ([], [], [])
+
+    @property
+    def names(self):
+        """
+        :return: list of bank names sorted by lowest pixel id
+        """
+        self._sort_pending()
+        return self._names
+
+    @property
+    def starts(self):
+        """
+        :return: list of lowest pixel id of each bank, sorted
+        """
+        self._sort_pending()
+        return self._starts
+
+    @property
+    def ends(self):
+        """
+        :return: list of highest pixel id of each bank, in order of starts
+        """
+        self._sort_pending()
+        return self._ends
+
+    def __len__(self):
+        return len(self._names) + len(self._pending[0])
+
+    def __contains__(self, name):
+        return name in self.names
+
+    def register(self, name, start, end):
+        """
+        Registers a bank with pixel ids from start to end, both included
+
+        :raises ValueError: if the range overlaps a registered bank, which
+                            is then not registered
+        """
+        start = int(start)
+        end = int(end)
+        self._check_overlap(self._names, self._starts, self._ends, name, start, end)
+        index = self._check_overlap(*self._pending, name, start, end)
+
+        for pending, value in zip(self._pending, (name, start, end), strict=True):
+            pending.insert(index, value)
+
+    @classmethod
+    def _check_overlap(cls, names, starts, ends, name, start, end):
+        """
+        :return: index of the new bank in sorted lists of banks
+        :raises ValueError: if the range overlaps a bank in the lists
+        """
+        index = bisect.bisect_right(starts, start)
+
+        # A bank starting below can only overlap if it ends at or after start,
+        # the next bank if it starts before end. This also covers containment.
+        if index > 0 and ends[index - 1] >= start:
+            cls._raise_overlap(names[index - 1], name)
+        if index < len(starts) and starts[index] <= end:
+            cls._raise_overlap(names[index], name)
+
+        return index
+
+    def _sort_pending(self):
+        """
+        Merges the pending banks into the sorted banks, overlap was already
+        checked when they were registered
+        """
+        if len(self._pending[0]) == 0:
+            return
+
+        self._merge(*self._pending)
+        self._pending = ([], [], [])
+
+    def register_many(self, names, starts, ends):
+        """
+        Registers several banks at once, sorting all banks in one pass
+
+        :raises ValueError: if any ranges overlap, nothing is registered then
+        """
+        self._sort_pending()
+        self._merge(names, starts, ends)
+
+    def _merge(self, names, starts, ends):
+        """
+        Sorts the given banks in with the sorted banks
+
+        :raises ValueError: if any ranges overlap, nothing is registered then
+        """
+        all_names = self._names + list(names)
+        all_starts = np.asarray(self._starts + [int(start) for start in starts])
+        all_ends = np.asarray(self._ends + [int(end) for end in ends])
+
+        order = np.argsort(all_starts, kind="stable")
+        sorted_starts = all_starts[order]
+        sorted_ends = all_ends[order]
+
+        # Sorted by start, so overlap means starting at or before the end of
+        # any bank before, not only the previous one
+        previous_end = np.maximum.accumulate(sorted_ends)
+        overlaps = np.flatnonzero(sorted_starts[1:] <= previous_end[:-1])
+        if len(overlaps) > 0:
+            index = overlaps[0] + 1
+            earlier = np.flatnonzero(sorted_ends[:index] >= sorted_starts[index])[0]
+            self._raise_overlap(all_names[order[earlier]], all_names[order[index]])
+
+        self._names = [all_names[index] for index in order]
+        self._starts = sorted_starts.tolist()
+        self._ends = sorted_ends.tolist()
+
+    def is_continuous(self):
+        """
+        :return: True if the banks cover all pixel ids from 0 without gaps
+        """
+        if len(self) == 0:
+            return True
+
+        starts = np.asarray(self.starts)
+        ends = np.asarray(self.ends)
+        return bool(starts[0] == 0 and np.all(starts[1:] == ends[:-1] + 1))
+
+    @staticmethod
+    def _raise_overlap(existing_name, new_name):
+        raise ValueError(
+            f"Overlap of pixel id's between {existing_name} and {new_name}"
+        )
+
+
+def sort_by_pixel(rows, n_pixels):
+    """
+    Provides the order that sorts events by pixel row in linear time
+
+    Rows are sorted 16 bits at a time with stable sorts of uint16 digits,
+    which numpy does with a counting sort, so the cost is linear in the
+    number of events. Events of the same pixel keep their order.
+
+    :param rows: pixel row of each event, from 0 to n_pixels - 1
+    :param n_pixels: number of pixel rows
+    :return: tuple with the sorting order and the number of events of each row
+    """
+    rows = np.asarray(rows)
+    counts = np.bincount(rows, minlength=n_pixels)
+
+    order = None
+    for shift in range(0, max(int(n_pixels - 1).bit_length(), 1), 16):
+        sorted_rows = rows if order is None else rows[order]
+        digits = ((sorted_rows >> shift) & 0xFFFF).astype(np.uint16)
+        digit_order = np.argsort(digits, kind="stable")
+        order = digit_order if order is None else order[digit_order]
+
+    return order, counts
@@ -0,0 +1,229 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import os
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import h5py
+import numpy as np
+
+# HDF5 filters that can be undone here, decompression of anything else
+# is left to h5py
+_SUPPORTED_FILTERS = (
+    h5py.h5z.FILTER_DEFLATE,
+    h5py.h5z.FILTER_SHUFFLE,
+    h5py.h5z.FILTER_FLETCHER32,
+)
+
+
+def get_chunk_filters(dataset):
+    """
+    Provides the filter pipeline of a chunked dataset if it can be decoded here
+
+    :param dataset: h5py dataset
+    :return: tuple of HDF5 filter ids in pipeline order, None if the dataset
+             is not chunked, not compressed or uses an unsupported filter
+    """
+    if dataset.chunks is None or dataset.ndim != 2:
+        return None
+
+    plist = dataset.id.get_create_plist()
+    filters = tuple(plist.get_filter(index)[0] for index in range(plist.get_nfilters()))
+    if h5py.h5z.FILTER_DEFLATE not in filters:
+        # Nothing to gain without decompression
+        return None
+
+    if any(code not in _SUPPORTED_FILTERS for code in filters):
+        return None
+
+    return filters
+
+
+# Number of 16 bit words summed by HDF5 before reducing the Fletcher sums
+_FLETCHER32_BLOCK = 360
+
+
+def _reduce_fletcher(value):
+    return (value & 0xFFFF) + (value >> 16)
+
+
+def _fletcher32(data):
+    """
+    Computes the checksum of the HDF5 fletcher32 filter
+
+    Same as H5_checksum_fletcher32 of HDF5, bytes are summed as big endian
+    16 bit words in blocks of 360 words, with the sums reduced after each
+    block and held in 32 bits.
+
+    :param data: bytes of the filtered chunk without the stored checksum
+    :return: checksum as unsigned 32 bit integer
+    """
+    n_words = len(data) // 2
+    words = np.frombuffer(data, dtype=">u2", count=n_words).astype(np.int64)
+
+    # Sum of the words of each block, and the sum of the running sums of
+    # the words, which is added to the second sum
+    n_full = n_words // _FLETCHER32_BLOCK
+    blocks = [words[: n_full * _FLETCHER32_BLOCK].reshape(-1, _FLETCHER32_BLOCK)]
+    if n_words % _FLETCHER32_BLOCK:
+        blocks.append(words[n_full * _FLETCHER32_BLOCK :].reshape(1, -1))
+
+    sum1 = 0
+    sum2 = 0
+    for block in blocks:
+        length = block.shape[1]
+        word_sums = block.sum(axis=1).tolist()
+        running_sums = (block @ np.arange(length, 0, -1)).tolist()
+        for word_sum, running_sum in zip(word_sums, running_sums, strict=True):
+            sum2 = (sum2 + length * sum1 + running_sum) & 0xFFFFFFFF
+            sum1 = (sum1 + word_sum) & 0xFFFFFFFF
+            sum1 = _reduce_fletcher(sum1)
+            sum2 = _reduce_fletcher(sum2)
+
+    if len(data) % 2:
+        # Last byte of an odd length is the high byte of a word
+        sum1 += data[-1] << 8
+        sum2 += sum1
+        sum1 = _reduce_fletcher(sum1)
+        sum2 = _reduce_fletcher(sum2)
+
+    sum1 = _reduce_fletcher(sum1)
+    sum2 = _reduce_fletcher(sum2)
+    return ((sum2 << 16) | sum1) & 0xFFFFFFFF
+
+
+def _check_fletcher32(data):
+    """
+    Verifies the checksum at the end of a chunk written with fletcher32
+
+    Like HDF5, a checksum with the bytes of each 16 bit half swapped is
+    also accepted, as older versions of HDF5 wrote it that way.
+
+    :param data: bytes of the chunk with the checksum in the last 4 bytes
+    :return: bytes of the chunk without the checksum
+    :raises OSError: if the checksum does not match, as h5py raises
+    """
+    stored = int.from_bytes(data[-4:], "little")
+    data = data[:-4]
+    checksum = _fletcher32(data)
+    reversed_checksum = ((checksum & 0x00FF00FF) << 8) | ((checksum & 0xFF00FF00) >> 8)
+    if stored not in (checksum, reversed_checksum):
+        raise OSError("Data error detected by Fletcher32 checksum.")
+
+    return data
+
+
+def _decode_chunk(raw, filter_mask, filters, dtype, chunk_shape):
+    """
+    Undo the filter pipeline of a raw chunk, last filter first.
+
+    :raises OSError: if the chunk fails its Fletcher32 checksum
+    """
+    data = raw
+    for index in reversed(range(len(filters))):
+        if filter_mask & (1 << index):
+            # Filter was skipped for this chunk when writing
+            continue
+
+        code = filters[index]
+        if code == h5py.h5z.FILTER_FLETCHER32:
+            data = _check_fletcher32(data)
+        elif code == h5py.h5z.FILTER_DEFLATE:
+            data = zlib.decompress(data)
+        elif code == h5py.h5z.FILTER_SHUFFLE:
+            n_elements = len(data) // dtype.itemsize
+            shuffled = np.frombuffer(
+                data, dtype=np.uint8, count=n_elements * dtype.itemsize
+            )
+            data = shuffled.reshape(dtype.itemsize, n_elements).T.tobytes()
+
+    return np.frombuffer(data, dtype=dtype).reshape(chunk_shape)
+
+
+def read_chunked_columns(
+    dataset, columns, outputs, rows=None, offset=0, workers=None, filters=None
+):
+    """
+    Reads columns of a compressed 2D dataset with decompression in threads
+
+    Raw chunks are read with read_direct_chunk, which is quick as no
+    decompression happens under the h5py lock. The chunks are decompressed in
+    a thread pool, zlib releases the GIL, and the requested columns are
+    scattered into the output arrays. Only chunks holding requested columns
+    are read, and a bounded number of chunks is in flight at a time.
+
+    :param dataset: chunked h5py dataset with supported filters
+    :param columns: list of column indices to read
+    :param outputs: list of 1D output arrays, one for each column
+    :param rows: optional slice of rows to read, all rows if None
+    :param offset: index in output arrays where the first row is written
+    :param workers: number of decompression threads, default is CPU count
+    :param filters: filter pipeline from get_chunk_filters, looked up if None
+    :return: number of rows read
+    """
+    if filters is None:
+        filters = get_chunk_filters(dataset)
+        if filters is None:
+            raise ValueError("Dataset chunks can not be decoded outside of h5py.")
+
+    if rows is None:
+        rows = slice(None)
+    start, stop, _ = rows.indices(dataset.shape[0])
+    if stop <= start:
+        return 0
+
+    chunk_rows, chunk_columns = dataset.chunks
+    dtype = dataset.dtype
+
+    # Group requested columns by the column of chunks holding them
+    chunk_column_groups = {}
+    for column, output in zip(columns, outputs, strict=True):
+        first_column = column - column % chunk_columns
+        chunk_column_groups.setdefault(first_column, []).append((column, output))
+
+    def scatter(raw, filter_mask, first_row, first_column):
+        if raw is None:
+            # Chunk not stored in the file, read through h5py instead
+            block = dataset[
+                first_row : first_row + chunk_rows,
+                first_column : first_column + chunk_columns,
+            ]
+        else:
+            block = _decode_chunk(
+                raw, filter_mask, filters, dtype, (chunk_rows, chunk_columns)
+            )
+
+        row_start = max(start, first_row)
+        row_stop = min(stop, first_row + chunk_rows)
+        destination = np.s_[offset + row_start - start : offset + row_stop - start]
+        for column, output in chunk_column_groups[first_column]:
+            output[destination] = block[
+                row_start - first_row : row_stop - first_row, column - first_column
+            ]
+
+    first_chunk_row = start - start % chunk_rows
+    chunk_offsets = [
+        (first_row, first_column)
+        for first_row in range(first_chunk_row, stop, chunk_rows)
+        for first_column in chunk_column_groups
+    ]
+
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = 2 * workers
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for chunk_offset in chunk_offsets:
+            try:
+                filter_mask, raw = dataset.id.read_direct_chunk(chunk_offset)
+            except (KeyError, OSError, ValueError):
+                filter_mask, raw = 0, None
+
+            in_flight.append(pool.submit(scatter, raw, filter_mask, *chunk_offset))
+            if len(in_flight) >= max_in_flight:
+                in_flight.popleft().result()
+
+        while in_flight:
+            in_flight.popleft().result()
+
+    return stop - start
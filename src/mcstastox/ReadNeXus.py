@@ -1,6 +1,9 @@
 # SPDX-License-Identifier: BSD-3-Clause
 # Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import dataclasses
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from types import MappingProxyType
 from typing import cast
@@ -8,6 +11,9 @@ from typing import cast
 import h5py
 import numpy as np
 
+from .Instrumentation import NO_INSTRUMENTATION
+from .ReadChunks import get_chunk_filters, read_chunked_columns
+
 
 @dataclass(frozen=True)
 class McStasVersionSetting:
@@ -17,6 +23,269 @@ class McStasVersionSetting:
     """True when geometry info included"""
 
 
+@dataclass(frozen=True)
+class EventChunk:
+    component_name: str
+    """Name of the component the events were read from"""
+    start: int
+    """Global index of the first event, counted over all requested components"""
+    stop: int
+    """Global index after the last event"""
+    component_start: int
+    """Index of the first event in the events dataset of the component"""
+    data: dict
+    """Dictionary with keys named after variables and numpy arrays as values"""
+
+
+@dataclass(frozen=True)
+class ComponentIndex:
+    path: str
+    """Name of the component group in 'entry1/instrument/components'"""
+    has_output: bool = False
+    """True when the component has an output entry"""
+    has_bins: bool = False
+    """True when the output entry has a BINS entry"""
+    has_pixels: bool = False
+    """True when the BINS entry has a pixels entry"""
+    has_geometry: bool = False
+    """True when the component has a Geometry entry"""
+    info_entry_names: tuple[str, ...] = ()
+    """Names of the entries in the output entry other than BINS"""
+    variables: str | None = None
+    """Variables attribute of the info entry, recorded for each event"""
+    variable_index: dict[str, int] | None = None
+    """Column in the events dataset of each variable"""
+    n_events: int | None = None
+    """Number of events, None when there is no events entry"""
+    events_dtype: str | None = None
+    """Data type of the events dataset, None when there is no events entry"""
+
+
+def _index_component(path: str, component_entry: h5py.Group) -> ComponentIndex:
+    """
+    Collect the structure of a component entry in a single pass.
+    """
+    component_keys = tuple(component_entry.keys())
+    has_geometry = "Geometry" in component_keys
+    if "output" not in component_keys:
+        return ComponentIndex(path=path, has_geometry=has_geometry)
+
+    output_entry = component_entry["output"]
+    output_keys = tuple(output_entry.keys())
+    has_bins = "BINS" in output_keys
+    info_entry_names = tuple(key for key in output_keys if key != "BINS")
+
+    variables = None
+    variable_index = None
+    n_events = None
+    events_dtype = None
+    if len(info_entry_names) == 1:
+        info_entry = output_entry[info_entry_names[0]]
+        if "variables" in info_entry.attrs:
+            variables = info_entry.attrs["variables"].decode("utf-8")
+            # First occurrence of a name wins, as with list.index
+            variable_index = {}
+            for column, var in enumerate(variables.split(" ")):
+                variable_index.setdefault(var, column)
+
+        if isinstance(info_entry, h5py.Group) and "events" in info_entry:
+            events = info_entry["events"]
+            n_events = events.shape[0]
+            events_dtype = events.dtype.str
+
+    return ComponentIndex(
+        path=path,
+        has_output=True,
+        has_bins=has_bins,
+        has_pixels=has_bins and "pixels" in output_entry["BINS"],
+        has_geometry=has_geometry,
+        info_entry_names=info_entry_names,
+        variables=variables,
+        variable_index=variable_index,
+        n_events=n_events,
+        events_dtype=events_dtype,
+    )
+
+
+@dataclass(frozen=True, eq=False)
+class PlacementTable:
+    component_names: tuple[str, ...]
+    """Names of components with placement, in file order"""
+    positions: np.ndarray
+    """Global position of each component, shape (C, 3)"""
+    rotations: np.ndarray
+    """Rotation matrix of each component, shape (C, 3, 3)"""
+    component_rows: dict[str, int]
+    """Row in positions and rotations of each component name"""
+
+    def get_row(self, component_name: str) -> int:
+        """
+        Get the row of given component name in positions and rotations.
+        """
+        if component_name not in self.component_rows:
+            raise ValueError(
+                f"No placement for component with name '{component_name}' in file."
+            )
+        return self.component_rows[component_name]
+
+
+class EventBuffers:
+    """
+    Pool of output arrays reused between event reads
+
+    Arrays are only reallocated when a read needs more events than they hold,
+    or a different data type, so reading many files of similar size does not
+    allocate new arrays each time. The arrays returned by a read are views
+    into the pool and are overwritten by the next read using the pool.
+    """
+
+    def __init__(self, headroom=0.25):
+        """
+        :param headroom: fraction of extra space allocated when growing
+        """
+        self.headroom = headroom
+        self.arrays: dict[str, np.ndarray] = {}
+        self.length = 0
+        """Number of events filled by the last read"""
+
+    def get(self, event_dtypes, length):
+        """
+        :param event_dtypes: dictionary with data type for each variable
+        :param length: number of events needed
+        :return: dictionary with view of the pool arrays of given length
+        """
+        for var, dtype in event_dtypes.items():
+            array = self.arrays.get(var)
+            if array is None or array.dtype != dtype or len(array) < length:
+                capacity = int(length * (1 + self.headroom))
+                self.arrays[var] = np.empty(capacity, dtype=dtype)
+
+        self.length = length
+        return {var: self.arrays[var][:length] for var in event_dtypes}
+
+
+def _get_output_arrays(out, event_dtypes, length):
+    """
+    Get the arrays to fill with events from given buffers, or new arrays.
+    """
+    if out is None:
+        return {
+            var: np.empty(length, dtype=dtype) for var, dtype in event_dtypes.items()
+        }
+
+    if isinstance(out, EventBuffers):
+        return out.get(event_dtypes, length)
+
+    returns = {}
+    for var in event_dtypes:
+        if var not in out:
+            raise ValueError(f"No output buffer given for variable {var}.")
+
+        buffer = out[var]
+        if buffer.ndim != 1 or len(buffer) < length:
+            raise ValueError(
+                f"Output buffer for {var} must be 1D with room for {length} events."
+            )
+
+        returns[var] = buffer[:length]
+
+    return returns
+
+
+# Data type of event variables read when not given, others are float64
+_DEFAULT_EVENT_DTYPES: MappingProxyType[str, np.dtype] = MappingProxyType(
+    {"id": np.dtype(np.int64)}
+)
+
+
+def _get_event_dtypes(
+    variables: list[str], dtypes: dict | None = None
+) -> dict[str, np.dtype]:
+    """
+    Get the output data type of each variable, given ones override defaults.
+    """
+    dtypes = {**_DEFAULT_EVENT_DTYPES, **(dtypes or {})}
+    return {var: np.dtype(dtypes.get(var, np.float64)) for var in variables}
+
+
+# Default number of events in a chunk when neither size nor bytes are given
+_DEFAULT_CHUNK_SIZE = 1_000_000
+
+
+def _get_chunk_length(
+    event_bytes: int, chunk_size: int | None = None, chunk_bytes: int | None = None
+) -> int:
+    """
+    Get the number of events in a chunk from a size in events or in bytes.
+    """
+    if chunk_size is not None and chunk_bytes is not None:
+        raise ValueError("Specify either chunk_size or chunk_bytes, not both.")
+
+    if chunk_bytes is not None:
+        chunk_size = chunk_bytes // max(event_bytes, 1)
+    elif chunk_size is None:
+        chunk_size = _DEFAULT_CHUNK_SIZE
+
+    if chunk_size < 1:
+        raise ValueError("Chunk must be large enough to hold at least one event.")
+
+    return int(chunk_size)
+
+
+# Size of the slabs of rows read from chunked event datasets
+_SLAB_BYTES = 16 * 1024**2
+
+
+def _read_row_slabs(dataset, columns, outputs, rows, offset=0):
+    """
+    Reads columns of a chunked 2D dataset in slabs of whole chunk rows
+
+    Reading one column at a time decompresses every chunk once per column.
+    Here the rows are read in slabs aligned to the chunk rows, holding the
+    span of the requested columns, and the columns are copied out of the
+    slab, so each chunk is decompressed once. One slab buffer of about
+    _SLAB_BYTES is reused.
+
+    :param dataset: chunked h5py dataset of shape (events, variables)
+    :param columns: list of column indices to read
+    :param outputs: list of 1D output arrays, one for each column
+    :param rows: slice of rows to read, with explicit start and stop
+    :param offset: index in output arrays where the first row is written
+    """
+    first_column = min(columns)
+    n_columns = max(columns) - first_column + 1
+    chunk_rows = dataset.chunks[0]
+    row_bytes = n_columns * dataset.dtype.itemsize
+    slab_rows = max(_SLAB_BYTES // (row_bytes * chunk_rows), 1) * chunk_rows
+
+    slab = np.empty((slab_rows, n_columns), dtype=dataset.dtype)
+    column_span = np.s_[first_column : first_column + n_columns]
+    # Slabs start on chunk boundaries, the first and last may be partial
+    for slab_start in range(rows.start - rows.start % chunk_rows, rows.stop, slab_rows):
+        start = max(slab_start, rows.start)
+        stop = min(slab_start + slab_rows, rows.stop)
+        length = stop - start
+        dataset.read_direct(slab, np.s_[start:stop, column_span], np.s_[:length])
+
+        destination = np.s_[offset + start - rows.start : offset + stop - rows.start]
+        for column, output in zip(columns, outputs, strict=True):
+            output[destination] = slab[:length, column - first_column]
+
+
+def _map_components(function, components, workers=None):
+    """
+    Calls function for each component, in a thread pool when workers > 1.
+
+    Results are returned in the order of the components and exceptions raised
+    in a thread are raised again here.
+    """
+    if workers is None or workers <= 1 or len(components) <= 1:
+        return [function(comp) for comp in components]
+
+    with ThreadPoolExecutor(max_workers=min(workers, len(components))) as pool:
+        return list(pool.map(function, components))
+
+
 # McStas version settings registry.
 # Easy cheat-sheet for each version of McStas.
 # Keep it rrdered from the newest to the oldest for easier maintenance.
@@ -86,8 +355,34 @@ class McStasNeXus:
         *,
         mcstas_version: tuple[int, int, int] | None = None,
         mcstas_setting_registry: _McStasVersionSettingTp = _MCSTAS_VERSION_SETTINGS,
+        metadata: dict | None = None,
+        memmap: bool = False,
+        decompress_workers: int | None = None,
     ):
         self.file_handle = file_handle
+        # Read contiguous uncompressed events through memory maps of the file
+        self.memmap = memmap
+        self._events_memmaps: dict = {}
+        # Events dataset of the last component read, kept open so its chunk
+        # cache still holds the last chunks for the next read of the rows after
+        self._events_dataset: tuple | None = None
+        # Decompress chunked events in this many threads instead of in h5py
+        self.decompress_workers = decompress_workers
+        # Positions and rotations of all components, read on first use
+        self._placement_table: PlacementTable | None = None
+        # Records time and sizes of reading stages when replaced by an
+        # enabled Instrumentation
+        self.instrumentation = NO_INSTRUMENTATION
+        self.component_names: list
+        self.component_path_names: dict
+        # Index of the structure of each component, queries are answered from it
+        self.component_index: dict[str, ComponentIndex]
+
+        if metadata is not None:
+            # Metadata from an earlier scan of the same file, skips the scan
+            self._load_metadata(metadata, mcstas_setting_registry)
+            return
+
         # Check file is formatted as expected
         _validate_file(self.file_handle)
         self.mcstas_version = mcstas_version or self._read_mcstas_version()
@@ -98,9 +393,47 @@ class McStasNeXus:
         )
 
         # Grab basic information
-        self.component_names: list
-        self.component_path_names: dict
         self._read_component_name_and_path()
+        self._build_component_index()
+
+    def close(self):
+        """
+        Releases the memory maps and the events dataset held by the reader,
+        so the file can be removed or replaced. The file handle is left open,
+        it is closed by its owner.
+        """
+        self._events_memmaps.clear()
+        self._events_dataset = None
+
+    def get_metadata(self) -> dict:
+        """
+        :return: JSON serializable dictionary with the McStas version and
+                 component index, can be given to the constructor of the same
+                 file to skip scanning it
+        """
+        return dict(
+            mcstas_version=list(self.mcstas_version),
+            component_path_names=dict(self.component_path_names),
+            component_index={
+                name: dataclasses.asdict(index)
+                for name, index in self.component_index.items()
+            },
+        )
+
+    def _load_metadata(
+        self, metadata: dict, mcstas_setting_registry: _McStasVersionSettingTp
+    ) -> None:
+        self.mcstas_version = tuple(metadata["mcstas_version"])
+        self.settings = _get_mcstas_version_settings(
+            self.mcstas_version, mcstas_setting_registry
+        )
+        self.component_path_names = dict(metadata["component_path_names"])
+        self.component_names = list(self.component_path_names)
+        self.component_index = {}
+        for name, fields in metadata["component_index"].items():
+            fields = dict(fields)
+            fields["info_entry_names"] = tuple(fields["info_entry_names"])
+            self.component_index[name] = ComponentIndex(**fields)
 
     def _read_component_name_and_path(self) -> None:
         if self.settings.component_numbers is None:
@@ -119,6 +452,24 @@ class McStasNeXus:
                 zip(self.component_names, component_paths, strict=True)
             )
 
+    def _build_component_index(self) -> None:
+        components_entry = self.file_handle["entry1"]["instrument"]["components"]
+        self.component_index = {
+            name: _index_component(path, components_entry[path])
+            for name, path in self.component_path_names.items()
+        }
+
+    def get_component_index(self, component_name):
+        """
+        :return: ComponentIndex describing the structure of given component
+        """
+        if component_name not in self.component_index:
+            raise ValueError(
+                f"No component with name '{component_name}' found in file."
+            )
+
+        return self.component_index[component_name]
+
     def _read_mcstas_version(self) -> tuple[int, int, int]:
         f = self.file_handle
         if "program" not in list(f["entry1"]["simulation"].attrs):
@@ -140,6 +491,41 @@ class McStasNeXus:
             "Hardcode the version as an argument to the class."
         )
 
+    def get_simulation_parameters(self):
+        """
+        :return: dictionary with the instrument parameters of the simulation
+                 in 'entry1/simulation/Param', numbers converted to float
+        """
+        parameter_entry = self.file_handle["entry1"]["simulation"]["Param"]
+
+        parameters = {}
+        for name, value in parameter_entry.attrs.items():
+            if isinstance(value, bytes):
+                value = value.decode("utf-8")
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                pass
+
+            parameters[name] = value
+
+        return parameters
+
+    def get_ncount(self):
+        """
+        :return: number of rays simulated, Ncount attribute of
+                 'entry1/simulation'
+        """
+        simulation_entry = self.file_handle["entry1"]["simulation"]
+        if "Ncount" not in simulation_entry.attrs:
+            raise ValueError("'entry1/simulation' does not have Ncount attribute.")
+
+        ncount = simulation_entry.attrs["Ncount"]
+        if isinstance(ncount, bytes):
+            ncount = ncount.decode("utf-8")
+
+        return float(ncount)
+
     def get_components(self):
         """
         :return: list of component names
@@ -150,14 +536,11 @@ class McStasNeXus:
         """
         :return: list of component names that have data
         """
-        components_with_data = []
-
-        for comp in self.component_names:
-            component_entry = self.get_component_entry(comp)
-            if "output" in list(component_entry.keys()):
-                components_with_data.append(comp)
-
-        return list(components_with_data)
+        return [
+            comp
+            for comp in self.component_names
+            if self.component_index[comp].has_output
+        ]
 
     def get_components_with_ids(self):
         """
@@ -165,44 +548,67 @@ class McStasNeXus:
         """
         components_with_ids = []
         for comp in self.get_components_with_data():
-            output_entry = self.get_output_entry(comp)
-            output_contents = list(output_entry.keys())
-
-            if "BINS" in output_entry and len(output_contents) > 1:
+            index = self.component_index[comp]
+            if index.has_bins and len(index.info_entry_names) > 0:
                 # Need both BINS entry and data output to have data
                 components_with_ids.append(comp)
 
-        return list(components_with_ids)
+        return components_with_ids
 
     def get_components_with_geometry(self):
         """
         :return: list of component names that has geometry info
         """
-        components_with_geometry = []
-        for comp in self.get_components_with_data():
-            comp_entry = self.get_component_entry(comp)
-            if "Geometry" in comp_entry:
-                components_with_geometry.append(comp)
-
-        return list(components_with_geometry)
+        return [
+            comp
+            for comp in self.get_components_with_data()
+            if self.component_index[comp].has_geometry
+        ]
 
     def get_component_entry(self, component_name):
         """
         :return: the component entry of the specified component
         """
-        if component_name not in self.component_path_names:
-            raise ValueError(
-                f"No component with name '{component_name}' found in file."
-            )
+        path = self.get_component_index(component_name).path
+        return self.file_handle["entry1"]["instrument"]["components"][path]
+
+    def get_placement_table(self) -> PlacementTable:
+        """
+        Provides position and rotation of all components, read from file once
 
-        component_name = self.component_path_names[component_name]
-        return self.file_handle["entry1"]["instrument"]["components"][component_name]
+        :return: PlacementTable with positions of shape (C, 3) and rotations
+                 of shape (C, 3, 3)
+        """
+        if self._placement_table is not None:
+            return self._placement_table
+
+        components_entry = self.file_handle["entry1"]["instrument"]["components"]
+        names = []
+        for name in self.component_names:
+            component_entry = components_entry[self.component_index[name].path]
+            if "Position" in component_entry and "Rotation" in component_entry:
+                names.append(name)
+
+        positions = np.empty((len(names), 3))
+        rotations = np.empty((len(names), 3, 3))
+        for row, name in enumerate(names):
+            component_entry = components_entry[self.component_index[name].path]
+            component_entry["Position"].read_direct(positions, dest_sel=np.s_[row])
+            component_entry["Rotation"].read_direct(rotations, dest_sel=np.s_[row])
+
+        self._placement_table = PlacementTable(
+            component_names=tuple(names),
+            positions=positions,
+            rotations=rotations,
+            component_rows={name: row for row, name in enumerate(names)},
+        )
+        return self._placement_table
 
     def get_geometry_entry(self, component_name):
         """
         :return: the geometry entry of the specified component
         """
-        component_entry = self.get_component_entry(component_name)
+        index = self.get_component_index(component_name)
 
         if not self.settings.nd_geometry_info:
             raise ValueError(
@@ -210,21 +616,19 @@ class McStasNeXus:
                 "did not embed monitor_nD geometry info"
             )
 
-        if "Geometry" not in list(component_entry.keys()):
+        if not index.has_geometry:
             raise ValueError(f"'{component_name}' does not have geometry data.")
 
-        return component_entry["Geometry"]
+        return self.get_component_entry(component_name)["Geometry"]
 
     def get_output_entry(self, component_name):
         """
         :return: the output entry of the specified component
         """
-        component_entry = self.get_component_entry(component_name)
-
-        if "output" not in list(component_entry.keys()):
+        if not self.get_component_index(component_name).has_output:
             raise ValueError(f"'{component_name}' does not have data.")
 
-        return component_entry["output"]
+        return self.get_component_entry(component_name)["output"]
 
     def get_BINS_entry(self, component_name):
         """
@@ -232,7 +636,7 @@ class McStasNeXus:
         """
         output_entry = self.get_output_entry(component_name)
 
-        if "BINS" not in output_entry.keys():
+        if not self.component_index[component_name].has_bins:
             raise ValueError(f"Component {component_name} does not have BINS entry")
 
         return output_entry["BINS"]
@@ -433,58 +837,309 @@ class McStasNeXus:
         """
         bins_entry = self.get_BINS_entry(component_name)
 
-        if "pixels" not in bins_entry.keys():
+        if not self.component_index[component_name].has_pixels:
             raise ValueError("This component does not a pixels entry.")
 
         return bins_entry["pixels"]
 
-    def get_info_entry(self, component_name):
+    def _get_info_index(self, component_name):
         """
-        :return: info entry of given component name
+        :return: ComponentIndex of given component name, checked to have
+                 a single info entry
         """
-        output_entry = self.get_output_entry(component_name)
+        index = self.get_component_index(component_name)
 
-        # Get data, there may be BINS and a data entry with a weird name
-        contents = list(output_entry.keys())
-        if "BINS" in contents:
-            contents.remove("BINS")
+        if not index.has_output:
+            raise ValueError(f"'{component_name}' does not have data.")
 
         # Ensure there is only one element
-        if len(contents) != 1:
+        if len(index.info_entry_names) != 1:
             raise AssertionError(
                 f"Expected only one entry from '{component_name}'"
-                f" but found {len(contents)} entries."
+                f" but found {len(index.info_entry_names)} entries."
             )
 
-        return output_entry[contents[0]]
+        return index
+
+    def get_info_entry(self, component_name):
+        """
+        :return: info entry of given component name
+        """
+        # Get data, there may be BINS and a data entry with a weird name
+        index = self._get_info_index(component_name)
+
+        return self.get_output_entry(component_name)[index.info_entry_names[0]]
 
     def get_component_n_events(self, component_name):
         """
         :return: get number of events in component with event data
         """
 
-        info_entry = self.get_info_entry(component_name)
+        n_events = self._get_info_index(component_name).n_events
 
-        if "events" not in info_entry.keys():
+        if n_events is None:
             raise ValueError(
                 f"The component '{component_name}' does not have events entry."
             )
 
-        return info_entry["events"].shape[0]
+        return n_events
 
-    def get_component_events_array(self, component_name):
+    def get_component_events_dataset(self, component_name):
         """
-        :return: get event array from component with event data
+        The dataset of the last component is kept open, so its raw data chunk
+        cache still holds the last chunks read for the next read of the
+        component, like the next rows in get_event_data_chunks
+
+        :return: h5py events dataset from component with event data, not read
         """
+        if self._events_dataset is not None:
+            name, dataset = self._events_dataset
+            if name == component_name:
+                return dataset
 
         info_entry = self.get_info_entry(component_name)
 
-        if "events" not in info_entry.keys():
+        if self.component_index[component_name].n_events is None:
             raise ValueError(
                 f"The component '{component_name}' does not have events entry."
             )
 
-        return np.asarray(info_entry["events"])
+        dataset = info_entry["events"]
+        self._events_dataset = (component_name, dataset)
+        return dataset
+
+    def get_component_events_array(self, component_name):
+        """
+        :return: get event array from component with event data
+        """
+        dataset = self.get_component_events_dataset(component_name)
+        if self._get_parallel_filters(dataset) is None:
+            return np.asarray(dataset)
+
+        array = np.empty(dataset.shape, dtype=dataset.dtype)
+        columns = list(range(dataset.shape[1]))
+        read_chunked_columns(
+            dataset,
+            columns,
+            [array[:, column] for column in columns],
+            workers=self.decompress_workers,
+        )
+        return array
+
+    def _get_parallel_filters(self, dataset):
+        """
+        :return: filters of the dataset when it should be decompressed in
+                 parallel, otherwise None
+        """
+        if not self.decompress_workers:
+            return None
+
+        return get_chunk_filters(dataset)
+
+    def get_component_events_memmap(self, component_name):
+        """
+        Provides a read only memory map of the events dataset of given component
+
+        This is only possible when the events are stored contiguous and
+        uncompressed, which is the default for McStas. The data is not copied,
+        pages are read from the file when accessed.
+
+        :return: np.memmap of shape (N, V), None if dataset can not be mapped
+        """
+        if component_name in self._events_memmaps:
+            return self._events_memmaps[component_name]
+
+        dataset = self.get_component_events_dataset(component_name)
+        offset = None
+        if (
+            dataset.chunks is None
+            and dataset.compression is None
+            and dataset.dtype.isnative
+            and dataset.size > 0
+            and os.path.isfile(self.file_handle.filename)
+        ):
+            # None when no data is allocated or the data is stored externally
+            offset = dataset.id.get_offset()
+
+        events = None
+        if offset is not None:
+            events = np.memmap(
+                self.file_handle.filename,
+                dtype=dataset.dtype,
+                mode="r",
+                offset=offset,
+                shape=dataset.shape,
+            )
+
+        self._events_memmaps[component_name] = events
+        return events
+
+    def read_component_variables(
+        self, component_name, variables, returns, offset=0, rows=None
+    ):
+        """
+        Reads the columns of the given variables directly into the output arrays
+
+        For contiguous datasets only the requested columns are read from the
+        file, each as a hyperslab written straight into the output array.
+        Chunked datasets are read in slabs of whole chunk rows, so each chunk
+        is decompressed once, see _read_row_slabs. With memmap enabled the
+        columns are copied from a memory map of the file instead, and with
+        decompress_workers compressed chunks are decompressed in parallel
+        threads.
+
+        :param component_name: str: component name with event data
+        :param variables: list of strings corresponding to variables
+        :param returns: dictionary with output array for each variable
+        :param offset: index in output arrays where the first event is written
+        :param rows: optional slice of events to read, all events if None
+        :return: number of events read
+        """
+        if rows is None:
+            rows = slice(None)
+        n_total = self.get_component_n_events(component_name)
+        start, stop, _ = rows.indices(n_total)
+        n_events = max(stop - start, 0)
+        if n_events == 0:
+            return 0
+
+        with self.instrumentation.stage("read", component_name):
+            events = (
+                self.get_component_events_memmap(component_name)
+                if self.memmap
+                else None
+            )
+            if events is None:
+                dataset = self.get_component_events_dataset(component_name)
+                filters = self._get_parallel_filters(dataset)
+            else:
+                filters = None
+
+            if filters is not None:
+                read_chunked_columns(
+                    dataset,
+                    [self.get_variable_index(component_name, var) for var in variables],
+                    [returns[var] for var in variables],
+                    rows=slice(start, stop),
+                    offset=offset,
+                    workers=self.decompress_workers,
+                    filters=filters,
+                )
+            elif events is None and dataset.chunks is not None:
+                _read_row_slabs(
+                    dataset,
+                    [self.get_variable_index(component_name, var) for var in variables],
+                    [returns[var] for var in variables],
+                    rows=slice(start, stop),
+                    offset=offset,
+                )
+            else:
+                destination = np.s_[offset : offset + n_events]
+                for var in variables:
+                    var_index = self.get_variable_index(component_name, var)
+                    if events is not None:
+                        returns[var][destination] = events[start:stop, var_index]
+                    else:
+                        dataset.read_direct(
+                            returns[var], np.s_[start:stop, var_index], destination
+                        )
+
+        self._record_read(component_name, variables, n_events)
+        return n_events
+
+    def _record_read(self, component_name, variables, n_events):
+        """
+        Records the events and bytes of event data read from the file
+        """
+        if self.instrumentation.enabled:
+            itemsize = np.dtype(self._get_info_index(component_name).events_dtype)
+            self.instrumentation.record(
+                "read",
+                component_name,
+                bytes_read=n_events * len(variables) * itemsize.itemsize,
+                events=n_events,
+            )
+
+    def _get_event_columns(self, component_name, variables, rows, buffers):
+        """
+        :return: dictionary with a 1D array of the given rows for each variable,
+                 views of the memory map when possible, otherwise read into
+                 the given buffers
+        """
+        events = (
+            self.get_component_events_memmap(component_name) if self.memmap else None
+        )
+        if events is not None:
+            start, stop, _ = rows.indices(len(events))
+            self._record_read(component_name, variables, max(stop - start, 0))
+            return {
+                var: events[rows, self.get_variable_index(component_name, var)]
+                for var in variables
+            }
+
+        n_read = self.read_component_variables(
+            component_name, variables, buffers, rows=rows
+        )
+        return {var: buffers[var][:n_read] for var in variables}
+
+    def read_component_variables_non_zero(
+        self, component_name, variables, returns, offset=0, chunk_size=None
+    ):
+        """
+        Reads the given variables of events with non zero weight
+
+        The events are read chunk by chunk into reused buffers and only events
+        with non zero weight are written to the output arrays, without gaps.
+
+        :param component_name: str: component name with event data
+        :param variables: list of strings corresponding to variables
+        :param returns: dictionary with output array for each variable
+        :param offset: index in output arrays where the first event is written
+        :param chunk_size: number of events read at a time
+        :return: number of events written
+        """
+        n_events = self.get_component_n_events(component_name)
+        if n_events == 0:
+            return 0
+        length = min(_get_chunk_length(8, chunk_size), n_events)
+
+        # The weights are always needed to find the events to keep
+        read_variables = list(variables)
+        if "p" not in read_variables:
+            read_variables.append("p")
+        buffers = {}
+        if not self.memmap or self.get_component_events_memmap(component_name) is None:
+            # Weights are read in full precision to find the events to keep
+            buffers = {
+                var: np.empty(
+                    length, dtype=np.float64 if var == "p" else returns[var].dtype
+                )
+                for var in read_variables
+            }
+
+        written = 0
+        for start in range(0, n_events, length):
+            rows = slice(start, min(start + length, n_events))
+            columns = self._get_event_columns(
+                component_name, read_variables, rows, buffers
+            )
+            with self.instrumentation.stage("filter_zeros", component_name):
+                non_zero = columns["p"] != 0
+                n_kept = np.count_nonzero(non_zero)
+
+                destination = np.s_[offset + written : offset + written + n_kept]
+                for var in variables:
+                    if columns[var].dtype == returns[var].dtype:
+                        np.compress(
+                            non_zero, columns[var], out=returns[var][destination]
+                        )
+                    else:
+                        # compress would cast the uninitialised output through
+                        # a copy
+                        returns[var][destination] = columns[var][non_zero]
+            written += n_kept
+
+        return written
 
     def get_component_parameter_entry(self, component_name):
         """
@@ -551,68 +1206,236 @@ class McStasNeXus:
         :return: variables recorded for each event in given component name
         """
 
-        info_entry = self.get_info_entry(component_name)
+        variables = self._get_info_index(component_name).variables
 
-        if "variables" not in info_entry.attrs:
+        if variables is None:
             raise ValueError(
                 f"The component '{component_name}' does not "
                 "have variables attribute in info entry."
             )
 
-        return info_entry.attrs["variables"].decode("utf-8")
+        return variables
 
     def get_variable_index(self, component_name, variable):
         """
         :return: gets variables index for given variable name for given component name
         """
-        variables = self.get_component_variables(component_name)
-        return variables.split(" ").index(variable)
+        self.get_component_variables(component_name)
+        variable_index = self._get_info_index(component_name).variable_index
+
+        if variable not in variable_index:
+            raise ValueError(
+                f"Component {component_name} did not have variable "
+                f"{variable} in event data"
+            )
+
+        return variable_index[variable]
 
-    def get_event_data(self, variables, component_name=None):
+    def get_event_components(self, component_name=None):
         """
-        :return: event data of given list of variables
-                 for given component name (list of names allowed)
+        :return: list of component names to read event data from, all
+                 components with pixel id's if component_name is None
         """
-
         if component_name is None:
             # Default is to gather data for all components with pixel id's
-            components_with_ids = self.get_components_with_ids()
-        else:
-            # Allow component_name to be a list of names, convert if it is not
-            if not isinstance(component_name, list):
-                component_name = [component_name]
+            return self.get_components_with_ids()
 
-            components_with_ids = component_name
+        # Allow component_name to be a list of names, convert if it is not
+        if not isinstance(component_name, list):
+            return [component_name]
 
-        # Get total length of return arrays first
-        total_length = 0
-        ranges = {}
-        for comp in components_with_ids:
-            ranges[comp] = dict(start=total_length)
-            total_length += self.get_component_n_events(comp)
-            ranges[comp]["end"] = total_length
+        return list(component_name)
 
-        # Check variables contained in all components
-        for comp in components_with_ids:
-            comp_variables = self.get_component_variables(comp)
+    def check_event_variables(self, components, variables):
+        """
+        Checks variables are contained in all given components
+        """
+        for comp in components:
+            self.get_component_variables(comp)
+            comp_variables = self._get_info_index(comp).variable_index
             for var in variables:
                 if var not in comp_variables:
                     raise ValueError(
                         f"Component {comp} did not have variable {var} in event data"
                     )
 
-        # Allocate return arrays
-        returns = {}
-        for var in variables:
-            returns[var] = np.empty(total_length)
+    def get_event_data(
+        self,
+        variables,
+        component_name=None,
+        filter_zeros=False,
+        chunk_size=None,
+        workers=None,
+        dtypes=None,
+        out=None,
+    ):
+        """
+        :param variables: list of strings corresponding to variables
+        :param component_name: optional, single component name or list of names
+        :param filter_zeros: if True events with zero weight are skipped while
+                             reading in a single pass, the arrays are sized
+                             for all events and trimmed to the kept ones
+        :param chunk_size: number of events read at a time when filtering
+        :param workers: number of threads reading components concurrently,
+                        each into its own slice of the output arrays. Reads
+                        through h5py are serialised by its lock, only memmap
+                        copies and filtering can overlap, see the
+                        get_event_data_workers benchmark
+        :param dtypes: optional dictionary with data type for some variables,
+                       for example float32, converted while reading. By
+                       default id is int64 and other variables float64.
+        :param out: optional output buffers to fill instead of allocating new
+                    arrays, either a dictionary with a 1D array for each
+                    variable, which keep their own data type, or EventBuffers,
+                    with room for all events also when filtering zeros
+        :return: event data of given list of variables
+                 for given component name (list of names allowed), with out
+                 these are views of the buffers with the filled length
+        """
+
+        components_with_ids = self.get_event_components(component_name)
+
+        # Check variables contained in all components
+        self.check_event_variables(components_with_ids, variables)
+        if filter_zeros:
+            self.check_event_variables(components_with_ids, ["p"])
 
-        # Fill return arrays with requested data
+        # Get total length of return arrays first, with filter_zeros this is
+        # an upper bound and the arrays are trimmed after reading
+        total_length = 0
+        ranges = {}
         for comp in components_with_ids:
-            array = self.get_component_events_array(comp)
-            start = ranges[comp]["start"]
-            end = ranges[comp]["end"]
-            for var in variables:
-                var_index = self.get_variable_index(comp, var)
-                returns[var][start:end] = array[:, var_index]
+            ranges[comp] = dict(start=total_length)
+            total_length += self.get_component_n_events(comp)
+            ranges[comp]["end"] = total_length
+
+        # Allocate return arrays, or use the given buffers
+        with self.instrumentation.stage("allocate"):
+            returns = _get_output_arrays(
+                out, _get_event_dtypes(variables, dtypes), total_length
+            )
+        if out is None:
+            self.instrumentation.record(
+                "allocate",
+                arrays_allocated=len(returns),
+                bytes_allocated=sum(array.nbytes for array in returns.values()),
+            )
+
+        # Fill return arrays with requested data, reading only needed columns
+        def read_component(comp):
+            if filter_zeros:
+                return self.read_component_variables_non_zero(
+                    comp,
+                    variables,
+                    returns,
+                    offset=ranges[comp]["start"],
+                    chunk_size=chunk_size,
+                )
+
+            return self.read_component_variables(
+                comp, variables, returns, offset=ranges[comp]["start"]
+            )
+
+        n_read = _map_components(read_component, components_with_ids, workers)
+
+        if filter_zeros:
+            with self.instrumentation.stage("filter_zeros"):
+                returns = self._compact_components(
+                    returns, components_with_ids, ranges, n_read, chunk_size
+                )
+            if isinstance(out, EventBuffers):
+                out.length = len(next(iter(returns.values()), ()))
 
         return returns
+
+    @staticmethod
+    def _compact_components(returns, components, ranges, n_kept, chunk_size=None):
+        """
+        Moves the kept events of each component, written at the start of its
+        range, next to those of the previous component and trims the arrays
+
+        :return: dictionary with the arrays trimmed to the kept events, new
+                 arrays are shrunk in place and given buffers are sliced
+        """
+        length = _get_chunk_length(8, chunk_size)
+        written = 0
+        for comp, n_comp in zip(components, n_kept, strict=True):
+            start = ranges[comp]["start"]
+            # Moved in blocks, so overlapping copies only buffer one block
+            for block in range(0, n_comp if start != written else 0, length):
+                block_length = min(length, n_comp - block)
+                source = np.s_[start + block : start + block + block_length]
+                destination = np.s_[written + block : written + block + block_length]
+                for array in returns.values():
+                    array[destination] = array[source]
+            written += n_comp
+
+        trimmed = {}
+        for var, array in returns.items():
+            if array.base is None:
+                # Shrinking releases the memory of the filtered events
+                array.resize(written, refcheck=False)
+                trimmed[var] = array
+            else:
+                trimmed[var] = array[:written]
+
+        return trimmed
+
+    def get_event_data_chunks(
+        self,
+        variables,
+        component_name=None,
+        chunk_size=None,
+        chunk_bytes=None,
+        dtypes=None,
+    ):
+        """
+        Generator providing event data of given list of variables in chunks
+
+        Chunks never span more than one component, so the last chunk of each
+        component can be shorter than the requested size. Only one chunk is
+        held in memory at a time.
+
+        :param variables: list of strings corresponding to variables
+        :param component_name: optional, single component name or list of names
+        :param chunk_size: maximum number of events in each chunk
+        :param chunk_bytes: maximum size of the arrays in each chunk in bytes,
+                            alternative to chunk_size
+        :param dtypes: optional dictionary with data type for some variables,
+                       by default id is int64 and other variables float64
+        :return: generator of EventChunk objects
+        """
+        components = self.get_event_components(component_name)
+        self.check_event_variables(components, variables)
+
+        event_dtypes = _get_event_dtypes(variables, dtypes)
+        event_bytes = sum(dtype.itemsize for dtype in event_dtypes.values())
+        length = _get_chunk_length(event_bytes, chunk_size, chunk_bytes)
+
+        global_start = 0
+        for comp in components:
+            n_events = self.get_component_n_events(comp)
+            for start in range(0, n_events, length):
+                stop = min(start + length, n_events)
+                data = {
+                    var: np.empty(stop - start, dtype=dtype)
+                    for var, dtype in event_dtypes.items()
+                }
+                self.instrumentation.record(
+                    "allocate",
+                    comp,
+                    arrays_allocated=len(data),
+                    bytes_allocated=(stop - start) * event_bytes,
+                )
+                self.read_component_variables(
+                    comp, variables, data, rows=slice(start, stop)
+                )
+                yield EventChunk(
+                    component_name=comp,
+                    start=global_start + start,
+                    stop=global_start + stop,
+                    component_start=start,
+                    data=data,
+                )
+
+            global_start += n_events
@@ -0,0 +1,253 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import functools
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import h5py
+import numpy as np
+
+from .DataFolders import find_data_folders
+from .LoadFile import Data
+from .ReadNeXus import McStasNeXus
+
+# Functions reading a run in a worker process, they only return numpy
+# arrays and builtins so the results can be sent back to the main process
+
+
+def _read_parameters(data_folder, filename):
+    file_path = os.path.join(data_folder, filename)
+    with h5py.File(file_path, "r", swmr=True) as file:
+        return McStasNeXus(file).get_simulation_parameters()
+
+
+def _read_histogram(data_folder, filename, component_name):
+    with Data(data_folder, filename=filename) as data:
+        histogram = data.get_component_data(component_name)
+    if not isinstance(histogram, tuple):
+        raise ValueError(f"'{component_name}' is not a histogram monitor.")
+
+    return dict(zip(("intensity", "error", "ncount"), histogram, strict=True))
+
+
+def _bin_events(data_folder, filename, **kwargs):
+    with Data(data_folder, filename=filename) as data:
+        return data.histogram_events(**kwargs)
+
+
+class ScanData:
+    """
+    Set of McStas runs of a parameter scan, stacked along the scan axis
+
+    Each run is a folder with a McStas NeXus file. Histograms and binned
+    events of a monitor are read from the runs in parallel worker processes,
+    as h5py and the binning hold the interpreter lock, and put in place in
+    the stacked arrays as each run arrives, so only one run per worker is
+    held in memory besides the result.
+    """
+
+    def __init__(self, data_folders, filename="mccode.h5", workers=None):
+        """
+        :param data_folders: list of folders with McStas output or glob patterns
+        :param filename: name of the McStas NeXus file in each folder
+        :param workers: number of worker processes reading runs, CPU count
+                        if None, runs are read in this process if 1
+        """
+        if isinstance(data_folders, str):
+            data_folders = [data_folders]
+
+        self.data_folders = find_data_folders(data_folders, filename)
+        if len(self.data_folders) == 0:
+            raise ValueError(f"No folders with {filename} found.")
+
+        self.filename = filename
+        self.workers = workers or os.cpu_count() or 1
+
+        # Instrument parameters of each run, as arrays along the scan axis
+        run_parameters = self._map_runs(
+            functools.partial(_read_parameters, filename=filename)
+        )
+        names = sorted(set().union(*run_parameters))
+        self.parameters = {
+            name: np.array([parameters.get(name) for parameters in run_parameters])
+            for name in names
+        }
+
+    def __len__(self):
+        return len(self.data_folders)
+
+    def _map_runs(self, function):
+        """
+        :return: list with the result of function for each run in scan order
+        """
+        results = [None] * len(self)
+        for index, result in self._iterate_runs(function):
+            results[index] = result
+
+        return results
+
+    def _iterate_runs(self, function):
+        """
+        Calls function with the folder of each run in a process pool
+
+        :param function: picklable function, like a module level function
+        :return: generator of run index and result, in order of completion
+        """
+        if self.workers == 1 or len(self) == 1:
+            for index, folder in enumerate(self.data_folders):
+                yield index, function(folder)
+            return
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(self))) as pool:
+            futures = {
+                pool.submit(function, folder): index
+                for index, folder in enumerate(self.data_folders)
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    def get_scan_parameters(self):
+        """
+        :return: list of names of parameters that vary between runs
+        """
+        return [
+            name
+            for name, values in self.parameters.items()
+            if len(set(values.tolist())) > 1
+        ]
+
+    def get_scan_grid(self):
+        """
+        Finds the grid of scan parameter values the runs are placed on
+
+        When each combination of the values of the varying parameters is
+        present exactly once, the runs form a grid with an axis for each
+        varying parameter. Otherwise the scan has a single axis of runs.
+
+        :return: tuple with list of parameter names, list of arrays with
+                 sorted values of each, and index of each run on the grid,
+                 or None if the runs do not form a full grid
+        """
+        names = self.get_scan_parameters()
+        axes = []
+        run_indices = []
+        for name in names:
+            axis, index = np.unique(self.parameters[name], return_inverse=True)
+            axes.append(axis)
+            run_indices.append(index)
+
+        shape = tuple(len(axis) for axis in axes)
+        if int(np.prod(shape)) != len(self):
+            return None
+
+        flat_indices = np.ravel_multi_index(run_indices, shape) if names else [0]
+        if len(set(np.asarray(flat_indices).tolist())) != len(self):
+            return None
+
+        return names, axes, flat_indices
+
+    def _stack(self, function, grid, shared=()):
+        """
+        Stacks the dictionaries of arrays returned by function for each run,
+        each array is written in place as its run arrives
+
+        :param shared: names of arrays that are the same for all runs, which
+                       are returned once instead of stacked
+        :return: dictionary with stacked arrays with scan axes first
+        """
+        flat_indices = np.arange(len(self))
+        scan_shape = (len(self),)
+        if grid:
+            scan_grid = self.get_scan_grid()
+            if scan_grid is None:
+                raise ValueError("The runs do not form a full grid of parameters.")
+            _, axes, flat_indices = scan_grid
+            scan_shape = tuple(len(axis) for axis in axes)
+
+        stacked = None
+        shared_arrays = {}
+        for index, arrays in self._iterate_runs(function):
+            for name in shared:
+                array = arrays.pop(name)
+                if name not in shared_arrays:
+                    shared_arrays[name] = array
+                elif not np.array_equal(array, shared_arrays[name]):
+                    raise ValueError(
+                        f"{name} of run {self.data_folders[index]} differs "
+                        "from other runs of the scan."
+                    )
+            if stacked is None:
+                stacked = {
+                    name: np.empty((len(self), *np.shape(array)), dtype=array.dtype)
+                    for name, array in arrays.items()
+                }
+            for name, array in arrays.items():
+                if np.shape(array) != stacked[name].shape[1:]:
+                    raise ValueError(
+                        f"{name} of run {self.data_folders[index]} has shape "
+                        f"{np.shape(array)}, other runs {stacked[name].shape[1:]}."
+                    )
+                stacked[name][flat_indices[index]] = array
+
+        stacked = {
+            name: array.reshape(scan_shape + array.shape[1:])
+            for name, array in stacked.items()
+        }
+        stacked.update(shared_arrays)
+        return stacked
+
+    def get_histograms(self, component_name, grid=False):
+        """
+        Stacks the histogram of a monitor from all runs
+
+        :param component_name: name of a histogram monitor
+        :param grid: If True the scan axis is split into an axis for each
+                     varying parameter, see get_scan_grid
+        :return: dictionary with intensity, error and ncount arrays with scan
+                 axes first
+        """
+        read_histogram = functools.partial(
+            _read_histogram, filename=self.filename, component_name=component_name
+        )
+        return self._stack(read_histogram, grid)
+
+    def get_binned_events(
+        self,
+        bins_t,
+        component_name=None,
+        weights="p",
+        t_range=None,
+        chunk_size=None,
+        grid=False,
+    ):
+        """
+        Stacks events of all runs binned by pixel and time-of-flight
+
+        Each run is binned while its events are streamed, see
+        Data.histogram_events, all runs must have the same pixels and
+        time-of-flight bins.
+
+        :param bins_t: time-of-flight bin edges in s, or number of bins
+                       spanning t_range
+        :param component_name: Name of component with data
+                               (if None all with pixel id's, can also be list)
+        :param weights: variable used as event weight, None to count events
+        :param t_range: tuple with lowest and highest time-of-flight in s,
+                        needed when bins_t is a number of bins
+        :param chunk_size: maximum number of events read at a time
+        :param grid: If True the scan axis is split into an axis for each
+                     varying parameter, see get_scan_grid
+        :return: dictionary with data and variances with scan axes first,
+                 followed by pixel and time axes, and pixel_id and t edges
+        """
+        bin_events = functools.partial(
+            _bin_events,
+            filename=self.filename,
+            bins_t=bins_t,
+            component_name=component_name,
+            weights=weights,
+            t_range=t_range,
+            chunk_size=chunk_size,
+        )
+        # Pixels and time-of-flight bin edges are the same for all runs
+        return self._stack(bin_events, grid, shared=("pixel_id", "t"))
@@ -0,0 +1,221 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import re
+
+import h5py
+import numpy as np
+
+from .ReadNeXus import _get_mcstas_version_settings
+
+# Shape identifiers from monitor-nd-lib.c
+_SHAPE_IDENTIFIERS = {"square": 0, "banana": 4}
+
+_DEFAULT_VARIABLES = ("p", "x", "y", "n", "id", "t")
+
+
+def _to_attribute(value):
+    """
+    McStas writes attributes as byte strings
+    """
+    return np.bytes_(str(value).encode("utf-8"))
+
+
+def _rotation_y(angle):
+    """
+    :return: rotation matrix for rotation around y by angle in degrees
+    """
+    angle = np.deg2rad(angle)
+    return np.array(
+        [
+            [np.cos(angle), 0, -np.sin(angle)],
+            [0, 1, 0],
+            [np.sin(angle), 0, np.cos(angle)],
+        ]
+    )
+
+
+def _make_events(rng, variables, n_events, pixel_min, n_pixels, zero_fraction):
+    """
+    :return: array of shape (n_events, variables) with random events
+    """
+    events = np.empty((n_events, len(variables)))
+    for index, var in enumerate(variables):
+        if var == "p":
+            column = rng.random(n_events)
+            column[rng.random(n_events) < zero_fraction] = 0
+        elif var == "id":
+            column = rng.integers(pixel_min, pixel_min + n_pixels, n_events)
+        elif var == "t":
+            column = rng.uniform(1e-3, 2e-2, n_events)
+        else:
+            column = rng.normal(size=n_events)
+        events[:, index] = column
+
+    return events
+
+
+def write_synthetic_file(
+    path,
+    mcstas_version=(3, 5, 20),
+    n_banks=2,
+    pixel_bins=(10, 8),
+    n_events=1000,
+    shapes=None,
+    compression=None,
+    chunks=None,
+    id_start=0,
+    id_gap=0,
+    zero_fraction=0.2,
+    variables=_DEFAULT_VARIABLES,
+    parameters=None,
+    ncount=1e6,
+    histogram_shape=(20, 10),
+    seed=1,
+):
+    """
+    Writes a McStas NeXus file with random events without running McStas
+
+    The file has the entry1 layout of the given McStas version, with a
+    source, a sample, event monitors with pixel id's like Monitor_nD in
+    mantid mode and a histogram monitor. Components are numbered and have
+    geometry information for McStas 3.5.20 and later, as in real files.
+    Without geometry information only square banks can be mapped to pixel
+    positions, so earlier versions have square banks only.
+
+    :param path: path of the file to write, overwritten if it exists
+    :param mcstas_version: tuple with McStas version written in the file
+    :param n_banks: number of event monitors with pixel id's
+    :param pixel_bins: tuple with number of x and y pixels of each bank
+    :param n_events: number of events in each bank
+    :param shapes: shapes of banks, square or banana, repeated over banks,
+                   by default alternating square and banana for McStas
+                   3.5.20 and later, and only square for earlier versions
+    :param compression: HDF5 compression of event datasets, None for none
+    :param chunks: HDF5 chunk shape of event datasets, contiguous if None
+                   and no compression is given
+    :param id_start: lowest pixel id of the first bank
+    :param id_gap: number of unused pixel id's between banks
+    :param zero_fraction: fraction of events with zero weight
+    :param variables: event variables of each bank
+    :param parameters: dictionary with instrument parameters
+    :param ncount: number of simulated rays written in the file
+    :param histogram_shape: shape of the histogram monitor data
+    :param seed: seed of the random events
+    :return: path of the written file
+    """
+    settings = _get_mcstas_version_settings(tuple(mcstas_version))
+    if shapes is None:
+        shapes = ("square", "banana") if settings.nd_geometry_info else ("square",)
+    if "banana" in shapes[:n_banks] and not settings.nd_geometry_info:
+        raise ValueError(
+            "Banana banks can't be mapped to pixel positions without geometry "
+            "information, use square banks or McStas 3.5.20 or later."
+        )
+
+    if parameters is None:
+        parameters = {"wavelength": 2.0}
+
+    rng = np.random.default_rng(seed)
+    with h5py.File(path, "w") as file:
+        entry = file.create_group("entry1")
+        entry.create_group("data")
+
+        simulation = entry.create_group("simulation")
+        version = ".".join(str(number) for number in mcstas_version)
+        simulation.attrs["program"] = _to_attribute(f"McStas {version} - synthetic")
+        simulation.attrs["Ncount"] = _to_attribute(ncount)
+        parameter_group = simulation.create_group("Param")
+        for name, value in parameters.items():
+            parameter_group.attrs[name] = _to_attribute(value)
+
+        components = entry.create_group("instrument").create_group("components")
+
+        def add_component(name, position, rotation):
+            if settings.component_numbers is not None:
+                name = f"{len(components) + 1:0{settings.component_numbers}d}_{name}"
+            group = components.create_group(name)
+            group.create_dataset("Position", data=np.asarray(position, dtype=float))
+            group.create_dataset("Rotation", data=np.asarray(rotation, dtype=float))
+            return group
+
+        add_component("source", [0, 0, 0], np.eye(3))
+        add_component("sample", [0, 0, 2], np.eye(3))
+
+        n_x, n_y = pixel_bins
+        pixel_min = id_start
+        for bank in range(n_banks):
+            shape = shapes[bank % len(shapes)]
+            if shape not in _SHAPE_IDENTIFIERS:
+                raise ValueError(f"Unknown shape {shape}, use square or banana.")
+
+            component = add_component(
+                f"bank_{bank}", [0.1 * bank, 0, 2.5], _rotation_y(10 * bank)
+            )
+            if settings.nd_geometry_info:
+                geometry = component.create_group("Geometry")
+                geometry.attrs["Shape identifier"] = _to_attribute(
+                    _SHAPE_IDENTIFIERS[shape]
+                )
+                for name, value in (
+                    ("radius", 1.0),
+                    ("xmin", -0.05),
+                    ("xmax", 0.05),
+                    ("ymin", -0.05),
+                    ("ymax", 0.05),
+                ):
+                    geometry.attrs[name] = _to_attribute(value)
+
+            if shape == "square":
+                x_var, x_label = "x", "x [m]"
+                x_axis = np.linspace(-0.05, 0.05, n_x)
+            else:
+                x_var, x_label = "th", "Longitude [deg]"
+                x_axis = np.linspace(-20, 20, n_x)
+
+            output = component.create_group("output")
+            bins = output.create_group("BINS")
+            bins.attrs["xvar"] = _to_attribute(x_var)
+            bins.attrs["xlabel"] = _to_attribute(x_label)
+            bins.attrs["yvar"] = _to_attribute("y")
+            bins.attrs["ylabel"] = _to_attribute("y [m]")
+            bins.create_dataset(re.sub(r"[^a-zA-Z]", "_", x_label), data=x_axis)
+            bins.create_dataset("y__m_", data=np.linspace(-0.05, 0.05, n_y))
+            n_pixels = n_x * n_y
+            bins.create_dataset(
+                "pixels", data=pixel_min + np.arange(n_pixels).reshape(n_y, n_x)
+            )
+
+            info = output.create_group(f"bank_{bank}_list_{'_'.join(variables)}")
+            info.attrs["variables"] = _to_attribute(" ".join(variables))
+            info.attrs["options"] = _to_attribute(
+                f"mantid {shape} x bins={n_x} y bins={n_y}, "
+                f"neutron pixel min={pixel_min} t, list all neutrons"
+            )
+            info.attrs["xylimits"] = _to_attribute("-0.05 0.05 -0.05 0.05")
+
+            storage = {}
+            if compression is not None or chunks is not None:
+                storage["chunks"] = chunks or (
+                    min(max(n_events, 1), 4096),
+                    len(variables),
+                )
+                storage["compression"] = compression
+            info.create_dataset(
+                "events",
+                data=_make_events(
+                    rng, variables, n_events, pixel_min, n_pixels, zero_fraction
+                ),
+                **storage,
+            )
+            pixel_min += n_pixels + id_gap
+
+        component = add_component("histogram", [0, 0, 3], np.eye(3))
+        info = component.create_group("output").create_group("histogram_dat")
+        info.create_dataset("data", data=rng.random(histogram_shape))
+        info.create_dataset("errors", data=0.1 * rng.random(histogram_shape))
+        info.create_dataset(
+            "ncount",
+            data=rng.integers(0, 100, histogram_shape).astype(float),
+        )
+
+    return path
@@ -0,0 +1,117 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import numpy as np
+
+# Events of a McStas simulation all belong to a single pulse at time zero
+_PULSE_TIME_ZERO = 0
+
+# Events per HDF5 chunk of written datasets when not given
+_DEFAULT_DATASET_CHUNK_SIZE = 65536
+
+
+def create_nx_group(parent, name, nx_class):
+    """
+    :return: new h5py group with given NeXus class
+    """
+    group = parent.create_group(name)
+    group.attrs["NX_class"] = nx_class
+    return group
+
+
+def write_nx_detector(parent, name, pixel_ids, positions):
+    """
+    Writes an NXdetector group with pixel numbers and positions
+
+    :param parent: h5py group to write detector in
+    :param name: name of the detector group
+    :param pixel_ids: array of pixel ids of the detector
+    :param positions: array of shape (pixels, 3) with pixel positions in m
+    :return: h5py group of the detector
+    """
+    detector = create_nx_group(parent, name, "NXdetector")
+    detector.create_dataset("detector_number", data=pixel_ids)
+    for index, axis in enumerate("xyz"):
+        offset = detector.create_dataset(
+            f"{axis}_pixel_offset", data=positions[:, index]
+        )
+        offset.attrs["units"] = "m"
+
+    return detector
+
+
+class EventDataWriter:
+    """
+    Writes events to an NXevent_data group, appending chunk by chunk
+
+    The event datasets are chunked and resizable, so events can be written
+    as they are read without holding them all. The weights of the McStas
+    events are kept in event_weight, which is not part of the standard.
+    """
+
+    def __init__(
+        self,
+        parent,
+        name,
+        dtypes,
+        dataset_chunk_size=None,
+        compression="gzip",
+        compression_opts=None,
+    ):
+        """
+        :param parent: h5py group to write event data in
+        :param name: name of the NXevent_data group
+        :param dtypes: dictionary with data type of id, t and p
+        :param dataset_chunk_size: number of events in each HDF5 chunk
+        :param compression: HDF5 compression filter, None for no compression
+        :param compression_opts: options for the compression filter
+        """
+        if dataset_chunk_size is None:
+            dataset_chunk_size = _DEFAULT_DATASET_CHUNK_SIZE
+
+        self.group = create_nx_group(parent, name, "NXevent_data")
+        self.length = 0
+
+        time_zero = self.group.create_dataset(
+            "event_time_zero", data=np.array([_PULSE_TIME_ZERO], dtype=np.int64)
+        )
+        time_zero.attrs["units"] = "ns"
+        self.group.create_dataset("event_index", data=np.array([0], dtype=np.int64))
+
+        self.datasets = {}
+        for var, dataset_name, units in (
+            ("id", "event_id", None),
+            ("t", "event_time_offset", "s"),
+            ("p", "event_weight", "counts"),
+        ):
+            dataset = self.group.create_dataset(
+                dataset_name,
+                shape=(0,),
+                maxshape=(None,),
+                dtype=dtypes[var],
+                chunks=(dataset_chunk_size,),
+                compression=compression,
+                compression_opts=compression_opts,
+            )
+            if units is not None:
+                dataset.attrs["units"] = units
+            self.datasets[var] = dataset
+
+    def append(self, event_data):
+        """
+        Appends events to the end of the event datasets
+
+        :param event_data: dictionary with arrays of id, t and p
+        """
+        n_events = len(event_data["id"])
+        if n_events == 0:
+            return
+
+        stop = self.length + n_events
+        for var, dataset in self.datasets.items():
+            dataset.resize((stop,))
+            dataset.write_direct(
+                np.ascontiguousarray(event_data[var]),
+                dest_sel=np.s_[self.length : stop],
+            )
+
+        self.length = stop
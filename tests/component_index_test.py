@@ -0,0 +1,37 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import h5py
+import numpy as np
+
+from mcstastox.ReadNeXus import ComponentIndex, _index_component
+
+
+def test_index_component_with_events() -> None:
+    with h5py.File("index.h5", "w", driver="core", backing_store=False) as f:
+        component = f.create_group("0003_detector")
+        component.create_group("Geometry")
+        output = component.create_group("output")
+        output.create_group("BINS").create_dataset("pixels", data=np.arange(4))
+        info = output.create_group("list_p_x_id")
+        info.attrs["variables"] = np.bytes_(b"p x id")
+        info.create_dataset("events", data=np.zeros((5, 3)))
+
+        index = _index_component("0003_detector", component)
+
+    assert index.has_output
+    assert index.has_bins
+    assert index.has_pixels
+    assert index.has_geometry
+    assert index.info_entry_names == ("list_p_x_id",)
+    assert index.variables == "p x id"
+    assert index.variable_index == {"p": 0, "x": 1, "id": 2}
+    assert index.n_events == 5
+    assert np.dtype(index.events_dtype) == np.float64
+
+
+def test_index_component_without_output() -> None:
+    with h5py.File("index.h5", "w", driver="core", backing_store=False) as f:
+        component = f.create_group("source")
+        index = _index_component("source", component)
+
+    assert index == ComponentIndex(path="source")
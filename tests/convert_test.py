@@ -0,0 +1,100 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import os
+
+import numpy as np
+import pytest
+
+from mcstastox.Convert import get_output_path, get_output_paths, main
+from mcstastox.DataFolders import find_data_folders
+from mcstastox.SyntheticFile import write_synthetic_file
+
+
+def _write_scan(tmp_path, n_folders):
+    for index in range(n_folders):
+        folder = tmp_path / f"scan_{index}"
+        folder.mkdir()
+        write_synthetic_file(folder / "mccode.h5", n_events=100, seed=index)
+
+
+def test_find_data_folders_expands_patterns(tmp_path) -> None:
+    _write_scan(tmp_path, 2)
+    (tmp_path / "empty").mkdir()
+
+    unmatched = []
+    folders = find_data_folders(
+        [str(tmp_path / "scan_*"), str(tmp_path / "empty")], unmatched=unmatched
+    )
+    assert folders == [str(tmp_path / "scan_0"), str(tmp_path / "scan_1")]
+    assert unmatched == [str(tmp_path / "empty")]
+    assert get_output_path("a/run", "nexus", output_dir="out") == os.path.join(
+        "out", "run_mccode_events.nxs"
+    )
+
+
+def test_find_data_folders_sorts_numbers_by_value(tmp_path) -> None:
+    for name in ("scan_10", "scan_2", "scan_1", "other"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "mccode.h5").touch()
+
+    folders = find_data_folders([str(tmp_path / "*")])
+    assert folders == [
+        str(tmp_path / name) for name in ("other", "scan_1", "scan_2", "scan_10")
+    ]
+
+
+def test_main_converts_and_skips_up_to_date(tmp_path) -> None:
+    _write_scan(tmp_path, 2)
+    pattern = str(tmp_path / "scan_*")
+    arguments = [pattern, "-f", "histogram", "--t-range", "0", "0.03", "--bins-t", "5"]
+
+    assert main(arguments) == 0
+    output_path = tmp_path / "scan_1" / "mccode_histogram.npz"
+    with np.load(output_path) as histogram:
+        assert histogram["data"].shape == (160, 5)
+
+    modified = os.path.getmtime(output_path)
+    assert main(arguments) == 0
+    assert os.path.getmtime(output_path) == modified
+
+    assert main([*arguments, "--force"]) == 0
+    assert not list(tmp_path.glob("scan_*/*.partial*"))
+
+
+def test_output_dir_names_relative_to_common_parent(tmp_path) -> None:
+    for scan in ("scan_a", "scan_b"):
+        folder = tmp_path / scan / "0"
+        folder.mkdir(parents=True)
+        write_synthetic_file(folder / "mccode.h5", n_events=100)
+
+    output_dir = tmp_path / "out"
+    arguments = [str(tmp_path / "scan_*" / "0"), "--output-dir", str(output_dir)]
+    assert main(arguments) == 0
+    assert sorted(os.listdir(output_dir)) == [
+        "scan_a_0_mccode_events.nxs",
+        "scan_b_0_mccode_events.nxs",
+    ]
+
+
+def test_main_fails_on_colliding_outputs(tmp_path) -> None:
+    # Both folders are named a_b_run relative to tmp_path
+    folders = [tmp_path / "a_b" / "run", tmp_path / "a" / "b_run"]
+    for folder in folders:
+        folder.mkdir(parents=True)
+        write_synthetic_file(folder / "mccode.h5", n_events=100)
+
+    with pytest.raises(ValueError, match="would both be converted"):
+        get_output_paths([str(folder) for folder in folders], "nexus", output_dir="out")
+
+    output_dir = tmp_path / "out"
+    arguments = [*map(str, folders), "--output-dir", str(output_dir)]
+    assert main(arguments) == 1
+    assert os.listdir(output_dir) == []
+
+
+def test_main_fails_on_pattern_without_folders(tmp_path) -> None:
+    _write_scan(tmp_path, 1)
+
+    assert main([str(tmp_path / "scan_*"), str(tmp_path / "missing_*")]) == 1
+    assert (tmp_path / "scan_0" / "mccode_events.nxs").exists()
+    assert main([str(tmp_path / "missing_*")]) == 1
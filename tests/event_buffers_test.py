@@ -0,0 +1,35 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import numpy as np
+import pytest
+
+from mcstastox.ReadNeXus import EventBuffers, _get_output_arrays
+
+
+def test_event_buffers_reused_until_too_small() -> None:
+    buffers = EventBuffers()
+    dtypes = {"p": np.dtype(np.float64), "id": np.dtype(np.int64)}
+    first = buffers.get(dtypes, 100)
+    assert len(first["p"]) == 100
+    assert buffers.length == 100
+
+    arrays = dict(buffers.arrays)
+    second = buffers.get(dtypes, 110)
+    assert buffers.arrays["p"] is arrays["p"]
+    assert len(second["id"]) == 110
+
+    buffers.get(dtypes, 1000)
+    assert buffers.arrays["p"] is not arrays["p"]
+
+
+def test_output_arrays_from_given_buffers() -> None:
+    dtypes = {"p": np.dtype(np.float64)}
+    buffer = np.zeros(10, dtype=np.float32)
+    returns = _get_output_arrays({"p": buffer}, dtypes, 4)
+    assert returns["p"].base is buffer
+    assert len(returns["p"]) == 4
+
+    with pytest.raises(ValueError, match="room for 11 events"):
+        _get_output_arrays({"p": buffer}, dtypes, 11)
+    with pytest.raises(ValueError, match="No output buffer"):
+        _get_output_arrays({}, dtypes, 4)
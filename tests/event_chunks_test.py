@@ -0,0 +1,87 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import numpy as np
+import pytest
+
+from mcstastox.LoadFile import Data
+from mcstastox.ReadNeXus import _DEFAULT_CHUNK_SIZE, _get_chunk_length
+from mcstastox.SyntheticFile import write_synthetic_file
+
+
+def test_chunk_length_from_size_or_bytes() -> None:
+    assert _get_chunk_length(24) == _DEFAULT_CHUNK_SIZE
+    assert _get_chunk_length(24, chunk_size=100) == 100
+    assert _get_chunk_length(24, chunk_bytes=2400) == 100
+    assert _get_chunk_length(24, chunk_bytes=2410) == 100
+
+
+def test_chunk_length_invalid() -> None:
+    with pytest.raises(ValueError, match="not both"):
+        _get_chunk_length(24, chunk_size=100, chunk_bytes=2400)
+    with pytest.raises(ValueError, match="at least one event"):
+        _get_chunk_length(24, chunk_bytes=10)
+
+
+@pytest.fixture
+def data(tmp_path):
+    write_synthetic_file(tmp_path / "mccode.h5", n_events=250, n_banks=3)
+    with Data(tmp_path) as data:
+        yield data
+
+
+@pytest.mark.parametrize("filter_zeros", [False, True])
+def test_concatenated_chunks_equal_event_data(data, filter_zeros) -> None:
+    variables = ["p", "t", "id", "x"]
+    chunks = list(
+        data.get_event_data_chunks(variables, filter_zeros=filter_zeros, chunk_size=60)
+    )
+
+    expected = data.get_event_data(variables, filter_zeros=filter_zeros)
+    for var in variables:
+        combined = np.concatenate([chunk.data[var] for chunk in chunks])
+        assert combined.dtype == expected[var].dtype
+        np.testing.assert_array_equal(combined, expected[var])
+
+
+def test_chunk_offsets_within_components(data) -> None:
+    chunks = list(data.get_event_data_chunks(["p", "id"], chunk_size=60))
+
+    # 250 events of each bank are chunks of 60, 60, 60, 60 and 10 events,
+    # offsets count the events of all banks before filtering
+    starts = [250 * bank + start for bank in range(3) for start in range(0, 250, 60)]
+    assert [chunk.start for chunk in chunks] == starts
+    assert [chunk.stop for chunk in chunks] == [
+        min(start + 60, 250 * (start // 250 + 1)) for start in starts
+    ]
+    assert [chunk.component_name for chunk in chunks] == [
+        f"bank_{start // 250}" for start in starts
+    ]
+
+    reader = data.file_object
+    for chunk in chunks:
+        # No chunk spans two components
+        n_events = reader.get_component_n_events(chunk.component_name)
+        assert chunk.component_start + chunk.stop - chunk.start <= n_events
+        assert chunk.component_start == chunk.start % 250
+        events = reader.get_component_events_array(chunk.component_name)
+        rows = events[chunk.component_start : chunk.component_start + 60]
+        p_index = reader.get_variable_index(chunk.component_name, "p")
+        np.testing.assert_array_equal(
+            chunk.data["p"], rows[rows[:, p_index] != 0, p_index]
+        )
+
+
+def test_chunk_length_follows_dtypes(data) -> None:
+    variables = ["p", "t", "id"]
+    default = list(data.get_event_data_chunks(variables, chunk_bytes=1600))
+    # Events of 8 + 8 + 8 bytes, 66 in 1600 bytes
+    assert default[0].stop - default[0].start == 66
+
+    dtypes = {"t": np.float32, "id": np.int32}
+    narrow = list(
+        data.get_event_data_chunks(variables, chunk_bytes=1600, dtypes=dtypes)
+    )
+    # Events of 8 + 4 + 4 bytes, 100 in 1600 bytes
+    assert narrow[0].stop - narrow[0].start == 100
+    assert narrow[0].data["t"].dtype == np.float32
+    assert narrow[0].data["id"].dtype == np.int32
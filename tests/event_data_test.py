@@ -0,0 +1,150 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import os
+import weakref
+
+import h5py
+import numpy as np
+import pytest
+
+from mcstastox import ReadNeXus
+from mcstastox.LoadFile import Data
+from mcstastox.ReadNeXus import McStasNeXus
+from mcstastox.SyntheticFile import write_synthetic_file
+
+
+@pytest.fixture(params=[None, "gzip"], ids=["contiguous", "gzip"])
+def event_file(request, tmp_path):
+    return write_synthetic_file(
+        tmp_path / "mccode.h5",
+        n_events=1000,
+        compression=request.param,
+        chunks=(64, 6) if request.param else None,
+    )
+
+
+def test_read_component_variables_matches_full_read(event_file, monkeypatch) -> None:
+    # Slabs of two chunks, so partial first and last slabs are read
+    monkeypatch.setattr(ReadNeXus, "_SLAB_BYTES", 2 * 64 * 6 * 8)
+    with h5py.File(event_file, "r") as file:
+        reader = McStasNeXus(file)
+        events = np.asarray(reader.get_component_events_dataset("bank_1"))
+        variables = ["t", "p", "id"]
+        returns = {var: np.zeros(900) for var in variables}
+
+        n_read = reader.read_component_variables(
+            "bank_1", variables, returns, offset=10, rows=slice(50, 900)
+        )
+
+        assert n_read == 850
+        for var in variables:
+            index = reader.get_variable_index("bank_1", var)
+            np.testing.assert_array_equal(returns[var][10:860], events[50:900, index])
+
+
+@pytest.mark.parametrize("chunk_size", [None, 37])
+def test_filter_zeros_matches_delete_of_zero_weights(event_file, chunk_size) -> None:
+    variables = ["p", "t", "id"]
+    with h5py.File(event_file, "r") as file:
+        reader = McStasNeXus(file)
+        all_events = reader.get_event_data(variables)
+        zero_weights = np.where(all_events["p"] == 0)[0]
+        assert len(zero_weights) > 0
+
+        filtered = reader.get_event_data(
+            variables, filter_zeros=True, chunk_size=chunk_size
+        )
+        buffers = ReadNeXus.EventBuffers()
+        buffered = reader.get_event_data(
+            variables, filter_zeros=True, chunk_size=chunk_size, out=buffers
+        )
+
+    assert buffers.length == len(all_events["p"]) - len(zero_weights)
+    for var in variables:
+        expected = np.delete(all_events[var], zero_weights)
+        np.testing.assert_array_equal(filtered[var], expected)
+        np.testing.assert_array_equal(buffered[var], expected)
+
+
+@pytest.mark.parametrize("filter_zeros", [False, True])
+def test_memmap_read_equals_h5py_read(event_file, filter_zeros) -> None:
+    variables = ["id", "t", "p"]
+    with h5py.File(event_file, "r") as file:
+        expected = McStasNeXus(file).get_event_data(
+            variables, filter_zeros=filter_zeros
+        )
+        reader = McStasNeXus(file, memmap=True)
+        events = reader.get_event_data(variables, filter_zeros=filter_zeros)
+        dataset = reader.get_component_events_dataset("bank_0")
+        memmap = reader.get_component_events_memmap("bank_0")
+
+        # Compressed datasets fall back to reading through h5py
+        assert (memmap is None) == (dataset.chunks is not None)
+        if memmap is not None:
+            np.testing.assert_array_equal(memmap, dataset[()])
+
+    for var in variables:
+        np.testing.assert_array_equal(events[var], expected[var])
+
+
+def test_memmaps_released_on_close(tmp_path) -> None:
+    file_path = write_synthetic_file(tmp_path / "mccode.h5", n_events=100)
+    with Data(tmp_path, memmap=True) as data:
+        expected = data.get_event_data(["id", "t"])
+        memmap = data.file_object.get_component_events_memmap("bank_0")
+        assert memmap is not None
+        released = weakref.ref(memmap)
+        del memmap
+    assert released() is None
+
+    # The file is no longer mapped, so it can be removed and written again
+    os.remove(file_path)
+    write_synthetic_file(file_path, n_events=100)
+    with Data(tmp_path, memmap=True) as data:
+        events = data.get_event_data(["id", "t"])
+    for var, values in expected.items():
+        np.testing.assert_array_equal(events[var], values)
+
+
+@pytest.mark.parametrize("memmap", [False, True])
+@pytest.mark.parametrize("filter_zeros", [False, True])
+def test_workers_return_serial_output(event_file, memmap, filter_zeros) -> None:
+    variables = ["p", "t", "id"]
+    with h5py.File(event_file, "r") as file:
+        reader = McStasNeXus(file, memmap=memmap)
+        serial = reader.get_event_data(variables, filter_zeros=filter_zeros)
+        parallel = reader.get_event_data(
+            variables, filter_zeros=filter_zeros, workers=3, chunk_size=100
+        )
+        out = {var: np.full(2000, -1, dtype=serial[var].dtype) for var in variables}
+        parallel_out = reader.get_event_data(
+            variables, filter_zeros=filter_zeros, workers=3, out=out
+        )
+
+    for var in variables:
+        np.testing.assert_array_equal(parallel[var], serial[var])
+        np.testing.assert_array_equal(parallel_out[var], serial[var])
+        assert np.shares_memory(parallel_out[var], out[var])
+
+
+@pytest.mark.parametrize("filter_zeros", [False, True])
+def test_converted_dtypes_equal_cast_float64_output(event_file, filter_zeros) -> None:
+    variables = ["p", "t", "id"]
+    dtypes = {"p": np.float32, "t": np.float32, "id": np.int32}
+    with h5py.File(event_file, "r") as file:
+        reader = McStasNeXus(file)
+        full = reader.get_event_data(
+            variables, filter_zeros=filter_zeros, dtypes={"id": np.float64}
+        )
+        converted = reader.get_event_data(
+            variables, filter_zeros=filter_zeros, dtypes=dtypes
+        )
+        # Given buffers keep their own data type
+        out = {var: np.empty(2000, dtype=dtype) for var, dtype in dtypes.items()}
+        buffered = reader.get_event_data(variables, filter_zeros=filter_zeros, out=out)
+
+    for var, dtype in dtypes.items():
+        assert converted[var].dtype == dtype
+        assert buffered[var].dtype == dtype
+        np.testing.assert_array_equal(converted[var], full[var].astype(dtype))
+        np.testing.assert_array_equal(buffered[var], full[var].astype(dtype))
@@ -0,0 +1,77 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import numpy as np
+import pytest
+
+from mcstastox.LoadFile import Data
+from mcstastox.SyntheticFile import write_synthetic_file
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+@pytest.fixture
+def data(tmp_path):
+    write_synthetic_file(tmp_path / "mccode.h5", n_events=500, id_start=100, id_gap=3)
+    with Data(tmp_path) as data:
+        yield data
+
+
+def test_export_arrow_columns_equal_get_event_data(data) -> None:
+    batches = list(data.export_arrow(extra_variables="x", chunk_size=170))
+    assert len(batches) > 2
+    table = pa.Table.from_batches(batches)
+
+    expected = data.get_event_data(["p", "t", "id", "x"])
+    assert table.column_names == ["p", "t", "id", "x"]
+    for name, values in expected.items():
+        column = table.column(name).to_numpy()
+        assert column.dtype == values.dtype
+        np.testing.assert_array_equal(column, values)
+
+
+def test_export_arrow_does_not_copy_contiguous_columns(data, monkeypatch) -> None:
+    read_chunks = []
+    get_event_data_chunks = data.get_event_data_chunks
+
+    def recording_chunks(*args, **kwargs):
+        for chunk in get_event_data_chunks(*args, **kwargs):
+            read_chunks.append(chunk)
+            yield chunk
+
+    monkeypatch.setattr(data, "get_event_data_chunks", recording_chunks)
+    # Each batch is checked before the next chunk is read
+    for batch in data.export_arrow(filter_zeros=False, chunk_size=170):
+        chunk = read_chunks[-1]
+        for name in batch.schema.names:
+            values = chunk.data[name]
+            assert values.flags.c_contiguous
+            assert batch.column(name).buffers()[1].address == values.ctypes.data
+
+
+def test_arrow_pixel_table_joins_on_id(data) -> None:
+    events = pa.Table.from_batches(list(data.export_arrow()))
+    pixels = data.get_arrow_pixel_table()
+    assert pixels.num_rows == 160
+
+    joined = events.join(pixels, "id").sort_by("id")
+    assert joined.num_rows == events.num_rows
+    ids = joined.column("id").to_numpy()
+    positions = np.stack(
+        [joined.column(f"position_{axis}").to_numpy() for axis in "xyz"], axis=1
+    )
+    np.testing.assert_array_equal(positions, data.get_id_to_global_coordinates()[ids])
+
+
+def test_export_parquet_round_trip(data, tmp_path) -> None:
+    path = tmp_path / "events.parquet"
+    data.export_parquet(str(path), chunk_size=170, dtypes={"t": np.float32})
+
+    expected = data.get_event_data(["p", "t", "id"], dtypes={"t": np.float32})
+    events = pq.read_table(path)
+    assert events.schema == data._get_arrow_schema(["p", "t", "id"], {"t": np.float32})
+    for name, values in expected.items():
+        np.testing.assert_array_equal(events.column(name).to_numpy(), values)
+
+    pixels = pq.read_table(tmp_path / "events_pixels.parquet")
+    assert pixels.equals(data.get_arrow_pixel_table())
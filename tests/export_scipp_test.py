@@ -0,0 +1,56 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import numpy as np
+import pytest
+
+from mcstastox.LoadFile import Data
+from mcstastox.SyntheticFile import write_synthetic_file
+
+sc = pytest.importorskip("scipp")
+
+
+@pytest.fixture
+def data(tmp_path):
+    write_synthetic_file(tmp_path / "mccode.h5", n_events=500, id_start=100, id_gap=3)
+    with Data(tmp_path) as data:
+        yield data
+
+
+def test_concatenated_chunks_equal_export_scipp(data) -> None:
+    exported = data.export_scipp("source", "sample")["events"]
+    chunks = list(data.export_scipp_chunks("source", "sample", chunk_size=37))
+    assert len(chunks) > 2
+    events = sc.concat(chunks, "events")
+
+    # export_scipp groups by pixel keeping the order of events in each pixel
+    order = np.argsort(events.coords["pixel_id"].values, kind="stable")
+    grouped = exported.bins.concat().value
+    np.testing.assert_array_equal(grouped.values, events.values[order])
+    np.testing.assert_array_equal(
+        grouped.coords["t"].values, events.coords["t"].values[order]
+    )
+    np.testing.assert_array_equal(
+        exported.bins.size().values,
+        np.bincount(events.coords["pixel_id"].values)[
+            exported.coords["pixel_id"].values
+        ],
+    )
+    for name in ("source_position", "sample_position"):
+        assert sc.identical(events.coords[name], exported.coords[name])
+
+
+def test_export_scipp_positions_of_bank_pixels_only(data, monkeypatch) -> None:
+    dense = data.get_id_to_global_coordinates()
+
+    def no_dense_array(*args, **kwargs):
+        raise AssertionError("Dense id to position array allocated.")
+
+    monkeypatch.setattr(data, "get_id_to_coordinate", no_dense_array)
+    positions = data.export_scipp("source", "sample")["positions"]
+
+    # Pixel ids start at 100 with a gap of 3 between the two banks
+    ids = positions.coords["pixel_id"].values
+    assert len(ids) == 160
+    assert ids[0] == 100
+    assert ids[80] == 183
+    np.testing.assert_array_equal(positions.values, dense[ids])
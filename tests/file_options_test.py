@@ -0,0 +1,55 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+from mcstastox.FileOptions import _next_prime, get_tuned_file_options
+from mcstastox.LoadFile import Data
+from mcstastox.SyntheticFile import write_synthetic_file
+
+
+def test_next_prime() -> None:
+    assert [_next_prime(number) for number in (0, 2, 8, 100)] == [2, 2, 11, 101]
+
+
+def test_tuned_file_options_fit_one_chunk_row(tmp_path) -> None:
+    # A row of six chunks of 1.6 MB, more than the default cache of HDF5
+    write_synthetic_file(
+        tmp_path / "mccode.h5",
+        n_banks=1,
+        n_events=200_000,
+        compression="gzip",
+        chunks=(200_000, 1),
+    )
+
+    options = get_tuned_file_options(tmp_path / "mccode.h5")
+    assert "driver" not in options
+    assert options["rdcc_nbytes"] == 6 * 200_000 * 8
+    assert options["rdcc_nslots"] == 601
+    assert "page_buf_size" not in options
+
+
+def test_tuned_file_options_keep_default_cache_for_small_chunks(tmp_path) -> None:
+    write_synthetic_file(
+        tmp_path / "mccode.h5", n_events=1000, compression="gzip", chunks=(300, 6)
+    )
+
+    assert get_tuned_file_options(tmp_path / "mccode.h5") == {}
+
+
+def test_events_dataset_kept_open_between_reads(tmp_path) -> None:
+    write_synthetic_file(
+        tmp_path / "mccode.h5", n_events=1000, compression="gzip", chunks=(300, 6)
+    )
+
+    with Data(tmp_path) as data:
+        reader = data.file_object
+        dataset = reader.get_component_events_dataset("bank_0")
+        assert reader.get_component_events_dataset("bank_0") is dataset
+        assert reader.get_component_events_dataset("bank_1") is not dataset
+
+
+def test_given_file_options_override_tuned(tmp_path) -> None:
+    write_synthetic_file(tmp_path / "mccode.h5", n_events=10)
+
+    with Data(tmp_path, tune_file_options=True, driver="sec2") as data:
+        assert data.file.driver == "sec2"
+        assert data.file.swmr_mode
+        assert data.file_options == {"driver": "sec2"}
@@ -0,0 +1,83 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import h5py
+import numpy as np
+import pytest
+
+from mcstastox.Histogram import PixelTimeHistogram
+from mcstastox.LoadFile import Data
+from mcstastox.SyntheticFile import write_synthetic_file
+
+
+def test_pixel_time_histogram_matches_histogram2d() -> None:
+    rng = np.random.default_rng(3)
+    rows = rng.integers(0, 5, 1000)
+    t = rng.uniform(-0.1, 1.1, 1000)
+    weights = rng.random(1000)
+    edges = np.linspace(0, 1, 11)
+
+    histogram = PixelTimeHistogram(5, edges)
+    histogram.add(rows[:400], t[:400], weights[:400])
+    histogram.add(rows[400:], t[400:], weights[400:])
+
+    pixel_edges = np.arange(6) - 0.5
+    expected, _, _ = np.histogram2d(rows, t, bins=[pixel_edges, edges], weights=weights)
+    np.testing.assert_allclose(histogram.data, expected)
+    expected, _, _ = np.histogram2d(
+        rows, t, bins=[pixel_edges, edges], weights=weights**2
+    )
+    np.testing.assert_allclose(histogram.variances, expected)
+
+
+def test_pixel_time_histogram_counts_upper_edge() -> None:
+    histogram = PixelTimeHistogram(2, [0.0, 1.0, 2.0])
+    histogram.add(np.array([0, 1, 1]), np.array([0.0, 2.0, 2.5]))
+    np.testing.assert_array_equal(histogram.data, [[1, 0], [0, 1]])
+    assert histogram.n_events == 2
+
+
+def test_pixel_time_histogram_invalid_edges() -> None:
+    with pytest.raises(ValueError, match="increasing"):
+        PixelTimeHistogram(2, [0.0, 0.0, 1.0])
+
+
+@pytest.fixture
+def histogram_file(tmp_path):
+    path = write_synthetic_file(tmp_path / "mccode.h5", histogram_shape=(7, 5, 3))
+    with h5py.File(path, "a") as file:
+        output = file["entry1/instrument/components/0005_histogram/output"]
+        bins = output.create_group("BINS")
+        for var, length in (("x", 8), ("y", 4)):
+            bins.attrs[f"{var}var"] = np.bytes_(var)
+            bins.attrs[f"{var}label"] = np.bytes_(f"{var} [m]")
+            bins.create_dataset(f"{var}__m_", data=np.arange(length))
+    return path
+
+
+def test_monitor_histogram_slices_and_sums(histogram_file) -> None:
+    with Data(histogram_file.parent) as data:
+        histogram = data.get_histogram("histogram", chunk_size=10)
+        intensity, errors, ncount = data.get_component_data("histogram")
+
+        assert histogram.shape == (7, 5, 3)
+        sliced = histogram[2:4, 1]
+        np.testing.assert_array_equal(sliced[0], intensity[2:4, 1])
+        np.testing.assert_array_equal(sliced[1], errors[2:4, 1])
+
+        # Rows are 15 bins, more than the chunk of 10, so each slab is one row
+        # and the 7 rows are read in 7 slabs
+        for axis in [None, 0, (1, 2), (0, 2)]:
+            summed = histogram.sum(axis)
+            np.testing.assert_allclose(summed[0], np.sum(intensity, axis=axis))
+            np.testing.assert_allclose(summed[1], np.sqrt(np.sum(errors**2, axis=axis)))
+            np.testing.assert_allclose(summed[2], np.sum(ncount, axis=axis))
+
+        projected = histogram.project(1)
+        np.testing.assert_allclose(projected[0], intensity.sum(axis=(0, 2)))
+        assert histogram.total()[0] == pytest.approx(intensity.sum())
+
+        # x axis has bin edges, y does not match the data and z has no axis
+        assert histogram.get_axis(0)[0] == "x"
+        np.testing.assert_array_equal(histogram.get_axis(0)[1], np.arange(8))
+        assert histogram.get_axis(1) == (None, None)
+        assert histogram.get_axis(2) == (None, None)
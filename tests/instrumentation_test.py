@@ -0,0 +1,36 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+from mcstastox.Instrumentation import NO_INSTRUMENTATION, Instrumentation
+from mcstastox.LoadFile import Data
+from mcstastox.SyntheticFile import write_synthetic_file
+
+
+def test_instrumentation_sums_records_and_calls_back() -> None:
+    calls = []
+    instrumentation = Instrumentation(callback=lambda *args: calls.append(args))
+    with instrumentation.stage("read", "bank"):
+        instrumentation.record("read", "bank", bytes_read=80, events=10)
+    instrumentation.record("read", "other", events=5)
+
+    records = instrumentation.as_dict()["read"]
+    assert records["bank"]["calls"] == 1
+    assert records["bank"]["time"] >= 0
+    assert records["bank"]["bytes_read"] == 80
+    assert instrumentation.get_totals()["read"]["events"] == 15
+    assert calls[0] == ("read", "bank", {"bytes_read": 80, "events": 10})
+    assert len(calls) == 3
+
+
+def test_data_instrument_records_reads(tmp_path) -> None:
+    write_synthetic_file(tmp_path / "mccode.h5", n_events=100)
+
+    with Data(tmp_path) as data:
+        with data.instrument() as instrumentation:
+            data.get_event_data(["t", "id"], filter_zeros=False)
+        assert data.instrumentation is NO_INSTRUMENTATION
+
+    records = instrumentation.as_dict()
+    assert set(records["read"]) == {"bank_0", "bank_1"}
+    assert records["read"]["bank_0"]["events"] == 100
+    assert records["read"]["bank_0"]["bytes_read"] == 100 * 2 * 8
+    assert records["allocate"][None]["arrays_allocated"] == 2
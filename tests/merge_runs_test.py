@@ -0,0 +1,105 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import h5py
+import numpy as np
+import pytest
+
+from mcstastox.LoadFile import Data
+from mcstastox.MergeRuns import merge_runs
+from mcstastox.ReadNeXus import McStasNeXus
+from mcstastox.SyntheticFile import write_synthetic_file
+
+
+def _write_runs(tmp_path, ncounts, **kwargs):
+    paths = []
+    for seed, ncount in enumerate(ncounts):
+        path = tmp_path / f"run_{seed}.h5"
+        write_synthetic_file(
+            path, n_events=100 + seed, ncount=ncount, seed=seed, **kwargs
+        )
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_merge_runs_scales_events_and_histograms(tmp_path, compression) -> None:
+    paths = _write_runs(tmp_path, [1e6, 3e6])
+    output_path = merge_runs(
+        paths, tmp_path / "merged.h5", chunk_size=7, compression=compression
+    )
+
+    with h5py.File(output_path, "r") as file:
+        assert McStasNeXus(file).get_ncount() == 4e6
+
+    runs = [Data(tmp_path, path.name) for path in paths]
+    with Data(tmp_path, "merged.h5") as merged:
+        events = merged.get_component_data("bank_1")
+        expected = [run.get_component_data("bank_1") for run in runs]
+        expected[0][:, 0] *= 0.25
+        expected[1][:, 0] *= 0.75
+        np.testing.assert_allclose(events, np.concatenate(expected))
+
+        data, errors, ncount = merged.get_component_data("histogram")
+        (data_0, errors_0, ncount_0), (data_1, errors_1, ncount_1) = (
+            run.get_component_data("histogram") for run in runs
+        )
+        np.testing.assert_allclose(data, 0.25 * data_0 + 0.75 * data_1)
+        np.testing.assert_allclose(errors, np.hypot(0.25 * errors_0, 0.75 * errors_1))
+        np.testing.assert_array_equal(ncount, ncount_0 + ncount_1)
+        np.testing.assert_array_equal(
+            merged.get_id_to_global_coordinates(),
+            runs[0].get_id_to_global_coordinates(),
+        )
+
+    for run in runs:
+        run.close()
+
+
+def test_merge_runs_checks_layout(tmp_path) -> None:
+    paths = _write_runs(tmp_path, [1e6])
+    paths.append(write_synthetic_file(tmp_path / "other.h5", histogram_shape=(4, 4)))
+
+    with pytest.raises(ValueError, match="does not have shape"):
+        merge_runs(paths, tmp_path / "merged.h5")
+
+
+def test_merge_runs_updates_summary_attributes(tmp_path) -> None:
+    paths = _write_runs(tmp_path, [1e6, 3e6])
+    for path in paths:
+        with h5py.File(path, "a") as file:
+            run = McStasNeXus(file)
+            for comp in ("histogram", "bank_0"):
+                info_entry = run.get_info_entry(comp)
+                # Summary attributes of the run as McStas writes them
+                info_entry.attrs["Ncount"] = np.bytes_(b"1000000")
+                info_entry.attrs["values"] = np.bytes_(b"1 0.1 100")
+                info_entry.attrs["signal"] = np.bytes_(b"Min=0; Max=1; Mean=0.5;")
+                info_entry.attrs["statistics"] = np.bytes_(b"X0=0; dX=1;")
+                info_entry.attrs["title"] = np.bytes_(comp.encode())
+
+    output_path = merge_runs(paths, tmp_path / "merged.h5", chunk_size=7)
+    with h5py.File(output_path, "r") as file:
+        merged = McStasNeXus(file)
+        histogram = merged.get_info_entry("histogram")
+        data = histogram["data"][()]
+        errors = histogram["errors"][()]
+        ncount = histogram["ncount"][()]
+        attrs = histogram.attrs
+        assert attrs["Ncount"] == b"4000000"
+        assert attrs["title"] == b"histogram"
+        assert "statistics" not in attrs
+
+        intensity, error, n = (float(v) for v in attrs["values"].split())
+        np.testing.assert_allclose(intensity, data.sum(), rtol=1e-5)
+        np.testing.assert_allclose(error, np.sqrt(np.sum(errors**2)), rtol=1e-5)
+        np.testing.assert_allclose(n, ncount.sum(), rtol=1e-5)
+        signal = dict(item.split("=") for item in attrs["signal"].decode().split("; "))
+        np.testing.assert_allclose(float(signal["Min"]), data.min(), rtol=1e-5)
+        np.testing.assert_allclose(float(signal["Max"]), data.max(), rtol=1e-5)
+        np.testing.assert_allclose(float(signal["Mean"][:-1]), data.mean(), rtol=1e-5)
+
+        events = merged.get_info_entry("bank_0").attrs
+        assert events["Ncount"] == b"4000000"
+        assert events["title"] == b"bank_0"
+        for name in ("values", "signal", "statistics"):
+            assert name not in events
@@ -0,0 +1,148 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import os
+
+import numpy as np
+import pytest
+
+import mcstastox
+from mcstastox.LoadFile import Data
+from mcstastox.MetadataCache import (
+    CACHE_SUFFIX,
+    get_cache_key,
+    get_cache_path,
+    load_cache,
+    save_cache,
+)
+from mcstastox.ReadNeXus import McStasNeXus
+from mcstastox.SyntheticFile import write_synthetic_file
+
+
+def test_cache_round_trip_and_staleness(tmp_path) -> None:
+    data_path = tmp_path / "mccode.h5"
+    data_path.write_bytes(b"data")
+    cache_path = get_cache_path(str(data_path))
+    key = get_cache_key(str(data_path))
+
+    metadata = dict(mcstas_version=[3, 5, 20], component_path_names={})
+    pixel_tables = dict(
+        component_pixel_order=["bank"],
+        pixel_range={"bank": [np.int64(3), np.int64(8)]},
+        local_pixel_locations={"bank": np.zeros((6, 3))},
+        global_pixel_locations={"bank": np.ones((6, 3))},
+    )
+    save_cache(cache_path, key, metadata, pixel_tables)
+
+    loaded_metadata, loaded_tables = load_cache(cache_path, key)
+    assert loaded_metadata == metadata
+    assert loaded_tables["pixel_range"] == {"bank": [3, 8]}
+    assert loaded_tables["component_pixel_order"] == ["bank"]
+    np.testing.assert_array_equal(loaded_tables["global_pixel_locations"]["bank"], 1)
+
+    data_path.write_bytes(b"changed data")
+    assert load_cache(cache_path, get_cache_key(str(data_path))) == (None, None)
+
+
+def test_cache_path_in_cache_dir(tmp_path) -> None:
+    first = get_cache_path("/runs/a/mccode.h5", str(tmp_path))
+    second = get_cache_path("/runs/b/mccode.h5", str(tmp_path))
+    assert first != second
+    assert first.startswith(str(tmp_path))
+
+
+@pytest.fixture
+def scans(monkeypatch):
+    """
+    :return: list with an entry for each scan of the components of a file
+    """
+    scans = []
+    build_component_index = McStasNeXus._build_component_index
+
+    def counting_build(self):
+        scans.append(self.file_handle.filename)
+        build_component_index(self)
+
+    monkeypatch.setattr(McStasNeXus, "_build_component_index", counting_build)
+    return scans
+
+
+def test_data_cache_skips_scan_and_restores_pixel_tables(tmp_path, scans) -> None:
+    write_synthetic_file(tmp_path / "mccode.h5", n_events=100, id_gap=5)
+    with Data(tmp_path) as fresh:
+        fresh.load_all_with_id()
+    assert len(scans) == 1
+
+    with Data(tmp_path, cache=True) as data:
+        data.load_all_with_id()
+    assert len(scans) == 2
+    assert os.path.isfile(tmp_path / f"mccode.h5{CACHE_SUFFIX}")
+
+    with Data(tmp_path, cache=True) as cached:
+        assert len(scans) == 2
+        assert cached.get_components() == fresh.get_components()
+        assert cached.get_components_with_ids() == fresh.get_components_with_ids()
+        registry, fresh_registry = cached.bank_registry, fresh.bank_registry
+        assert registry.names == fresh_registry.names
+        assert registry.starts == fresh_registry.starts
+        assert registry.ends == fresh_registry.ends
+        assert cached.pixel_range == {
+            comp: [int(value) for value in pixel_range]
+            for comp, pixel_range in fresh.pixel_range.items()
+        }
+        for tables in ("local_pixel_locations", "global_pixel_locations"):
+            cached_tables = getattr(cached, tables)
+            assert cached_tables.keys() == getattr(fresh, tables).keys()
+            for comp, locations in getattr(fresh, tables).items():
+                np.testing.assert_array_equal(cached_tables[comp], locations)
+
+        # Pixel tables are not calculated again
+        cached.calculate_local_pixel_locations = None
+        np.testing.assert_array_equal(
+            cached.get_id_to_global_coordinates(), fresh.get_id_to_global_coordinates()
+        )
+
+
+def test_data_cache_rewritten_with_new_banks(tmp_path) -> None:
+    write_synthetic_file(tmp_path / "mccode.h5", n_events=100)
+    file_path = str(tmp_path / "mccode.h5")
+    cache_path = get_cache_path(file_path)
+
+    with Data(tmp_path, cache=True) as data:
+        data.calculate_pixel_locations("bank_0")
+    _, pixel_tables = load_cache(cache_path, get_cache_key(file_path))
+    assert list(pixel_tables["global_pixel_locations"]) == ["bank_0"]
+
+    with Data(tmp_path, cache=True) as data:
+        assert data.component_pixel_order == ["bank_0"]
+        data.calculate_pixel_locations("bank_1")
+    _, pixel_tables = load_cache(cache_path, get_cache_key(file_path))
+    assert list(pixel_tables["global_pixel_locations"]) == ["bank_0", "bank_1"]
+    assert pixel_tables["component_pixel_order"] == ["bank_0", "bank_1"]
+
+
+@pytest.mark.parametrize("change", ["size", "mtime_ns", "version"])
+def test_data_cache_rebuilt_when_file_changes(
+    tmp_path, scans, monkeypatch, change
+) -> None:
+    file_path = tmp_path / "mccode.h5"
+    write_synthetic_file(file_path, n_events=100)
+    with Data(tmp_path, cache=True) as data:
+        data.load_all_with_id()
+
+    stat = os.stat(file_path)
+    if change == "size":
+        # Same modification time, more events, pixel ids of the second bank
+        # move with the gap
+        write_synthetic_file(file_path, n_events=120, id_gap=20)
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        assert os.stat(file_path).st_size != stat.st_size
+    elif change == "mtime_ns":
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1000))
+    else:
+        monkeypatch.setattr(mcstastox, "__version__", "0.0.0+other")
+
+    with Data(tmp_path, cache=True) as data:
+        assert len(scans) == 2
+        assert data.global_pixel_locations == {}
+        data.load_all_with_id()
+        assert data.pixel_range["bank_1"][0] == (100 if change == "size" else 80)
@@ -0,0 +1,134 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import numpy as np
+import pytest
+
+from mcstastox.LoadFile import Data
+from mcstastox.PixelTables import BankRegistry, PixelLookup, sort_by_pixel
+from mcstastox.SyntheticFile import write_synthetic_file
+
+
+def _positions(n, value):
+    return np.full((n, 3), value, dtype=float) + np.arange(n)[:, None]
+
+
+def test_pixel_lookup_with_gap_and_large_offset() -> None:
+    lookup = PixelLookup(
+        starts=[1_000_000, 10],
+        ends=[1_000_004, 12],
+        positions=[_positions(5, 100.0), _positions(3, 0.0)],
+    )
+
+    assert len(lookup) == 8
+    np.testing.assert_array_equal(lookup.starts, [10, 1_000_000])
+    np.testing.assert_array_equal(
+        lookup.ids, [10, 11, 12, 1_000_000, 1_000_001, 1_000_002, 1_000_003, 1_000_004]
+    )
+    np.testing.assert_array_equal(
+        lookup[np.array([12.0, 1_000_001.0, 10.0])][:, 0], [2, 101, 0]
+    )
+    np.testing.assert_array_equal(lookup.contains([9, 10, 13, 1_000_004]), [0, 1, 0, 1])
+
+
+def test_pixel_lookup_missing_id_raises() -> None:
+    lookup = PixelLookup(starts=[0], ends=[2], positions=[_positions(3, 0.0)])
+    with pytest.raises(ValueError, match="id 5"):
+        lookup[[0, 5]]
+
+
+def test_pixel_lookup_overlap_raises() -> None:
+    with pytest.raises(ValueError, match="Overlap"):
+        PixelLookup(
+            starts=[0, 2], ends=[3, 5], positions=[_positions(4, 0), _positions(4, 0)]
+        )
+
+
+def test_bank_registry_orders_and_detects_containment() -> None:
+    registry = BankRegistry()
+    registry.register("b", 100, 199)
+    registry.register("a", 0, 49)
+    registry.register("c", 300, 399)
+    assert registry.names == ["a", "b", "c"]
+    assert not registry.is_continuous()
+
+    # New range fully containing an existing one
+    with pytest.raises(ValueError, match="between b and d"):
+        registry.register("d", 60, 250)
+
+
+def test_bank_registry_register_many() -> None:
+    registry = BankRegistry()
+    registry.register("middle", 10, 19)
+    registry.register_many(["last", "first"], [20, 0], [29, 9])
+    assert registry.names == ["first", "middle", "last"]
+    assert registry.is_continuous()
+
+    with pytest.raises(ValueError, match="between wide and inner"):
+        BankRegistry().register_many(["wide", "inner", "x"], [0, 5, 200], [100, 6, 300])
+
+
+def test_bank_registry_sorts_banks_registered_one_at_a_time() -> None:
+    registry = BankRegistry()
+    starts = np.random.default_rng(2).permutation(3000) * 10
+    for start in starts:
+        registry.register(f"bank_{start}", start, start + 9)
+    assert len(registry) == 3000
+    assert registry.starts == sorted(starts.tolist())
+    assert registry.is_continuous()
+
+    # Overlap between banks registered since the last lookup is found right
+    # away and the valid pending banks are kept
+    registry.register("x", 30_000, 30_010)
+    registry.register("z", 40_000, 40_010)
+    with pytest.raises(ValueError, match="between x and y"):
+        registry.register("y", 30_005, 30_020)
+    with pytest.raises(ValueError, match="between z and w"):
+        registry.register("w", 39_000, 40_000)
+    assert len(registry) == 3002
+    assert registry.names[-2:] == ["x", "z"]
+    assert registry.is_continuous() is False
+
+
+@pytest.mark.parametrize("n_pixels", [1, 300, 200_000])
+def test_sort_by_pixel_is_stable_sort(n_pixels) -> None:
+    rows = np.random.default_rng(1).integers(0, n_pixels, 5000)
+    order, counts = sort_by_pixel(rows, n_pixels)
+
+    np.testing.assert_array_equal(order, np.argsort(rows, kind="stable"))
+    np.testing.assert_array_equal(counts, np.bincount(rows, minlength=n_pixels))
+
+
+def test_group_by_pixel_identical_to_scipp_group(tmp_path) -> None:
+    sc = pytest.importorskip("scipp")
+    write_synthetic_file(tmp_path / "mccode.h5", n_events=500, id_start=7, id_gap=2)
+
+    with Data(tmp_path) as data:
+        event_data = data.get_event_data(["p", "t", "id"])
+        events = Data._make_scipp_events(event_data, np.zeros(3), np.ones(3))
+        lookup = data.get_id_lookup()
+        grouped = Data._group_by_pixel(events, lookup)
+
+    expected = sc.group(events, "pixel_id")
+    positions = grouped.coords.pop("position")
+    assert sc.identical(grouped, expected)
+    np.testing.assert_array_equal(
+        positions.values, lookup[expected.coords["pixel_id"].values]
+    )
+
+
+def test_overlapping_banks_raise_when_registered(tmp_path) -> None:
+    # Second bank starts 10 pixel id's before the end of the first
+    write_synthetic_file(tmp_path / "mccode.h5", n_events=100, id_gap=-10)
+
+    with Data(tmp_path) as data:
+        data.calculate_pixel_locations("bank_0")
+        with pytest.raises(ValueError, match="between bank_0 and bank_1"):
+            data.calculate_pixel_locations("bank_1")
+
+        # Nothing of the overlapping bank is kept, the first bank still works
+        assert "bank_1" not in data.pixel_range
+        assert "bank_1" not in data.global_pixel_locations
+        assert data.bank_registry.names == ["bank_0"]
+        for _ in range(2):
+            with pytest.raises(ValueError, match="between bank_0 and bank_1"):
+                data.get_highest_id()
@@ -0,0 +1,24 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import numpy as np
+
+from mcstastox.LoadFile import Data
+from mcstastox.SyntheticFile import write_synthetic_file
+
+
+def test_transform_many_equals_transform_of_each_point(tmp_path) -> None:
+    write_synthetic_file(tmp_path / "mccode.h5", n_banks=3)
+    rng = np.random.default_rng(4)
+    components = ["bank_2", "bank_0", "sample", "bank_1"]
+    coordinates = [rng.normal(size=(n, 3)) for n in (7, 0, 1, 5)]
+
+    with Data(tmp_path) as data:
+        transformed = data.transform_many(coordinates, components)
+        for comp, points, result in zip(
+            components, coordinates, transformed, strict=True
+        ):
+            assert result.shape == points.shape
+            for point, point_result in zip(points, result, strict=True):
+                np.testing.assert_array_equal(
+                    point_result, data.transform(point[np.newaxis], comp)[0]
+                )
@@ -0,0 +1,131 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import h5py
+import numpy as np
+import pytest
+
+from mcstastox import ReadNeXus
+from mcstastox.LoadFile import Data
+from mcstastox.ReadChunks import _fletcher32, get_chunk_filters, read_chunked_columns
+from mcstastox.SyntheticFile import write_synthetic_file
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_read_chunked_columns_matches_h5py(shuffle) -> None:
+    events = np.random.default_rng(3).random((1003, 5))
+    with h5py.File("chunks.h5", "w", driver="core", backing_store=False) as f:
+        dataset = f.create_dataset(
+            "events",
+            data=events,
+            chunks=(100, 2),
+            compression="gzip",
+            shuffle=shuffle,
+            fletcher32=shuffle,
+        )
+        assert get_chunk_filters(dataset) is not None
+
+        outputs = [np.zeros(900), np.zeros(900)]
+        n_read = read_chunked_columns(
+            dataset, [4, 1], outputs, rows=slice(150, 1003), offset=10, workers=3
+        )
+
+    assert n_read == 853
+    np.testing.assert_array_equal(outputs[0][10:863], events[150:, 4])
+    np.testing.assert_array_equal(outputs[1][10:863], events[150:, 1])
+
+
+def test_chunk_filters_of_uncompressed_dataset() -> None:
+    with h5py.File("chunks.h5", "w", driver="core", backing_store=False) as f:
+        contiguous = f.create_dataset("contiguous", data=np.zeros((10, 3)))
+        chunked = f.create_dataset("chunked", data=np.zeros((10, 3)), chunks=(5, 3))
+        assert get_chunk_filters(contiguous) is None
+        assert get_chunk_filters(chunked) is None
+
+
+@pytest.mark.parametrize("n_rows", [1, 7, 100, 1000])
+def test_fletcher32_matches_hdf5(n_rows) -> None:
+    # Compressed chunks of odd and even length, longer and shorter than a
+    # block of 360 words
+    events = np.random.default_rng(n_rows).random((3 * n_rows, 2))
+    with h5py.File("chunks.h5", "w", driver="core", backing_store=False) as f:
+        dataset = f.create_dataset(
+            "events",
+            data=events,
+            chunks=(n_rows, 1),
+            compression="gzip",
+            fletcher32=True,
+        )
+        for index in range(dataset.id.get_num_chunks()):
+            chunk_offset = dataset.id.get_chunk_info(index).chunk_offset
+            _, raw = dataset.id.read_direct_chunk(chunk_offset)
+            assert _fletcher32(raw[:-4]) == int.from_bytes(raw[-4:], "little")
+
+
+def test_read_chunked_columns_raises_on_corrupt_chunk(tmp_path) -> None:
+    file_path = tmp_path / "chunks.h5"
+    events = np.random.default_rng(5).random((300, 2))
+    with h5py.File(file_path, "w") as f:
+        dataset = f.create_dataset(
+            "events", data=events, chunks=(100, 2), compression="gzip", fletcher32=True
+        )
+        chunk_info = dataset.id.get_chunk_info(1)
+
+    # Flip a byte in the middle of the second chunk
+    with open(file_path, "r+b") as file:
+        position = chunk_info.byte_offset + chunk_info.size // 2
+        file.seek(position)
+        value = file.read(1)[0]
+        file.seek(position)
+        file.write(bytes([value ^ 0xFF]))
+
+    with h5py.File(file_path, "r") as f:
+        with pytest.raises(OSError, match="filter returned failure"):
+            f["events"][:]
+        with pytest.raises(OSError, match="Fletcher32"):
+            read_chunked_columns(f["events"], [0], [np.zeros(300)], workers=2)
+
+
+@pytest.fixture
+def compressed_folder(tmp_path):
+    write_synthetic_file(
+        tmp_path / "mccode.h5",
+        n_banks=3,
+        n_events=1000,
+        compression="gzip",
+        chunks=(64, 6),
+    )
+    return tmp_path
+
+
+@pytest.mark.parametrize("filter_zeros", [False, True])
+def test_data_decompress_workers_matches_serial(
+    compressed_folder, monkeypatch, filter_zeros
+) -> None:
+    parallel_reads = []
+
+    def counting_read(*args, **kwargs):
+        parallel_reads.append(args[0].name)
+        return read_chunked_columns(*args, **kwargs)
+
+    monkeypatch.setattr(ReadNeXus, "read_chunked_columns", counting_read)
+
+    variables = ["p", "t", "id", "x", "y"]
+    with Data(compressed_folder) as serial:
+        expected = serial.get_event_data(variables, filter_zeros=filter_zeros)
+        expected_arrays = {
+            component: serial.file_object.get_component_events_array(component)
+            for component in serial.get_components_with_ids()
+        }
+    assert parallel_reads == []
+
+    with Data(compressed_folder, decompress_workers=3) as data:
+        events = data.get_event_data(variables, filter_zeros=filter_zeros)
+        assert len(parallel_reads) > 0
+        for component, array in expected_arrays.items():
+            np.testing.assert_array_equal(
+                data.file_object.get_component_events_array(component), array
+            )
+
+    assert events.keys() == expected.keys()
+    for variable, values in expected.items():
+        np.testing.assert_array_equal(events[variable], values)
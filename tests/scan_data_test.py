@@ -0,0 +1,105 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import numpy as np
+import pytest
+
+from mcstastox.LoadFile import Data
+from mcstastox.ScanData import ScanData
+from mcstastox.SyntheticFile import write_synthetic_file
+
+
+def _write_grid_scan(tmp_path):
+    index = 0
+    for wavelength in (1.0, 2.0, 3.0):
+        for angle in (10.0, 20.0):
+            folder = tmp_path / f"scan_{index}"
+            folder.mkdir()
+            write_synthetic_file(
+                folder / "mccode.h5",
+                n_events=100,
+                parameters={"wavelength": wavelength, "angle": angle, "mode": "a"},
+                seed=index,
+            )
+            index += 1
+
+
+def test_scan_parameters_and_grid(tmp_path) -> None:
+    _write_grid_scan(tmp_path)
+    scan = ScanData(str(tmp_path / "scan_*"), workers=3)
+
+    assert len(scan) == 6
+    assert scan.get_scan_parameters() == ["angle", "wavelength"]
+    np.testing.assert_array_equal(scan.parameters["wavelength"], [1, 1, 2, 2, 3, 3])
+    assert list(scan.parameters["mode"]) == ["a"] * 6
+
+    names, axes, _ = scan.get_scan_grid()
+    assert names == ["angle", "wavelength"]
+    np.testing.assert_array_equal(axes[1], [1, 2, 3])
+
+
+def test_runs_stacked_in_numeric_order(tmp_path) -> None:
+    for index in (10, 2, 1):
+        folder = tmp_path / f"scan_{index}"
+        folder.mkdir()
+        write_synthetic_file(
+            folder / "mccode.h5", n_events=10, parameters={"wavelength": index}
+        )
+
+    scan = ScanData(str(tmp_path / "scan_*"), workers=1)
+    assert scan.data_folders == [
+        str(tmp_path / f"scan_{index}") for index in (1, 2, 10)
+    ]
+    np.testing.assert_array_equal(scan.parameters["wavelength"], [1, 2, 10])
+
+
+def test_stacked_histograms_match_single_runs(tmp_path) -> None:
+    _write_grid_scan(tmp_path)
+    scan = ScanData(str(tmp_path / "scan_*"), workers=3)
+
+    histograms = scan.get_histograms("histogram")
+    assert histograms["intensity"].shape == (6, 20, 10)
+    for index, folder in enumerate(scan.data_folders):
+        with Data(folder) as data:
+            intensity, error, ncount = data.get_component_data("histogram")
+        np.testing.assert_array_equal(histograms["intensity"][index], intensity)
+        np.testing.assert_array_equal(histograms["error"][index], error)
+        np.testing.assert_array_equal(histograms["ncount"][index], ncount)
+
+    # Runs are placed at (angle, wavelength) on the grid
+    grid = scan.get_histograms("histogram", grid=True)
+    assert grid["intensity"].shape == (2, 3, 20, 10)
+    np.testing.assert_array_equal(grid["intensity"][1, 2], histograms["intensity"][5])
+
+    with pytest.raises(ValueError, match="not a histogram monitor"):
+        scan.get_histograms("bank_0")
+
+
+def test_stacked_binned_events(tmp_path) -> None:
+    _write_grid_scan(tmp_path)
+    scan = ScanData(str(tmp_path / "scan_*"), workers=2)
+
+    binned = scan.get_binned_events(5, t_range=(0, 0.03))
+    assert binned["data"].shape == (6, 160, 5)
+    assert binned["t"].shape == (6,)
+    with Data(scan.data_folders[3]) as data:
+        expected = data.histogram_events(5, t_range=(0, 0.03))
+    np.testing.assert_allclose(binned["data"][3], expected["data"])
+    np.testing.assert_array_equal(binned["pixel_id"], expected["pixel_id"])
+
+
+def test_process_pool_matches_serial_read(tmp_path) -> None:
+    _write_grid_scan(tmp_path)
+    pattern = str(tmp_path / "scan_*")
+
+    serial = ScanData(pattern, workers=1).get_binned_events(5, t_range=(0, 0.03))
+    pooled = ScanData(pattern, workers=3).get_binned_events(5, t_range=(0, 0.03))
+    assert serial.keys() == pooled.keys()
+    for name, array in serial.items():
+        np.testing.assert_array_equal(pooled[name], array)
+
+    other = tmp_path / "scan_other"
+    other.mkdir()
+    write_synthetic_file(other / "mccode.h5", n_events=100, id_start=10)
+    scan = ScanData(pattern, workers=3)
+    with pytest.raises(ValueError, match="differs from other runs"):
+        scan.get_binned_events(5, t_range=(0, 0.03))
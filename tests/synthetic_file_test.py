@@ -0,0 +1,67 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import numpy as np
+import pytest
+
+from mcstastox.LoadFile import Data
+from mcstastox.SyntheticFile import write_synthetic_file
+
+
+@pytest.mark.parametrize("compression", [None, "gzip"])
+def test_synthetic_file_events_and_pixels(tmp_path, compression) -> None:
+    write_synthetic_file(
+        tmp_path / "mccode.h5",
+        n_events=500,
+        id_start=10,
+        id_gap=5,
+        zero_fraction=0,
+        compression=compression,
+    )
+
+    with Data(tmp_path) as data:
+        assert data.get_components_with_ids() == ["bank_0", "bank_1"]
+        events = data.get_event_data(["p", "id"])
+        assert len(events["p"]) == 1000
+        assert events["id"].min() >= 10
+        assert events["id"].max() < 10 + 80 + 5 + 80
+
+        data.load_all_with_id()
+        assert data.pixel_range["bank_1"] == [95, 174]
+        assert data.get_id_lookup()[events["id"]].shape == (1000, 3)
+
+
+def test_synthetic_file_mcstas_2_7(tmp_path) -> None:
+    write_synthetic_file(tmp_path / "mccode.h5", mcstas_version=(2, 7, 0))
+
+    with Data(tmp_path) as data:
+        # Components are not numbered, so file order is alphabetical
+        assert data.get_components() == [
+            "bank_0",
+            "bank_1",
+            "histogram",
+            "sample",
+            "source",
+        ]
+        np.testing.assert_array_equal(
+            data.get_component_placement("sample")[0], [0, 0, 2]
+        )
+        assert len(data.get_event_data(["t"], filter_zeros=False)["t"]) == 2000
+
+        # Square banks are mapped from the options and xylimits of the monitor
+        data.load_all_with_id()
+        assert data.pixel_range == {"bank_0": [0, 79], "bank_1": [80, 159]}
+        events = data.get_event_data(["id"])
+        assert data.get_id_lookup()[events["id"]].shape == (len(events["id"]), 3)
+        np.testing.assert_allclose(
+            data.local_pixel_locations["bank_1"],
+            data.local_pixel_locations["bank_0"],
+        )
+
+
+def test_synthetic_file_banana_needs_geometry(tmp_path) -> None:
+    with pytest.raises(ValueError, match="Banana banks"):
+        write_synthetic_file(
+            tmp_path / "mccode.h5",
+            mcstas_version=(2, 7, 0),
+            shapes=("square", "banana"),
+        )
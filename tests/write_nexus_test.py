@@ -0,0 +1,64 @@
+# SPDX-License-Identifier: BSD-3-Clause
+# Copyright (c) 2025 Mccode-dev contributors (https://github.com/mccode-dev)
+import h5py
+import numpy as np
+
+from mcstastox.LoadFile import Data
+from mcstastox.SyntheticFile import write_synthetic_file
+from mcstastox.WriteNeXus import EventDataWriter
+
+
+def test_event_data_writer_appends_chunks() -> None:
+    dtypes = {"id": np.dtype(np.int32), "t": np.dtype(np.float64), "p": np.float32}
+    with h5py.File("events.h5", "w", driver="core", backing_store=False) as f:
+        writer = EventDataWriter(f, "events", dtypes, dataset_chunk_size=4)
+        for start in (0, 5, 5):
+            writer.append(
+                {
+                    "id": np.arange(start, start + 5),
+                    "t": np.full(5, 0.01 * start),
+                    "p": np.ones(5),
+                }
+            )
+
+        group = f["events"]
+        assert group.attrs["NX_class"] == "NXevent_data"
+        np.testing.assert_array_equal(group["event_index"][()], [0])
+        np.testing.assert_array_equal(group["event_time_zero"][()], [0])
+        assert group["event_id"].dtype == np.int32
+        assert group["event_id"].chunks == (4,)
+        np.testing.assert_array_equal(group["event_id"][10:], np.arange(5, 10))
+        np.testing.assert_allclose(group["event_time_offset"][5:7], [0.05, 0.05])
+        assert group["event_time_offset"].attrs["units"] == "s"
+        assert writer.length == 15
+
+
+def test_export_nexus_events_reads_back(tmp_path) -> None:
+    write_synthetic_file(tmp_path / "mccode.h5", n_events=500, id_start=3, id_gap=5)
+    output_path = tmp_path / "events.nxs"
+    with Data(tmp_path) as data:
+        data.export_nexus_events(output_path, chunk_size=64, dataset_chunk_size=100)
+        expected = {
+            comp: data.get_event_data(["p", "t", "id"], component_name=comp)
+            for comp in data.component_pixel_order
+        }
+        lookups = {comp: data.get_id_lookup(comp) for comp in expected}
+
+    with h5py.File(output_path, "r") as f:
+        instrument = f["entry/instrument"]
+        assert sorted(instrument) == sorted(expected)
+        for comp, events in expected.items():
+            detector = instrument[comp]
+            assert detector.attrs["NX_class"] == "NXdetector"
+            np.testing.assert_array_equal(
+                detector["detector_number"][()], lookups[comp].ids
+            )
+            np.testing.assert_array_equal(
+                detector["y_pixel_offset"][()], lookups[comp].positions[:, 1]
+            )
+
+            group = detector[f"{comp}_events"]
+            assert group["event_id"].compression == "gzip"
+            np.testing.assert_array_equal(group["event_id"][()], events["id"])
+            np.testing.assert_array_equal(group["event_time_offset"][()], events["t"])
+            np.testing.assert_array_equal(group["event_weight"][()], events["p"])